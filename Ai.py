@@ -1,16 +1,32 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import asyncio
 import aiohttp
-from typing import List, Dict, Any, Optional, TypedDict, Annotated, Literal
+from typing import List, Dict, Any, Optional, TypedDict, Annotated, Literal, Tuple, Union, Callable, Iterator, AsyncIterator
 from dataclasses import dataclass
 from enum import Enum
 import json
 import time
+import math
+import functools
+import contextvars
+import os
+import sqlite3
+import hashlib
+import uuid
+import threading
+import weakref
+import codecs
+import html.parser
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, aclosing
+from collections import Counter, deque
 from datetime import datetime
 import logging
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode
 import re
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag, NavigableString, CData
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -22,8 +38,40 @@ from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.memory import MemorySaver
 from pydantic import BaseModel, Field
 import pandas as pd
+import numpy as np
 import operator
 
+# Optional C-accelerated HTML parsers for the extraction backends
+try:
+    import lxml.html
+    from lxml import etree as lxml_etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    # selectolax >= 1.0 only ships the lexbor engine; older releases default to modest
+    try:
+        from selectolax.lexbor import LexborHTMLParser as SelectolaxHTMLParser
+    except ImportError:
+        from selectolax.parser import HTMLParser as SelectolaxHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# Optional tokenizers for exact prompt token counts
+try:
+    from tokenizers import Tokenizer as HFTokenizer
+    HF_TOKENIZERS_AVAILABLE = True
+except ImportError:
+    HF_TOKENIZERS_AVAILABLE = False
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -39,11 +87,39 @@ def check_dependencies():
         st.error("Please install: pip install langgraph langchain-core")
         return False
 
+@dataclass(frozen=True)
+class EvidenceSource:
+    """One usable source in an evidence pack"""
+    source_id: str  # "S1", "S2", ... matching the SOURCE numbers in the renderings
+    url: str
+    title: str
+    text: str
+    corroborating_urls: Tuple[str, ...] = ()
+
+@dataclass(frozen=True)
+class EvidencePack:
+    """Evidence prepared once after scraping and shared, unchanged, by every agent turn"""
+    fingerprint: str  # Identifies the evidence set, and with it the debate's passage index
+    claim: str
+    sources: Tuple[EvidenceSource, ...]
+    renderings: Tuple[Tuple[str, str], ...]  # (role, claim-ranked evidence text)
+    shown: Tuple[Tuple[str, Tuple[int, ...]], ...] = ()  # (role, passage ids already in that rendering)
+    
+    def rendering(self, role: str) -> str:
+        return dict(self.renderings)[role]
+    
+    def shown_passages(self, role: str) -> Tuple[int, ...]:
+        return tuple(dict(self.shown).get(role, ()))
+
 class GraphState(TypedDict):
     """LangGraph state that gets passed between nodes"""
     claim: str
     urls: List[str]
     scraped_content: List[Dict[str, Any]]
+    dedup_stats: Optional[Dict[str, Any]]  # Near-duplicate clustering of the scraped sources
+    use_evidence_store: bool  # Pull previously indexed sources for this claim
+    store_stats: Optional[Dict[str, Any]]  # Evidence store query and ingest figures
+    evidence_pack: Optional[EvidencePack]  # Built once after scraping, read by every agent
     verifier_arguments: Annotated[List[str], operator.add]  # Automatically accumulates
     opposer_arguments: Annotated[List[str], operator.add]  # Automatically accumulates
     current_round: int
@@ -56,6 +132,17 @@ class GraphState(TypedDict):
     debate_complete: bool
     retry_count: int  # Track retry attempts
     last_error_node: Optional[str]  # Track which node failed
+    node_timings: Annotated[List[Dict[str, Any]], operator.add]  # Wall time of every node run, in order
+    parallel_openings: bool  # Run the round-1 Verifier and Counter-Explainer as concurrent branches
+    opening_errors: Annotated[List[Dict[str, str]], operator.add]  # Failures of the parallel openings, settled at the join
+    stop_on_convergence: bool  # End the debate once a round only restates earlier arguments
+    convergence: Annotated[List[Dict[str, Any]], operator.add]  # One assessment per completed round from the second on
+    converged_round: Optional[int]  # Round after which the debate ended early
+    fused_judgment: bool  # Judge and score in one structured call, falling back to two calls
+    verifier_digest: Optional[Dict[str, Any]]  # DebateMemory digest of the Verifier's arguments so far
+    opposer_digest: Optional[Dict[str, Any]]  # DebateMemory digest of the Counter-Explainer's arguments so far
+    judging_cascade: bool  # Try the QuickScorer's verdict before the full Judge
+    judging: Optional[Dict[str, Any]]  # Judging path taken and its seconds
 
 # Configuration - Optimized for better responses
 LM_STUDIO_BASE_URL = "http://localhost:1234/v1"
@@ -64,12 +151,163 @@ QWEN_MODEL = "qwen/qwen3-1.7b"  # For Verifier and Counter-Explainer
 PHI_MODEL = "microsoft/phi-4-mini-reasoning"  # For Judge
 # Alternative lightweight models
 FALLBACK_MODEL = "microsoft/DialoGPT-small"  # Backup option
+LLM_ENDPOINTS = [  # OpenAI-compatible servers, the models each serves (None: whatever its /v1/models lists) and optionally 'parallel', the requests it generates at once (default 1)
+    {'base_url': LM_STUDIO_BASE_URL, 'models': [QWEN_MODEL, PHI_MODEL]},
+]
+ENDPOINT_PROBE_INTERVAL = 15  # Seconds between /v1/models health probes when there is more than one endpoint
+ENDPOINT_PROBE_TIMEOUT = 3  # Seconds before a probe counts as failed
+HEDGE_ENABLED = True  # Send a duplicate of a slow call to another endpoint with a free slot and keep whichever answer is good first
+HEDGE_LATENCY_WINDOW = 50  # Recent calls per model and role the latency percentile is taken over
+HEDGE_MIN_SAMPLES = 8  # Calls observed before a model and role is hedged or gets an adaptive timeout
+HEDGE_PERCENTILE = 0.95  # A call with no first token (or no answer, unstreamed) past this percentile is hedged
+HEDGE_MIN_DELAY = 0.5  # Seconds; calls are never hedged sooner than this
+LLM_TIMEOUT_MULTIPLIER = 4.0  # Adaptive timeout as a multiple of the same percentile; for streams it bounds every gap between tokens
+LLM_TIMEOUT_MIN = 30.0  # Seconds; the adaptive timeout never goes below this
+LLM_DEFAULT_TIMEOUT = 300.0  # Seconds until enough calls have been observed
+STREAM_RESPONSES = True  # Render debate turns token by token as LM Studio generates them
+STREAM_RENDER_INTERVAL = 0.05  # Seconds between redraws of a streaming answer
+FUSED_JUDGMENT = False  # Write the Judge's analysis and the verdict in one JSON-schema constrained call instead of a judge call and a scoring call
+PARALLEL_OPENINGS = False  # Generate the round-1 Verifier and Counter-Explainer statements at once; later rounds stay sequential rebuttals
+PROMPT_LAYOUT = "stable_prefix"  # One of: stable_prefix (instructions, claim and evidence first, so LM Studio can reuse its prompt cache across rounds), interleaved
 
 # Updated configuration with much higher token limits
 MAX_RESPONSE_TOKENS = 4096  # Significantly increased for fuller responses
 MAX_CONTENT_LENGTH = 8000  # Increased to allow more content per source
 MAX_FULL_TEXT_LENGTH = 12000  # Increased for fuller text processing
 
+# Scraping configuration
+MAX_CONCURRENT_SCRAPES = 8  # Global cap on in-flight fetches across all hosts
+PER_HOST_RATE_LIMIT = 1.0  # Sustained requests per second allowed against a single host
+PER_HOST_BURST = 2  # Requests a host may receive back-to-back before the rate limit applies
+SCRAPE_TIMEOUT = 10  # Seconds per request
+SCRAPE_MAX_RETRIES = 3
+SCRAPE_BACKOFF_FACTOR = 1
+SCRAPE_RETRY_STATUSES = (429, 500, 502, 503, 504)
+SCRAPER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# HTML extraction
+EXTRACTION_BACKEND = "beautifulsoup"  # One of: beautifulsoup, lxml, selectolax
+MAIN_CONTENT_SELECTORS = ['article', 'main', '.content', '#content', '.post-content']
+
+# Streaming downloads
+MAX_DOWNLOAD_BYTES = 2 * 1024 * 1024  # Body bytes parsed per page; the rest is never downloaded
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+PLAIN_TEXT_CONTENT_TYPES = ('text/plain',)
+
+# Parsing in worker processes
+# Opt-in: workers are forked from the app process, and a fork taken while another thread holds a lock
+# (logging, sqlite, the endpoint probe) can deadlock the child. Set to os.cpu_count() for batch scraping.
+PARSE_WORKERS = 1  # Processes parsing HTML; 1 or less parses on the event loop instead
+PARSE_QUEUE_DEPTH = 2  # Downloaded pages allowed to wait per worker before fetching pauses
+OFFLOAD_EARLY_STOP_FACTOR = 2  # Offloaded downloads stop once their tag-stripped text is this many times the text budget
+
+# Persistent scrape cache
+SCRAPE_CACHE_ENABLED = True
+SCRAPE_CACHE_PATH = os.path.join(".cache", "scrape_cache.sqlite3")
+SCRAPE_CACHE_TTL = 6 * 60 * 60  # Seconds before an entry must be revalidated with the origin
+SCRAPE_CACHE_MAX_BYTES = 200 * 1024 * 1024  # Least recently used entries are evicted above this size
+TRACKING_QUERY_PARAMS = ('utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content', 'fbclid', 'gclid')
+
+# Near-duplicate evidence detection
+DEDUP_ENABLED = True
+DEDUP_SHINGLE_SIZE = 3  # Words per shingle hashed into the SimHash fingerprint
+DEDUP_MAX_HAMMING_DISTANCE = 10  # Fingerprints differing in at most this many of 64 bits are the same story; unrelated texts differ in ~32
+CHARS_PER_TOKEN = 4  # Rough estimate used when reporting prompt savings
+
+# Evidence shown to each agent: (sources, content characters per source)
+VERIFIER_EVIDENCE_WINDOW = (5, 2000)
+COUNTER_EXPLAINER_EVIDENCE_WINDOW = (5, 800)
+JUDGE_EVIDENCE_WINDOW = (4, 400)
+
+# Passage retrieval: prompts get the best-matching passages instead of each source's prefix
+PASSAGE_RETRIEVAL_ENABLED = True
+PASSAGE_TARGET_CHARS = 500  # Sentences are packed into passages of about this size
+BM25_K1 = 1.5
+BM25_B = 0.75
+OPPONENT_QUERY_WEIGHT = 0.5  # Share of the query given to the opponent's last argument, relative to the claim
+OPPONENT_EVIDENCE_SHARE = 0.25  # Part of a debater's evidence budget kept for passages matching the opponent's last argument
+
+# Persistent evidence store shared across claims
+EVIDENCE_STORE_ENABLED = True  # Index every scraped page
+EVIDENCE_STORE_RECALL = False  # Also pull stored sources into debates by default; off so user-supplied URLs stay the only evidence unless asked
+EVIDENCE_STORE_PATH = os.path.join(".cache", "evidence_store.sqlite3")
+EVIDENCE_STORE_TOP_K = 5  # Stored sources pulled into a debate for a new claim
+EVIDENCE_STORE_AUTOMERGE = 8  # FTS5 merges index segments incrementally once this many share a level
+EVIDENCE_STORE_MERGE_PAGES = 200  # Index pages merged after each ingest batch
+EVIDENCE_STORE_MAX_TERM_SHARE = 0.05  # Claim terms found in more of the passages than this are too common to search on
+
+# Context budgets: prompts are sized in tokens against each model's loaded context window
+CONTEXT_BUDGET_ENABLED = True
+DEFAULT_CONTEXT_TOKENS = 8192  # Window assumed for models missing from MODEL_CONTEXT_TOKENS
+MODEL_CONTEXT_TOKENS = {QWEN_MODEL: 8192, PHI_MODEL: 8192}  # Must match the Context Length the models are loaded with in LM Studio
+MODEL_TOKENIZERS = {QWEN_MODEL: "Qwen/Qwen3-1.7B", PHI_MODEL: "microsoft/Phi-4-mini-reasoning"}  # Hugging Face tokenizers used when the tokenizers package is installed
+TIKTOKEN_ENCODING = "o200k_base"  # Close stand-in for modern BPE vocabularies when only tiktoken is installed
+TOKENIZER_CACHE_DIR = os.path.join(".cache", "tokenizers")  # tokenizer.json per Hugging Face tokenizer, fetched once in the background
+TIKTOKEN_CACHE_DIR = os.path.join(".cache", "tiktoken")  # Where tiktoken keeps its encoding files unless TIKTOKEN_CACHE_DIR is set
+os.environ.setdefault("TIKTOKEN_CACHE_DIR", TIKTOKEN_CACHE_DIR)
+CONTEXT_MAX_OUTPUT_SHARE = 0.5  # The reserved answer never takes more than this share of the window
+CONTEXT_SAFETY_TOKENS = 96  # Headroom for chat-template tokens and counting error
+CONTEXT_PRIORITIES = {  # Relative shares of what the fixed prompt text and reserved answer leave over
+    'evidence': 3,
+    'opponent_evidence': 1,
+    'opponent_history': 2,
+    'debate_history': 4,
+}
+TOKEN_COUNT_CACHE_SIZE = 2048  # Distinct texts whose token counts are remembered
+TRUNCATION_MARKER = "...[truncated to fit the context window]..."
+
+# Persistent LLM response cache
+LLM_CACHE_ENABLED = True
+LLM_CACHE_PATH = os.path.join(".cache", "llm_cache.sqlite3")
+LLM_CACHE_TTL = 7 * 24 * 60 * 60  # Seconds a cached answer may be served
+LLM_CACHE_MAX_BYTES = 50 * 1024 * 1024  # Least recently used answers are evicted above this size
+LLM_CACHE_ROLES = ('scoring', 'quick_scoring')  # Near-deterministic calls that are always served from the cache
+LLM_CACHE_OPT_IN_ROLES = ('verifier', 'counter_explainer', 'judge')  # Debate roles cached only when enabled
+
+# Early abort of degenerate streamed answers
+DEGENERACY_ABORT_ENABLED = True
+DEGENERACY_MIN_WORDS = 80  # Words streamed before any check may cancel the answer
+DEGENERACY_WINDOW_WORDS = 200  # Rolling window of recent words the repetition checks run over
+DEGENERACY_MAX_WORD_SHARE = 0.2  # Same limit _validate_response applies to the whole answer
+DEGENERACY_NGRAM = 4  # Words per phrase in the repeated-phrase check
+DEGENERACY_MAX_REPEATED_NGRAMS = 0.5  # Share of the window's phrases that already occurred earlier in it
+DEGENERACY_SENTENCE_WINDOW = 20  # Recent sentences the fragment check runs over
+DEGENERACY_MAX_FRAGMENT_SHARE = 0.3  # Same limit _validate_response applies to the whole answer
+DEGENERACY_RETRY_PARAMS = {'temperature': 0.5, 'top_p': 0.9, 'frequency_penalty': 0.6, 'presence_penalty': 0.4}  # Stronger penalties than the first attempt to break the loop
+
+# Telemetry
+TELEMETRY_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)  # Seconds; histogram bounds for first token, call and node durations
+TELEMETRY_THROUGHPUT_BUCKETS = (5, 10, 20, 40, 80, 160, 320, 640)  # Tokens per second
+TELEMETRY_TOKEN_BUCKETS = (64, 256, 1024, 2048, 4096, 8192, 16384)  # Prompt and completion tokens per call
+TELEMETRY_TEXTFILE_PATH = None  # Write Prometheus metrics here after every verification, e.g. for node_exporter's textfile collector
+
+# Ending debates early once arguments converge
+CONVERGENCE_ENABLED = True
+CONVERGENCE_MIN_ROUNDS = 2  # Rounds always played before a debate may end early
+CONVERGENCE_NGRAM = 3  # Words per phrase compared between an agent's consecutive arguments
+CONVERGENCE_MAX_OVERLAP = 0.5  # Share of an argument's phrases already in the same agent's previous one at which it restates it
+CONVERGENCE_STALE_ROUNDS = 1  # Consecutive rounds in which both sides restate themselves and cite nothing new before the debate ends
+
+# Running digest of earlier rounds, so prompts stay the same size however long the debate runs
+DEBATE_MEMORY_ENABLED = True
+DEBATE_MEMORY_CLAIMS_PER_ROUND = 2  # Sentences taken from each argument as its main claims
+DEBATE_MEMORY_MAX_CLAIMS = 6  # Claims kept per side; the oldest make room for new ones
+DEBATE_MEMORY_MAX_CONCESSIONS = 3  # Points a side granted its opponent, most recent kept
+DEBATE_MEMORY_MAX_SOURCES = 8  # Source numbers and URLs kept per side, in order of first citation
+DEBATE_MEMORY_SENTENCE_CHARS = 240  # Longer sentences are cut at a word boundary
+DEBATE_MEMORY_JUDGE_ROUNDS = 2  # Latest rounds per side the Judge reads in full; the digest covers the rest
+MAX_DEBATE_ROUNDS = 12  # Upper end of the rounds slider
+
+# Judging cascade: a quick verdict over the compressed debate, the full Judge only when that is unsure
+JUDGING_CASCADE = False  # Meant for batches of claims, where most debates are clear-cut
+CASCADE_MODEL = QWEN_MODEL  # Already loaded for the debate, so the first stage loads no other model
+CASCADE_CONFIDENCE_THRESHOLD = 0.85  # Quick verdicts at least this confident are final; the rest escalate
+CASCADE_ARGUMENT_CHARS = 1500  # Characters of each side's latest argument the quick scorer reads
+CASCADE_MAX_TOKENS = 300
+
 class AgentRole(Enum):
     VERIFIER = "verifier"
     COUNTER_EXPLAINER = "counter_explainer"
@@ -87,164 +325,3039 @@ class DebateState:
     final_judgment: Optional[Dict[str, Any]]
     debate_history: List[Dict[str, Any]]
 
+def run_coroutine_sync(coro):
+    """Run a coroutine to completion from synchronous code.
+
+    Uses asyncio.run when no loop is running in this thread, otherwise runs the
+    coroutine on a fresh loop in a helper thread so callers inside an event loop
+    (notebooks, async services) do not deadlock.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+_THREAD_LOOPS = threading.local()
+
+def run_on_thread_loop(coro):
+    """Run a coroutine to completion on an event loop kept for the calling thread.
+
+    Unlike run_coroutine_sync the loop outlives the call, so async clients bound
+    to it keep their connections from one call to the next; callbacks still run
+    in the calling thread, as Streamlit needs.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        return run_coroutine_sync(coro)
+    loop = getattr(_THREAD_LOOPS, 'loop', None)
+    if loop is None or loop.is_closed():
+        loop = _THREAD_LOOPS.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(coro)
+
+class HostRateLimiter:
+    """Per-host token buckets replacing the blanket sleep between requests"""
+
+    def __init__(self, rate: float = PER_HOST_RATE_LIMIT, burst: int = PER_HOST_BURST):
+        self.rate = rate
+        self.burst = burst
+        # host -> [available tokens, last refill timestamp]
+        self._buckets: Dict[str, List[float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def acquire(self, host: str):
+        """Wait until a request to `host` is allowed"""
+        if self.rate <= 0:
+            return
+
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            bucket = self._buckets.setdefault(host, [float(self.burst), time.monotonic()])
+            while True:
+                now = time.monotonic()
+                bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+                if bucket[0] >= 1:
+                    bucket[0] -= 1
+                    return
+                await asyncio.sleep((1 - bucket[0]) / self.rate)
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL used as the cache key"""
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower() or 'http'
+    netloc = parsed.netloc.lower()
+    # Drop default ports
+    if (scheme == 'http' and netloc.endswith(':80')) or (scheme == 'https' and netloc.endswith(':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    path = parsed.path or '/'
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_QUERY_PARAMS
+    ))
+    # Fragments never reach the server, so they are not part of the key
+    return urlunparse((scheme, netloc, path, parsed.params, query, ''))
+
+class ScrapeCache:
+    """SQLite-backed cache of extracted page content with HTTP revalidation and LRU eviction"""
+
+    def __init__(self, path: str = SCRAPE_CACHE_PATH, ttl: float = SCRAPE_CACHE_TTL,
+                 max_bytes: int = SCRAPE_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url_key TEXT PRIMARY KEY,
+                title TEXT,
+                content TEXT,
+                full_text TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                scraped_at TEXT,
+                fetched_at REAL,
+                accessed_at REAL,
+                size INTEGER,
+                backend TEXT
+            )
+        """)
+        # Caches written before entries recorded their extraction backend; those rows never match one
+        if 'backend' not in {column[1] for column in self._conn.execute("PRAGMA table_info(pages)")}:
+            self._conn.execute("ALTER TABLE pages ADD COLUMN backend TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages(accessed_at)")
+        self._conn.commit()
+
+    def lookup(self, url: str, backend: str) -> Optional[Dict[str, Any]]:
+        """Return the entry a backend extracted for a URL, flagged fresh or stale, or None.
+
+        Text another backend extracted is a miss, so switching backends re-extracts the page.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, content, full_text, etag, last_modified, scraped_at, fetched_at "
+                "FROM pages WHERE url_key = ? AND backend = ?",
+                (normalize_url(url), backend)
+            ).fetchone()
+        if not row:
+            return None
+
+        title, content, full_text, etag, last_modified, scraped_at, fetched_at = row
+        return {
+            'extraction_backend': backend,
+            'title': title,
+            'content': content,
+            'full_text': full_text,
+            'etag': etag,
+            'last_modified': last_modified,
+            'scraped_at': scraped_at,
+            'fresh': time.time() - fetched_at < self.ttl
+        }
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Request headers that let the origin answer 304 for an unchanged page"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def serve(self, url: str, entry: Dict[str, Any], revalidated: bool = False) -> Dict[str, Any]:
+        """Build a scrape result from a cache entry and record the hit"""
+        now = time.time()
+        with self._lock:
+            if revalidated:
+                self.stats['revalidated'] += 1
+                self._conn.execute(
+                    "UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url_key = ?",
+                    (now, now, normalize_url(url))
+                )
+            else:
+                self.stats['hits'] += 1
+                self._conn.execute(
+                    "UPDATE pages SET accessed_at = ? WHERE url_key = ?",
+                    (now, normalize_url(url))
+                )
+            self._conn.commit()
+
+        return {
+            'url': url,
+            'title': entry['title'],
+            'content': entry['content'],
+            'full_text': entry['full_text'],
+            'status': 'success',
+            'scraped_at': entry['scraped_at'],
+            'cache_status': 'revalidated' if revalidated else 'hit',
+            'extraction_backend': entry['extraction_backend']
+        }
+
+    def store(self, url: str, result: Dict[str, Any], headers: Dict[str, str]):
+        """Cache a freshly extracted result and evict old entries if over budget"""
+        size = sum(len(result.get(field, '').encode('utf-8')) for field in ('title', 'content', 'full_text'))
+        now = time.time()
+        with self._lock:
+            self.stats['misses'] += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url_key, title, content, full_text, etag, last_modified, "
+                "scraped_at, fetched_at, accessed_at, size, backend) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (normalize_url(url), result.get('title', ''), result.get('content', ''),
+                 result.get('full_text', ''), headers.get('etag'), headers.get('last-modified'),
+                 result.get('scraped_at'), now, now, size, result.get('extraction_backend'))
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        victims = []
+        for url_key, size in self._conn.execute("SELECT url_key, size FROM pages ORDER BY accessed_at ASC"):
+            if total <= self.max_bytes:
+                break
+            victims.append((url_key,))
+            total -= size
+        self._conn.executemany("DELETE FROM pages WHERE url_key = ?", victims)
+
+    def summary(self) -> Dict[str, Any]:
+        """Counters and occupancy for display"""
+        with self._lock:
+            entries, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+        return {**self.stats, 'entries': entries, 'size_bytes': total}
+
+def normalize_page_text(text: str) -> str:
+    """Collapse page text into single-spaced phrases, dropping blank lines"""
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return ' '.join(chunk for chunk in chunks if chunk)
+
+class ExtractionBackend:
+    """Base class for turning a downloaded HTML page into title, content and full_text"""
+
+    name = "base"
+    available = True
+
+    def extract(self, body: bytes, encoding: Optional[str] = None) -> Dict[str, str]:
+        """Return {'title', 'content', 'full_text'} capped to the configured lengths"""
+        raise NotImplementedError
+
+    def open_stream(self, encoding: Optional[str] = None) -> 'ExtractionStream':
+        """Start an incremental extraction; backends without a push parser buffer the body"""
+        return ExtractionStream(self, encoding)
+
+    @staticmethod
+    def _result(title: str, main_content: str, text: str) -> Dict[str, str]:
+        if not main_content:
+            main_content = text
+        return {
+            'title': title,
+            'content': main_content[:MAX_CONTENT_LENGTH],  # Reduced memory usage
+            'full_text': text[:MAX_FULL_TEXT_LENGTH]  # Reduced memory usage
+        }
+
+class ExtractionStream:
+    """Incremental extraction session that is fed body chunks as they arrive"""
+
+    def __init__(self, backend: Optional[ExtractionBackend] = None, encoding: Optional[str] = None):
+        self.backend = backend
+        self.encoding = encoding
+        self._chunks: List[bytes] = []
+
+    @property
+    def done(self) -> bool:
+        """True once further body bytes cannot change the result"""
+        return False
+
+    def feed(self, chunk: bytes):
+        self._chunks.append(chunk)
+
+    def body(self) -> bytes:
+        """The buffered body, for handing to a worker process instead of parsing here"""
+        return b''.join(self._chunks)
+
+    def close(self) -> Dict[str, str]:
+        return self.backend.extract(self.body(), self.encoding)
+
+# Line boundaries recognised by str.splitlines()
+_LINE_BREAKS = '\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029'
+_LINE_BREAK_RE = re.compile('[' + re.escape(_LINE_BREAKS) + ']')
+
+class BoundedTextCollector:
+    """Builds normalize_page_text() output incrementally and stops at a length limit"""
+
+    # Buffered characters without a line break before settled phrases are flushed
+    FLUSH_THRESHOLD = 4096
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.chunks: List[str] = []
+        self.length = 0  # Length of ' '.join(self.chunks)
+        self.full = False
+        self._buffer: List[str] = []
+        self._buffered = 0
+
+    def feed(self, text: str):
+        if self.full:
+            return
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered > self.FLUSH_THRESHOLD or _LINE_BREAK_RE.search(text):
+            self._drain(final=False)
+
+    def text(self) -> str:
+        """The normalized text collected so far, capped at the limit"""
+        if not self.full:
+            self._drain(final=True)
+        return ' '.join(self.chunks)[:self.limit]
+
+    def _drain(self, final: bool):
+        data = ''.join(self._buffer)
+        self._buffer = []
+        self._buffered = 0
+        if not data:
+            return
+
+        lines = data.splitlines()
+        tail = None
+        if not final and data[-1] not in _LINE_BREAKS:
+            # The last line may continue in the next text node
+            tail = lines.pop()
+
+        for line in lines:
+            for phrase in line.split("  "):
+                self._add(phrase)
+                if self.full:
+                    return
+
+        if tail is not None:
+            # Phrases before the last double space are settled; only the last one can still grow
+            phrases = tail.split("  ")
+            for phrase in phrases[:-1]:
+                self._add(phrase)
+                if self.full:
+                    return
+            last = phrases[-1]
+            room = self.limit - self.length - (1 if self.chunks else 0)
+            if len(last.strip()) >= room:
+                # Whatever follows, the capped output already ends inside this phrase
+                self._add(last)
+            else:
+                self._buffer = [last]
+                self._buffered = len(last)
+
+    def _add(self, phrase: str):
+        chunk = phrase.strip()
+        if not chunk:
+            return
+        if self.chunks:
+            self.length += 1
+        self.chunks.append(chunk)
+        self.length += len(chunk)
+        if self.length >= self.limit:
+            self.full = True
+
+def _compile_simple_selector(selector: str) -> Tuple[str, str]:
+    """Split a tag, .class or #id selector into (kind, value)"""
+    if selector.startswith('.'):
+        return ('class', selector[1:])
+    if selector.startswith('#'):
+        return ('id', selector[1:])
+    return ('tag', selector.lower())
+
+class PageTextExtractor:
+    """Single-pass extraction of title, main content and normalized full text.
+
+    Driven by start/end/text events in document order, so any parser can feed it
+    from one traversal. Text collection stops once MAX_FULL_TEXT_LENGTH and
+    MAX_CONTENT_LENGTH are reached instead of building whole strings and slicing.
+    Results match the BeautifulSoup get_text/select_one extraction it replaces.
+    """
+
+    SKIPPED_TAGS = ('script', 'style')
+    # BeautifulSoup types strings inside these as TemplateString/RubyTextString and get_text() drops them
+    TEXTLESS_TAGS = ('template', 'rt', 'rp')
+    _TEXTLESS = -3
+    _SKIP = -2
+    _TITLE = -1
+
+    def __init__(self, content_limit: Optional[int] = None, text_limit: Optional[int] = None):
+        self.content_limit = content_limit or MAX_CONTENT_LENGTH
+        self.text_limit = text_limit or MAX_FULL_TEXT_LENGTH
+        # The main content falls back to the full text, so collect enough for both
+        self.full_text = BoundedTextCollector(max(self.text_limit, self.content_limit))
+        self.title_parts: Optional[List[str]] = None
+        self.title_closed = False
+        self.selectors = [_compile_simple_selector(selector) for selector in MAIN_CONTENT_SELECTORS]
+        # First matching element per selector, in MAIN_CONTENT_SELECTORS priority order
+        self.candidates: List[Optional[List[str]]] = [None] * len(self.selectors)
+        self.candidate_lengths = [0] * len(self.selectors)
+        self.candidate_closed = [False] * len(self.selectors)
+        self._open_candidates: List[int] = []
+        self._stack: List[Tuple[str, List[int]]] = []
+        self._skip_depth = 0
+        self._textless_depth = 0
+
+    def start_element(self, name: str, classes: List[str], element_id: Optional[str]):
+        markers = []
+        if name in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+            markers.append(self._SKIP)
+        elif not self._skip_depth:
+            if name in self.TEXTLESS_TAGS:
+                self._textless_depth += 1
+                markers.append(self._TEXTLESS)
+            if self.title_parts is None and name == 'title':
+                self.title_parts = []
+                markers.append(self._TITLE)
+            for i, (kind, value) in enumerate(self.selectors):
+                if self.candidates[i] is not None:
+                    continue
+                if ((kind == 'tag' and name == value) or
+                        (kind == 'class' and value in classes) or
+                        (kind == 'id' and element_id == value)):
+                    self.candidates[i] = []
+                    self._open_candidates.append(i)
+                    markers.append(i)
+        self._stack.append((name, markers))
+
+    def end_element(self, name: str):
+        # Pop back to the matching start tag, closing anything left open inside it
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth][0] == name:
+                break
+        else:
+            return
+
+        while len(self._stack) > depth:
+            _, markers = self._stack.pop()
+            for marker in markers:
+                if marker == self._SKIP:
+                    self._skip_depth -= 1
+                elif marker == self._TEXTLESS:
+                    self._textless_depth -= 1
+                elif marker == self._TITLE:
+                    self.title_closed = True
+                else:
+                    self.candidate_closed[marker] = True
+                    self._open_candidates.remove(marker)
+
+    def text(self, data: str):
+        if self._skip_depth or self._textless_depth:
+            return
+        self.full_text.feed(data)
+        if self.title_parts is not None and not self.title_closed:
+            self.title_parts.append(data)
+        if self._open_candidates:
+            stripped = data.strip()
+            if stripped:
+                for i in self._open_candidates:
+                    if self.candidate_lengths[i] < self.content_limit:
+                        self.candidates[i].append(stripped)
+                        self.candidate_lengths[i] += len(stripped)
+
+    def inside(self, names: Tuple[str, ...]) -> bool:
+        """Whether any currently open element has one of the given names"""
+        return any(name in names for name, _ in self._stack)
+
+    @property
+    def done(self) -> bool:
+        """True once nothing later in the document can change the result"""
+        return (self.full_text.full and self.title_closed and self.candidates[0] is not None and
+                (self.candidate_closed[0] or self.candidate_lengths[0] >= self.content_limit))
+
+    def result(self) -> Dict[str, str]:
+        text = self.full_text.text()
+        title_text = ''.join(self.title_parts) if self.title_parts is not None else "No title found"
+        main_content = ""
+        for parts in self.candidates:
+            if parts is not None:
+                main_content = ''.join(parts)
+                break
+        return ExtractionBackend._result(title_text, main_content, text)
+
+def charset_from_headers(headers: Dict[str, str]) -> Optional[str]:
+    """Charset declared in the Content-Type response header, if it names a known codec"""
+    match = re.search(r'charset=["\']?([\w.:-]+)', headers.get('content-type', ''), re.IGNORECASE)
+    if not match:
+        return None
+    try:
+        return codecs.lookup(match.group(1)).name
+    except LookupError:
+        return None
+
+def sniff_html_charset(head: bytes) -> Optional[str]:
+    """Charset from a byte-order mark or <meta> declaration near the start of a page"""
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    match = re.search(rb'<meta[^>]+charset=["\']?([\w.:-]+)', head, re.IGNORECASE)
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode('ascii')).name
+        except LookupError:
+            pass
+    return None
+
+class TextDecodingStream(ExtractionStream):
+    """Extraction stream for pure-Python parsers: decodes chunks incrementally before parsing"""
+
+    SNIFF_BYTES = 1024
+
+    def __init__(self, encoding: Optional[str] = None):
+        super().__init__(None, encoding)
+        self._decoder = None
+        self._pending = b''
+
+    def feed(self, chunk: bytes):
+        if self._decoder is None:
+            # Hold back the first bytes until the <meta> charset can be sniffed
+            self._pending += chunk
+            if len(self._pending) >= self.SNIFF_BYTES:
+                self._start_decoding()
+        else:
+            self.feed_text(self._decoder.decode(chunk))
+
+    def close(self) -> Dict[str, str]:
+        if self._decoder is None:
+            self._start_decoding()
+        self.feed_text(self._decoder.decode(b'', final=True))
+        return self.finish()
+
+    def _start_decoding(self):
+        encoding = self.encoding or sniff_html_charset(self._pending) or 'utf-8'
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        pending, self._pending = self._pending, b''
+        self.feed_text(self._decoder.decode(pending))
+
+    def feed_text(self, text: str):
+        raise NotImplementedError
+
+    def finish(self) -> Dict[str, str]:
+        raise NotImplementedError
+
+# Elements html.parser reports a start tag for but never closes (BeautifulSoup's empty_element_tags)
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'menuitem', 'meta',
+    'param', 'source', 'track', 'wbr', 'basefont', 'bgsound', 'command', 'frame', 'image', 'isindex',
+    'nextid', 'spacer'
+])
+
+class _ExtractorHTMLParser(html.parser.HTMLParser):
+    """html.parser tokenizer forwarding events to a PageTextExtractor without building a tree"""
+
+    def __init__(self, extractor: PageTextExtractor):
+        super().__init__(convert_charrefs=True)
+        self.extractor = extractor
+        # html.parser splits text at feed() boundaries; rejoin it so each text node arrives whole
+        self._text: List[str] = []
+
+    def flush_text(self):
+        if self._text:
+            text = ''.join(self._text)
+            self._text = []
+            # Mirror BeautifulSoup, which collapses whitespace-only strings outside <pre>/<textarea>
+            if not text.strip(' \n\t\f\r') and not self.extractor.inside(('pre', 'textarea')):
+                text = '\n' if '\n' in text else ' '
+            self.extractor.text(text)
+
+    def handle_starttag(self, tag, attrs):
+        self.flush_text()
+        attributes = dict(attrs)
+        self.extractor.start_element(tag, (attributes.get('class') or '').split(), attributes.get('id'))
+        if tag in VOID_ELEMENTS:
+            self.extractor.end_element(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.extractor.end_element(tag)
+
+    def handle_endtag(self, tag):
+        self.flush_text()
+        if tag not in VOID_ELEMENTS:
+            self.extractor.end_element(tag)
+
+    def handle_data(self, data):
+        self._text.append(data)
+
+    def handle_comment(self, data):
+        self.flush_text()
+
+    def handle_decl(self, decl):
+        self.flush_text()
+
+    def handle_pi(self, data):
+        self.flush_text()
+
+    def unknown_decl(self, data):
+        self.flush_text()
+        if data.startswith('CDATA['):
+            self.extractor.text(data[len('CDATA['):])
+
+    def close(self):
+        super().close()
+        self.flush_text()
+
+class HTMLParserStream(TextDecodingStream):
+    """Streams a page through html.parser, the tokenizer BeautifulSoup uses, chunk by chunk"""
+
+    def __init__(self, encoding: Optional[str] = None):
+        super().__init__(encoding)
+        self.extractor = PageTextExtractor()
+        self._parser = _ExtractorHTMLParser(self.extractor)
+
+    @property
+    def done(self) -> bool:
+        return self.extractor.done
+
+    def feed_text(self, text: str):
+        if text and not self.extractor.done:
+            self._parser.feed(text)
+
+    def finish(self) -> Dict[str, str]:
+        self._parser.close()
+        return self.extractor.result()
+
+class PlainTextStream(TextDecodingStream):
+    """Extraction for text/plain responses: the whole body is the content"""
+
+    def __init__(self, encoding: Optional[str] = None):
+        super().__init__(encoding)
+        self.collector = BoundedTextCollector(max(MAX_CONTENT_LENGTH, MAX_FULL_TEXT_LENGTH))
+
+    @property
+    def done(self) -> bool:
+        return self.collector.full
+
+    def feed_text(self, text: str):
+        self.collector.feed(text)
+
+    def finish(self) -> Dict[str, str]:
+        return ExtractionBackend._result("No title found", "", self.collector.text())
+
+# Markup the offload estimate drops: script/style open and close tags, or any other tag or comment
+_ESTIMATE_MARKUP_RE = re.compile(r'<(/?)(script|style)\b[^>]*>|<!--.*?-->|<[^>]*>', re.IGNORECASE | re.DOTALL)
+
+class OffloadedStream(TextDecodingStream):
+    """Buffers the body for a ParsePool worker while estimating, in-process, when to stop reading.
+
+    Tags, comments and script/style bodies are stripped with a regex and the rest
+    goes into a BoundedTextCollector sized OFFLOAD_EARLY_STOP_FACTOR times the text
+    budget, so the download stops once the page clearly holds more text than the
+    worker will keep.
+    """
+
+    def __init__(self, backend: ExtractionBackend, encoding: Optional[str] = None):
+        super().__init__(encoding)
+        self.backend = backend
+        self.collector = BoundedTextCollector(
+            OFFLOAD_EARLY_STOP_FACTOR * max(MAX_CONTENT_LENGTH, MAX_FULL_TEXT_LENGTH)
+        )
+        self._carry = ''
+        self._in_skipped = False
+
+    @property
+    def done(self) -> bool:
+        return self.collector.full
+
+    def feed(self, chunk: bytes):
+        self._chunks.append(chunk)
+        super().feed(chunk)
+
+    def feed_text(self, text: str):
+        text = self._carry + text
+        # A tag or comment cut off at the chunk boundary is completed by the next chunk
+        cut = text.rfind('<')
+        if cut != -1 and '>' not in text[cut:]:
+            text, self._carry = text[:cut], text[cut:]
+        else:
+            self._carry = ''
+
+        position = 0
+        for match in _ESTIMATE_MARKUP_RE.finditer(text):
+            if not self._in_skipped:
+                self.collector.feed(text[position:match.start()])
+            if match.group(2):
+                self._in_skipped = not match.group(1)
+            position = match.end()
+        if not self._in_skipped:
+            self.collector.feed(text[position:])
+
+    def close(self) -> Dict[str, str]:
+        # Only reached when no worker extracted the body
+        return self.backend.extract(self.body(), self.encoding)
+
+class _LxmlExtractorTarget:
+    """lxml parser target forwarding SAX-style events to a PageTextExtractor"""
+
+    def __init__(self, extractor: PageTextExtractor):
+        self.extractor = extractor
+        # libxml2 may deliver one text node in several pieces across feed() calls
+        self._text: List[str] = []
+
+    def _flush_text(self):
+        if self._text:
+            self.extractor.text(''.join(self._text))
+            self._text = []
+
+    def start(self, tag, attrib):
+        self._flush_text()
+        self.extractor.start_element(tag, attrib.get('class', '').split(), attrib.get('id'))
+
+    def end(self, tag):
+        self._flush_text()
+        self.extractor.end_element(tag)
+
+    def data(self, data):
+        self._text.append(data)
+
+    def comment(self, text):
+        self._flush_text()
+
+    def close(self):
+        self._flush_text()
+        return None
+
+class LxmlStream(ExtractionStream):
+    """Feeds raw chunks straight into libxml2's push parser"""
+
+    def __init__(self, encoding: Optional[str] = None):
+        super().__init__(None, encoding)
+        self.extractor = PageTextExtractor()
+        self._parser = lxml_etree.HTMLParser(target=_LxmlExtractorTarget(self.extractor), encoding=encoding)
+
+    @property
+    def done(self) -> bool:
+        return self.extractor.done
+
+    def feed(self, chunk: bytes):
+        if not self.extractor.done:
+            self._parser.feed(chunk)
+
+    def close(self) -> Dict[str, str]:
+        try:
+            self._parser.close()
+        except lxml_etree.XMLSyntaxError:
+            # Raised for empty documents; whatever was extracted still stands
+            pass
+        return self.extractor.result()
+
+# String node types BeautifulSoup's get_text() includes (comments, doctypes, template text are skipped)
+_BS_TEXT_TYPES = (NavigableString, CData)
+
+class BeautifulSoupBackend(ExtractionBackend):
+    """Reference extractor using BeautifulSoup's pure-Python html.parser"""
+
+    name = "beautifulsoup"
+
+    def extract(self, body: bytes, encoding: Optional[str] = None) -> Dict[str, str]:
+        # Decode with the server-declared charset rather than letting BeautifulSoup guess
+        markup = body.decode(encoding, errors='replace') if encoding else body
+        soup = BeautifulSoup(markup, 'html.parser')
+        extractor = PageTextExtractor()
+
+        # One walk over the tree; script and style subtrees are skipped as if decomposed
+        stack = [(None, iter(soup.contents))]
+        while stack and not extractor.done:
+            name, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if name is not None:
+                    extractor.end_element(name)
+            elif isinstance(child, Tag):
+                if child.name in PageTextExtractor.SKIPPED_TAGS:
+                    continue
+                classes = child.get('class') or []
+                if isinstance(classes, str):
+                    classes = classes.split()
+                extractor.start_element(child.name, classes, child.get('id'))
+                stack.append((child.name, iter(child.contents)))
+            elif type(child) in _BS_TEXT_TYPES:
+                extractor.text(child)
+
+        return extractor.result()
+
+    def open_stream(self, encoding: Optional[str] = None) -> ExtractionStream:
+        return HTMLParserStream(encoding)
+
+class LxmlBackend(ExtractionBackend):
+    """libxml2-based extractor via lxml.html"""
+
+    name = "lxml"
+    available = LXML_AVAILABLE
+
+    def extract(self, body: bytes, encoding: Optional[str] = None) -> Dict[str, str]:
+        parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+        doc = lxml.html.document_fromstring(body, parser=parser)
+        extractor = PageTextExtractor()
+
+        def start(element):
+            extractor.start_element(element.tag, element.get('class', '').split(), element.get('id'))
+            if element.text:
+                extractor.text(element.text)
+
+        # Iterating an element yields comments and processing instructions too, which iterwalk
+        # skips along with their tails; they contribute only that tail
+        start(doc)
+        stack = [(doc, iter(doc))]
+        while stack and not extractor.done:
+            element, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                extractor.end_element(element.tag)
+                if element.tail:
+                    extractor.text(element.tail)
+            elif isinstance(child.tag, str):
+                start(child)
+                stack.append((child, iter(child)))
+            elif child.tail:
+                extractor.text(child.tail)
+
+        return extractor.result()
+
+    def open_stream(self, encoding: Optional[str] = None) -> ExtractionStream:
+        return LxmlStream(encoding)
+
+class SelectolaxBackend(ExtractionBackend):
+    """Lexbor-based extractor via selectolax"""
+
+    name = "selectolax"
+    available = SELECTOLAX_AVAILABLE
+
+    def extract(self, body: bytes, encoding: Optional[str] = None) -> Dict[str, str]:
+        # lexbor reads bytes as UTF-8, so honour a <meta> charset the way the streaming parsers do
+        encoding = encoding or sniff_html_charset(body[:TextDecodingStream.SNIFF_BYTES]) or 'utf-8'
+        tree = SelectolaxHTMLParser(body.decode(encoding, errors='replace'))
+
+        for node in tree.css('script, style'):
+            node.decompose()
+
+        root = tree.root
+        text = normalize_page_text(root.text(deep=True, separator='') if root else '')
+
+        title = tree.css_first('title')
+        title_text = title.text(deep=True, separator='') if title else "No title found"
+
+        main_content = ""
+        for selector in MAIN_CONTENT_SELECTORS:
+            node = tree.css_first(selector)
+            if node:
+                main_content = node.text(deep=True, separator='', strip=True)
+                break
+
+        return self._result(title_text, main_content, text)
+
+EXTRACTION_BACKENDS = {
+    backend.name: backend for backend in (BeautifulSoupBackend, LxmlBackend, SelectolaxBackend)
+}
+
+def available_extraction_backends() -> List[str]:
+    """Names of extraction backends whose parser library is installed"""
+    return [name for name, backend in EXTRACTION_BACKENDS.items() if backend.available]
+
+def get_extraction_backend(name: str = EXTRACTION_BACKEND) -> ExtractionBackend:
+    """Instantiate a backend by name, falling back to BeautifulSoup if it is unavailable"""
+    backend = EXTRACTION_BACKENDS.get(name)
+    if backend is None or not backend.available:
+        logger.warning(f"Extraction backend '{name}' is not available, using beautifulsoup")
+        backend = BeautifulSoupBackend
+    return backend()
+
+# Backends instantiated inside each parse worker, reused across pages
+_WORKER_BACKENDS: Dict[str, ExtractionBackend] = {}
+
+def _extract_in_worker(backend_name: str, body: bytes, encoding: Optional[str]) -> Dict[str, str]:
+    """ParsePool entry point; must stay module-level so it can be pickled"""
+    backend = _WORKER_BACKENDS.get(backend_name)
+    if backend is None:
+        backend = _WORKER_BACKENDS[backend_name] = get_extraction_backend(backend_name)
+    return backend.extract(body, encoding)
+
+class ParsePool:
+    """Persistent process pool that runs HTML extraction on every core.
+
+    Fetchers hand over raw bytes and reserve a queue slot first, so when parsing
+    falls behind the fetch stage pauses instead of piling pages up in memory.
+    """
+
+    def __init__(self, workers: int = PARSE_WORKERS, queue_depth: int = PARSE_QUEUE_DEPTH):
+        self.workers = workers
+        self.max_pending = workers * queue_depth
+        # Workers are forked so they inherit this module even under `streamlit run`,
+        # where it is executed as __main__ and cannot be re-imported by name
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('fork')
+        )
+
+    _shared: Optional['ParsePool'] = None
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, workers: Optional[int] = None) -> Optional['ParsePool']:
+        """The process-wide pool, or None when parsing should stay in-process.
+
+        A new WebScraper is built for every verification, so the workers are kept
+        alive between runs rather than forked again each time.
+        """
+        workers = PARSE_WORKERS if workers is None else workers
+        if workers <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+            return None
+        with cls._shared_lock:
+            if cls._shared is None or cls._shared.workers != workers:
+                if cls._shared is not None:
+                    cls._shared.close()
+                try:
+                    cls._shared = cls(workers)
+                except Exception as e:
+                    logger.warning(f"Parse pool unavailable, parsing in-process: {str(e)}")
+                    return None
+            return cls._shared
+
+    async def extract(self, backend_name: str, body: bytes, encoding: Optional[str]) -> Dict[str, str]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _extract_in_worker, backend_name, body, encoding)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+class UnsupportedContentTypeError(Exception):
+    """Raised before downloading a body the scraper cannot extract text from"""
+
+class StreamingDownload:
+    """Byte-capped body reader feeding an extraction stream chunk by chunk"""
+
+    def __init__(self, stream: ExtractionStream, content_type: str, content_length: Optional[int],
+                 max_bytes: int = MAX_DOWNLOAD_BYTES, offloaded: bool = False):
+        self.stream = stream
+        # Offloaded downloads only buffer bytes; a ParsePool worker does the extraction
+        self.offloaded = offloaded
+        self.content_type = content_type
+        self.content_length = content_length
+        self.max_bytes = max_bytes
+        self.bytes_downloaded = 0
+        self.bytes_parsed = 0
+        self.stopped_early = False
+
+    def feed(self, chunk: bytes) -> bool:
+        """Consume one chunk; returns False once the caller should stop reading"""
+        self.bytes_downloaded += len(chunk)
+        if self.stream.done:
+            self.stopped_early = True
+            return False
+
+        room = self.max_bytes - self.bytes_parsed
+        if len(chunk) > room:
+            chunk = chunk[:room]
+        self.stream.feed(chunk)
+        self.bytes_parsed += len(chunk)
+
+        if self.bytes_parsed >= self.max_bytes or self.stream.done:
+            self.stopped_early = self.content_length is None or self.content_length > self.bytes_downloaded
+            return False
+        return True
+
+    def finish(self, extracted: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Close the parser (unless a worker already extracted) and add download accounting"""
+        return {
+            **(extracted if extracted is not None else self.stream.close()),
+            'content_type': self.content_type,
+            'content_length': self.content_length,
+            'bytes_downloaded': self.bytes_downloaded,
+            'bytes_discarded': self.bytes_downloaded - self.bytes_parsed,
+            'download_truncated': self.stopped_early
+        }
+
+def _lowercase_headers(headers) -> Dict[str, str]:
+    """Plain dict of response headers with lower-cased names"""
+    return {key.lower(): value for key, value in headers.items()}
+
+class AsyncScrapeEngine:
+    """Concurrent aiohttp fetcher with a global concurrency cap and per-host politeness"""
+
+    def __init__(self, scraper: 'WebScraper', max_concurrency: int = MAX_CONCURRENT_SCRAPES,
+                 host_rate: float = PER_HOST_RATE_LIMIT, host_burst: int = PER_HOST_BURST,
+                 timeout: float = SCRAPE_TIMEOUT, max_retries: int = SCRAPE_MAX_RETRIES):
+        # Content-type gating, extraction and caching are shared with the synchronous path
+        self.scraper = scraper
+        self.cache = scraper.cache
+        self.max_concurrency = max_concurrency
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+    async def scrape_urls(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """Fetch all URLs concurrently and return results in input order"""
+        if not urls:
+            return []
+
+        limiter = HostRateLimiter(self.host_rate, self.host_burst)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        pool = self.scraper.parse_pool
+        parse_slots = asyncio.Semaphore(pool.max_pending) if pool else None
+        # One keep-alive pool shared by every request in the batch
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrency,
+            limit_per_host=max(1, self.host_burst),
+            ttl_dns_cache=300,
+            keepalive_timeout=30
+        )
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=SCRAPER_HEADERS) as session:
+            tasks = [self._scrape_one(session, semaphore, limiter, parse_slots, url) for url in urls]
+            return await asyncio.gather(*tasks)
+
+    async def _scrape_one(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                          limiter: HostRateLimiter, parse_slots: Optional[asyncio.Semaphore],
+                          url: str) -> Dict[str, Any]:
+        """Fetch and extract a single URL with retries on transient failures"""
+        host = urlparse(url).netloc.lower()
+
+        try:
+            cached = self.cache.lookup(url, self.scraper.backend.name) if self.cache else None
+            if cached and cached['fresh']:
+                return self.cache.serve(url, cached)
+            request_headers = ScrapeCache.conditional_headers(cached)
+
+            for attempt in range(self.max_retries + 1):
+                await limiter.acquire(host)
+                try:
+                    async with semaphore:
+                        async with session.get(url, headers=request_headers) as response:
+                            if response.status in SCRAPE_RETRY_STATUSES and attempt < self.max_retries:
+                                retry = True
+                            else:
+                                retry = False
+                                not_modified = response.status == 304 and cached is not None
+                                if not not_modified:
+                                    response.raise_for_status()
+                                    headers = _lowercase_headers(response.headers)
+                                    download = self.scraper._open_download(url, headers, offload=parse_slots is not None)
+                                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                                        if not download.feed(chunk):
+                                            break
+                                    if download.offloaded:
+                                        # Back-pressure: keep holding the fetch slot until the parse queue has room
+                                        await parse_slots.acquire()
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if attempt >= self.max_retries:
+                        raise
+                    retry = True
+
+                if not retry:
+                    if not_modified:
+                        return self.cache.serve(url, cached, revalidated=True)
+                    if download.offloaded:
+                        try:
+                            extracted = await self.scraper.parse_pool.extract(
+                                self.scraper.backend.name, download.stream.body(), download.stream.encoding
+                            )
+                        finally:
+                            parse_slots.release()
+                        return self.scraper._finish_download(url, download, headers, extracted)
+                    return self.scraper._finish_download(url, download, headers)
+
+                # Exponential backoff, matching the urllib3 Retry policy of the sync session
+                await asyncio.sleep(SCRAPE_BACKOFF_FACTOR * (2 ** attempt))
+
+        except Exception as e:
+            logger.error(f"Error scraping {url}: {str(e)}")
+            return WebScraper._error_result(url, e)
+
 class WebScraper:
     """Optimized web scraper with error handling and rate limiting"""
-    
-    def __init__(self):
+
+    def __init__(self, extraction_backend: str = EXTRACTION_BACKEND, parse_workers: Optional[int] = None):
+        self.backend = get_extraction_backend(extraction_backend)
         self.session = requests.Session()
         # Configure retry strategy
         retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            total=SCRAPE_MAX_RETRIES,
+            backoff_factor=SCRAPE_BACKOFF_FACTOR,
+            status_forcelist=list(SCRAPE_RETRY_STATUSES),
         )
         adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
-        
+
         # Set headers to mimic a real browser
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-    
+        self.session.headers.update(SCRAPER_HEADERS)
+
+        self.cache = None
+        if SCRAPE_CACHE_ENABLED:
+            try:
+                self.cache = ScrapeCache()
+            except Exception as e:
+                logger.warning(f"Scrape cache unavailable, continuing without it: {str(e)}")
+
+        self.parse_pool = ParsePool.shared(parse_workers)
+        self.engine = AsyncScrapeEngine(self)
+
     def scrape_url(self, url: str) -> Dict[str, Any]:
         """Scrape content from a single URL"""
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Extract text content
-            text = soup.get_text()
-            
-            # Clean up text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            # Extract metadata
-            title = soup.find('title')
-            title_text = title.get_text() if title else "No title found"
-            
-            # Extract main content (try to find article or main content areas)
-            main_content = ""
-            for selector in ['article', 'main', '.content', '#content', '.post-content']:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    main_content = content_elem.get_text(strip=True)
-                    break
-            
-            if not main_content:
-                main_content = text
-            
-            return {
-                'url': url,
-                'title': title_text,
-                'content': main_content[:MAX_CONTENT_LENGTH],  # Reduced memory usage
-                'full_text': text[:MAX_FULL_TEXT_LENGTH],  # Reduced memory usage
-                'status': 'success',
-                'scraped_at': datetime.now().isoformat()
-            }
-            
+            cached = self.cache.lookup(url, self.backend.name) if self.cache else None
+            if cached and cached['fresh']:
+                return self.cache.serve(url, cached)
+
+            response = self.session.get(url, timeout=SCRAPE_TIMEOUT, stream=True,
+                                        headers=ScrapeCache.conditional_headers(cached))
+            with response:
+                if response.status_code == 304 and cached:
+                    # Unchanged upstream - skip parsing entirely
+                    return self.cache.serve(url, cached, revalidated=True)
+                response.raise_for_status()
+
+                headers = _lowercase_headers(response.headers)
+                download = self._open_download(url, headers)
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    if not download.feed(chunk):
+                        break
+
+            return self._finish_download(url, download, headers)
+
         except Exception as e:
             logger.error(f"Error scraping {url}: {str(e)}")
-            return {
-                'url': url,
-                'title': '',
-                'content': '',
-                'full_text': '',
-                'status': 'error',
-                'error': str(e),
-                'scraped_at': datetime.now().isoformat()
-            }
+            return self._error_result(url, e)
+
+    def _open_download(self, url: str, headers: Dict[str, str], offload: bool = False) -> StreamingDownload:
+        """Gate on the response headers and set up a byte-capped incremental parse"""
+        media_type = headers.get('content-type', '').split(';')[0].strip().lower()
+        encoding = charset_from_headers(headers)
+
+        offloaded = False
+        if not media_type or media_type in HTML_CONTENT_TYPES:
+            if offload:
+                # Only buffer (and estimate when to stop) here; the page is parsed by a ParsePool worker
+                stream = OffloadedStream(self.backend, encoding)
+                offloaded = True
+            else:
+                stream = self.backend.open_stream(encoding)
+        elif media_type in PLAIN_TEXT_CONTENT_TYPES:
+            stream = PlainTextStream(encoding)
+        else:
+            raise UnsupportedContentTypeError(
+                f"Unsupported content type '{media_type}' - only HTML and plain text pages can be used as evidence"
+            )
+
+        content_length = headers.get('content-length', '')
+        content_length = int(content_length) if content_length.isdigit() else None
+        if content_length and content_length > MAX_DOWNLOAD_BYTES:
+            logger.info(f"{url} declares {content_length} bytes; only the first {MAX_DOWNLOAD_BYTES} will be read")
+
+        return StreamingDownload(stream, media_type or 'text/html', content_length, offloaded=offloaded)
+
+    def _finish_download(self, url: str, download: StreamingDownload, headers: Dict[str, str],
+                         extracted: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Turn a completed download into the scrape result dict"""
+        extracted = download.finish(extracted)
+
+        result = {
+            'url': url,
+            **extracted,
+            'status': 'success',
+            'scraped_at': datetime.now().isoformat(),
+            'cache_status': 'miss',
+            'extraction_backend': self.backend.name
+        }
+        if self.cache:
+            try:
+                self.cache.store(url, result, headers)
+            except Exception as e:
+                logger.warning(f"Could not cache {url}: {str(e)}")
+        return result
+
+    @staticmethod
+    def _error_result(url: str, error: Exception) -> Dict[str, Any]:
+        """Result dict for a URL that could not be scraped"""
+        return {
+            'url': url,
+            'title': '',
+            'content': '',
+            'full_text': '',
+            'status': 'error',
+            'error': str(error),
+            'scraped_at': datetime.now().isoformat()
+        }
     
     def scrape_urls(self, urls: List[str]) -> List[Dict[str, Any]]:
-        """Scrape multiple URLs"""
-        results = []
+        """Scrape multiple URLs concurrently, returning results in input order"""
         for url in urls:
             st.write(f"🔍 Scraping: {url}")
-            result = self.scrape_url(url)
-            results.append(result)
-            time.sleep(1)  # Rate limiting
+        return run_coroutine_sync(self.scrape_urls_async(urls))
+
+    async def scrape_urls_async(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """Async entry point for callers that already run an event loop"""
+        return await self.engine.scrape_urls(urls)
+
+def simhash(text: str, shingle_size: int = DEDUP_SHINGLE_SIZE) -> Optional[int]:
+    """64-bit SimHash of a text over weighted word shingles, or None when the text is too short"""
+    words = re.findall(r'\w+', text.lower())
+    if len(words) < shingle_size:
+        return None
+    
+    shingles = Counter(' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1))
+    set_weight = [0] * 64
+    for shingle, weight in shingles.items():
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        while value:
+            lowest = value & -value
+            set_weight[lowest.bit_length() - 1] += weight
+            value ^= lowest
+    
+    total_weight = sum(shingles.values())
+    fingerprint = 0
+    for bit, weight in enumerate(set_weight):
+        if weight * 2 > total_weight:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+class EvidenceDeduplicator:
+    """Clusters near-duplicate sources so each story reaches the agents once"""
+    
+    def __init__(self, max_distance: int = DEDUP_MAX_HAMMING_DISTANCE, shingle_size: int = DEDUP_SHINGLE_SIZE):
+        self.max_distance = max_distance
+        self.shingle_size = shingle_size
+    
+    def deduplicate(self, sources: List[Dict[str, Any]], rounds: int = 1) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Mark near-duplicates rather than dropping them and report what the prompts no longer carry.
+        
+        Every source keeps its position. The representative of a cluster (the copy with the
+        most content) gets 'corroborating_urls'; the other members get 'duplicate_of'.
+        """
+        started = time.perf_counter()
+        sources = [dict(source) for source in sources]
+        fingerprints = {}
+        for index, source in enumerate(sources):
+            if source.get('status') != 'success':
+                continue
+            fingerprint = simhash(source.get('content', ''), self.shingle_size)
+            if fingerprint is not None:
+                fingerprints[index] = fingerprint
+                source['simhash'] = f"{fingerprint:016x}"
+        
+        parent = {index: index for index in fingerprints}
+        
+        def find(index):
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+        
+        indexes = list(fingerprints)
+        for position, first in enumerate(indexes):
+            for second in indexes[position + 1:]:
+                if (fingerprints[first] ^ fingerprints[second]).bit_count() <= self.max_distance:
+                    parent[find(second)] = find(first)
+        
+        clusters: Dict[int, List[int]] = {}
+        for index in indexes:
+            clusters.setdefault(find(index), []).append(index)
+        
+        duplicates = set()
+        for members in clusters.values():
+            if len(members) < 2:
+                continue
+            representative = max(members, key=lambda index: (len(sources[index].get('content', '')), -index))
+            sources[representative]['corroborating_urls'] = [sources[index]['url'] for index in members if index != representative]
+            for index in members:
+                if index != representative:
+                    sources[index]['duplicate_of'] = sources[representative]['url']
+                    duplicates.add(index)
+        
+        prompt_chars_saved = self._prompt_chars_saved(sources, duplicates, rounds)
+        stats = {
+            'sources': len(fingerprints),
+            'clusters': len(clusters),
+            'duplicates': len(duplicates),
+            'dedup_ratio': len(duplicates) / len(fingerprints) if fingerprints else 0.0,
+            'prompt_chars_saved': prompt_chars_saved,
+            'tokens_saved': prompt_chars_saved // CHARS_PER_TOKEN,
+            'elapsed_ms': (time.perf_counter() - started) * 1000
+        }
+        return sources, stats
+    
+    @staticmethod
+    def _prompt_chars_saved(sources: List[Dict[str, Any]], duplicates: set, rounds: int) -> int:
+        """Characters the duplicates would have taken up in the evidence windows over a whole debate"""
+        successful = [index for index, source in enumerate(sources) if source.get('status') == 'success']
+        # Verifier and Counter-Explainer window over all sources once per round, the Judge over successful ones once
+        windows = [
+            (range(len(sources))[:VERIFIER_EVIDENCE_WINDOW[0]], VERIFIER_EVIDENCE_WINDOW[1], rounds),
+            (range(len(sources))[:COUNTER_EXPLAINER_EVIDENCE_WINDOW[0]], COUNTER_EXPLAINER_EVIDENCE_WINDOW[1], rounds),
+            (successful[:JUDGE_EVIDENCE_WINDOW[0]], JUDGE_EVIDENCE_WINDOW[1], 1)
+        ]
+        saved = 0
+        for window, chars, calls in windows:
+            for index in window:
+                if index in duplicates:
+                    saved += min(len(sources[index].get('content', '')), chars) * calls
+        return saved
+
+def unique_evidence(evidence: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop sources marked as near-duplicates of another source"""
+    return [item for item in evidence if not item.get('duplicate_of')]
+
+def format_corroboration(source: Dict[str, Any]) -> str:
+    """Extra prompt line naming the URLs that carry the same text as this source"""
+    corroborating_urls = source.get('corroborating_urls')
+    if not corroborating_urls:
+        return ""
+    return f"\nALSO PUBLISHED AT: {', '.join(corroborating_urls)}"
+
+_SENTENCE_BOUNDARY_RE = re.compile(r'(?<=[.!?])\s+')
+_TERM_RE = re.compile(r'\w+')
+
+def tokenize_terms(text: str) -> List[str]:
+    """Lowercased word terms used for passage ranking"""
+    return _TERM_RE.findall(text.lower())
+
+def split_passages(text: str, target_chars: int = PASSAGE_TARGET_CHARS) -> List[str]:
+    """Pack whole sentences into passages of roughly target_chars, splitting overlong sentences on spaces"""
+    passages = []
+    current = ""
+    for sentence in _SENTENCE_BOUNDARY_RE.split(text):
+        while len(sentence) > target_chars:
+            cut = sentence.rfind(' ', 0, target_chars)
+            cut = cut if cut > 0 else target_chars
+            if current:
+                passages.append(current)
+                current = ""
+            passages.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if not sentence:
+            continue
+        if current and len(current) + 1 + len(sentence) > target_chars:
+            passages.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        passages.append(current)
+    return passages
+
+class PassageIndex:
+    """In-memory BM25 index over the passages of a debate's evidence"""
+    
+    def __init__(self, evidence: List[Dict[str, Any]], target_chars: int = PASSAGE_TARGET_CHARS,
+                 k1: float = BM25_K1, b: float = BM25_B):
+        started = time.perf_counter()
+        self.sources = [item for item in unique_evidence(evidence) if item.get('status') == 'success']
+        self.passages: List[str] = []
+        passage_sources = []
+        passage_terms = []
+        for number, source in enumerate(self.sources):
+            for passage in split_passages(source.get('content', ''), target_chars):
+                self.passages.append(passage)
+                passage_sources.append(number)
+                passage_terms.append(Counter(tokenize_terms(passage)))
+        self.passage_sources = np.array(passage_sources, dtype=np.int32)
+        
+        self.vocabulary: Dict[str, int] = {}
+        term_ids, doc_ids, frequencies = [], [], []
+        for doc, counts in enumerate(passage_terms):
+            for term, count in counts.items():
+                term_ids.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                doc_ids.append(doc)
+                frequencies.append(count)
+        term_ids = np.array(term_ids, dtype=np.int32)
+        doc_ids = np.array(doc_ids, dtype=np.int32)
+        frequencies = np.array(frequencies, dtype=np.float32)
+        
+        # Postings sorted by term; each posting carries its query-independent BM25 weight
+        order = np.argsort(term_ids, kind='stable')
+        self.posting_docs = doc_ids[order]
+        lengths = np.array([sum(counts.values()) for counts in passage_terms], dtype=np.float32)
+        average_length = float(lengths.mean()) if len(lengths) else 0.0
+        document_frequency = np.bincount(term_ids, minlength=len(self.vocabulary)).astype(np.float32)
+        idf = np.log1p((len(self.passages) - document_frequency + 0.5) / (document_frequency + 0.5))
+        norms = k1 * (1 - b + b * lengths / average_length) if average_length else np.zeros_like(lengths)
+        tf = frequencies[order]
+        self.posting_weights = idf[term_ids[order]] * tf * (k1 + 1) / (tf + norms[self.posting_docs])
+        self.posting_starts = np.concatenate(([0], np.cumsum(np.bincount(term_ids, minlength=len(self.vocabulary))))).astype(np.int64)
+        
+        self.build_ms = (time.perf_counter() - started) * 1000
+        self.query_ms: List[float] = []
+    
+    def score(self, query_weights: Dict[str, float]) -> np.ndarray:
+        """BM25 score of every passage for a weighted bag of query terms"""
+        started = time.perf_counter()
+        docs, weights = [], []
+        for term, query_weight in query_weights.items():
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                continue
+            start, end = self.posting_starts[term_id], self.posting_starts[term_id + 1]
+            docs.append(self.posting_docs[start:end])
+            weights.append(self.posting_weights[start:end] * query_weight)
+        if docs:
+            scores = np.bincount(np.concatenate(docs), weights=np.concatenate(weights), minlength=len(self.passages))
+        else:
+            scores = np.zeros(len(self.passages))
+        self.query_ms.append((time.perf_counter() - started) * 1000)
+        return scores
+    
+    @staticmethod
+    def build_query(claim: str, opponent_argument: Optional[str] = None,
+                    opponent_weight: float = OPPONENT_QUERY_WEIGHT) -> Dict[str, float]:
+        """Claim terms at full weight plus the opponent's terms scaled to opponent_weight of the claim's total"""
+        query = {term: float(count) for term, count in Counter(tokenize_terms(claim)).items()}
+        if opponent_argument:
+            opponent_terms = Counter(tokenize_terms(opponent_argument))
+            scale = opponent_weight * max(sum(query.values()), 1.0) / max(sum(opponent_terms.values()), 1)
+            for term, count in opponent_terms.items():
+                query[term] = query.get(term, 0.0) + count * scale
+        return query
+    
+    def select(self, claim: str, budget: int, opponent_argument: Optional[str] = None,
+               exclude: Tuple[int, ...] = (), measure: Callable[[str], int] = len) -> List[Dict[str, Any]]:
+        """Best passages that fit in budget, grouped by source and kept in reading order.
+        
+        Returns [{'number', 'source', 'text', 'passage_ids'}] where number is the source's
+        1-based position in the index, so every role cites a source under the same number.
+        Passages in exclude are never chosen. The budget is in the units of measure:
+        characters by default, or tokens with a token counter.
+        """
+        if not self.passages:
+            return []
+        scores = self.score(self.build_query(claim, opponent_argument))
+        # Ties (including all-zero scores) fall back to document order
+        ranked = np.lexsort((np.arange(len(scores)), -scores))
+        excluded = set(exclude)
+        chosen = []
+        used = 0
+        for passage in ranked:
+            if passage in excluded:
+                continue
+            size = measure(self.passages[passage])
+            if used + size > budget:
+                continue
+            chosen.append(int(passage))
+            used += size
+        
+        by_source: Dict[int, List[int]] = {}
+        for passage in sorted(chosen):
+            by_source.setdefault(int(self.passage_sources[passage]), []).append(passage)
+        return [
+            {'number': number + 1, 'source': self.sources[number], 'text': self._join(passages), 'passage_ids': passages}
+            for number, passages in sorted(by_source.items())
+        ]
+    
+    def _join(self, passages: List[int]) -> str:
+        """Join passages of one source, marking the gaps between non-adjacent ones"""
+        text = self.passages[passages[0]]
+        for previous, passage in zip(passages, passages[1:]):
+            text += (' ' if passage == previous + 1 else ' [...] ') + self.passages[passage]
+        return text
+    
+    def stats(self) -> Dict[str, Any]:
+        """Index size and timings for display"""
+        return {
+            'sources': len(self.sources),
+            'passages': len(self.passages),
+            'terms': len(self.vocabulary),
+            'build_ms': self.build_ms,
+            'queries': len(self.query_ms),
+            'mean_query_ms': sum(self.query_ms) / len(self.query_ms) if self.query_ms else 0.0
+        }
+
+class EvidenceStore:
+    """Persistent SQLite FTS5 index of every source scraped so far, queried by claim"""
+    
+    def __init__(self, path: str = EVIDENCE_STORE_PATH, automerge: int = EVIDENCE_STORE_AUTOMERGE,
+                 merge_pages: int = EVIDENCE_STORE_MERGE_PAGES):
+        self.path = path
+        self.merge_pages = merge_pages
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sources (
+                source_id INTEGER PRIMARY KEY,
+                url_key TEXT UNIQUE,
+                url TEXT,
+                title TEXT,
+                content TEXT,
+                content_hash TEXT,
+                scraped_at TEXT,
+                ingested_at REAL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS passages (
+                passage_id INTEGER PRIMARY KEY,
+                source_id INTEGER REFERENCES sources(source_id),
+                position INTEGER,
+                text TEXT
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS passages_source ON passages(source_id)")
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS passages_fts USING fts5("
+            "text, content='passages', content_rowid='passage_id', tokenize='unicode61')"
+        )
+        # Per-term passage counts, used to keep near-universal claim words out of the query
+        self._conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS passages_vocab USING fts5vocab(passages_fts, 'row')")
+        self._term_counts: Optional[Counter] = None  # Loaded from passages_vocab on first search
+        self._conn.execute("INSERT INTO passages_fts(passages_fts, rank) VALUES ('automerge', ?)", (automerge,))
+        self._conn.commit()
+    
+    def ingest(self, sources: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add or refresh successfully scraped sources, skipping ones whose content is unchanged"""
+        started = time.perf_counter()
+        added = updated = unchanged = passages_written = 0
+        with self._lock:
+            for source in unique_evidence(sources):
+                if source.get('status') != 'success' or source.get('evidence_store') or not source.get('content'):
+                    continue
+                url_key = normalize_url(source['url'])
+                content = source['content']
+                content_hash = hashlib.sha256(content.encode('utf-8', 'replace')).hexdigest()
+                row = self._conn.execute(
+                    "SELECT source_id, content_hash FROM sources WHERE url_key = ?", (url_key,)
+                ).fetchone()
+                if row and row[1] == content_hash:
+                    unchanged += 1
+                    continue
+                
+                if row:
+                    source_id = row[0]
+                    self._delete_passages(source_id)
+                    self._conn.execute(
+                        "UPDATE sources SET url = ?, title = ?, content = ?, content_hash = ?, scraped_at = ?, "
+                        "ingested_at = ? WHERE source_id = ?",
+                        (source['url'], source.get('title', ''), content, content_hash,
+                         source.get('scraped_at'), time.time(), source_id)
+                    )
+                    updated += 1
+                else:
+                    source_id = self._conn.execute(
+                        "INSERT INTO sources (url_key, url, title, content, content_hash, scraped_at, ingested_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (url_key, source['url'], source.get('title', ''), content, content_hash,
+                         source.get('scraped_at'), time.time())
+                    ).lastrowid
+                    added += 1
+                
+                for position, passage in enumerate(split_passages(content)):
+                    passage_id = self._conn.execute(
+                        "INSERT INTO passages (source_id, position, text) VALUES (?, ?, ?)",
+                        (source_id, position, passage)
+                    ).lastrowid
+                    self._conn.execute("INSERT INTO passages_fts(rowid, text) VALUES (?, ?)", (passage_id, passage))
+                    self._count_terms(passage, 1)
+                    passages_written += 1
+            
+            if passages_written:
+                # Bounded amount of segment merging per batch instead of a full optimize
+                self._conn.execute("INSERT INTO passages_fts(passages_fts, rank) VALUES ('merge', ?)", (self.merge_pages,))
+            self._conn.commit()
+        
+        return {
+            'added': added,
+            'updated': updated,
+            'unchanged': unchanged,
+            'passages': passages_written,
+            'elapsed_ms': (time.perf_counter() - started) * 1000
+        }
+    
+    def _delete_passages(self, source_id: int):
+        """Remove a source's passages from the external-content FTS index and the passage table"""
+        rows = self._conn.execute("SELECT passage_id, text FROM passages WHERE source_id = ?", (source_id,)).fetchall()
+        self._conn.executemany(
+            "INSERT INTO passages_fts(passages_fts, rowid, text) VALUES ('delete', ?, ?)", rows
+        )
+        for _, text in rows:
+            self._count_terms(text, -1)
+        self._conn.execute("DELETE FROM passages WHERE source_id = ?", (source_id,))
+    
+    def match_expression(self, claim: str, max_term_share: float = EVIDENCE_STORE_MAX_TERM_SHARE) -> Optional[str]:
+        """FTS5 query matching any selective claim term; terms are quoted so punctuation cannot break the syntax.
+        
+        Terms that appear in most passages add almost nothing to bm25() but make
+        every passage a candidate, so they are dropped unless nothing else is left.
+        """
+        terms = list(dict.fromkeys(tokenize_terms(claim)))
+        if not terms:
+            return None
+        if self._term_counts is None:
+            # fts5vocab scans the whole index per lookup, so read it once and keep it current on ingest
+            self._term_counts = Counter(dict(self._conn.execute("SELECT term, doc FROM passages_vocab")))
+            self._passage_count = self._conn.execute("SELECT COUNT(*) FROM passages").fetchone()[0]
+        known = [term for term in terms if self._term_counts[term] > 0]
+        if not known:
+            return None
+        # Small stores are cheap to search in full, so only filter once a term matches many passages
+        limit = max(max_term_share * self._passage_count, 100)
+        selective = [term for term in known if self._term_counts[term] <= limit]
+        if not selective:
+            selective = sorted(known, key=lambda term: self._term_counts[term])[:3]
+        return ' OR '.join(f'"{term}"' for term in selective)
+    
+    def _count_terms(self, passage: str, delta: int):
+        """Keep the in-memory term counts in step with a passage being indexed or removed"""
+        if self._term_counts is None:
+            return
+        self._term_counts.update({term: delta for term in set(tokenize_terms(passage))})
+        self._passage_count += delta
+    
+    def search(self, claim: str, k: int = EVIDENCE_STORE_TOP_K,
+               exclude_urls: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Top-k stored sources for a claim, ranked by their best-matching passage.
+        
+        Results look like scrape results so they can join the debate's evidence
+        list, with 'matched_passages' holding the passages that ranked them.
+        """
+        if k <= 0:
+            return []
+        excluded = {normalize_url(url) for url in exclude_urls or []}
+        
+        ranked: Dict[int, Dict[str, Any]] = {}
+        with self._lock:
+            expression = self.match_expression(claim)
+            if not expression:
+                return []
+            rows = self._conn.execute(
+                "SELECT passages.source_id, passages.text, bm25(passages_fts) AS score "
+                "FROM passages_fts JOIN passages ON passages.passage_id = passages_fts.rowid "
+                "WHERE passages_fts MATCH ? ORDER BY score LIMIT ?",
+                (expression, k * 8 + len(excluded) * 8)
+            ).fetchall()
+            for source_id, text, score in rows:
+                if source_id not in ranked and len(ranked) >= k + len(excluded):
+                    continue
+                entry = ranked.setdefault(source_id, {'score': score, 'passages': []})
+                entry['passages'].append(text)
+            
+            if not ranked:
+                return []
+            placeholders = ','.join('?' * len(ranked))
+            sources = {
+                row[0]: row[1:] for row in self._conn.execute(
+                    f"SELECT source_id, url_key, url, title, content, scraped_at FROM sources "
+                    f"WHERE source_id IN ({placeholders})", list(ranked)
+                )
+            }
+        
+        results = []
+        for source_id, entry in sorted(ranked.items(), key=lambda item: item[1]['score']):
+            url_key, url, title, content, scraped_at = sources[source_id]
+            if url_key in excluded:
+                continue
+            results.append({
+                'url': url,
+                'title': title,
+                'content': content,
+                'full_text': content,
+                'status': 'success',
+                'scraped_at': scraped_at,
+                'evidence_store': True,
+                'store_score': -entry['score'],  # bm25() is lower-is-better
+                'matched_passages': entry['passages']
+            })
+            if len(results) >= k:
+                break
         return results
+    
+    def optimize(self):
+        """Merge every index segment into one; slow, meant for maintenance windows"""
+        with self._lock:
+            self._conn.execute("INSERT INTO passages_fts(passages_fts) VALUES ('optimize')")
+            self._conn.commit()
+    
+    def summary(self) -> Dict[str, Any]:
+        """Corpus size for display"""
+        with self._lock:
+            sources = self._conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]
+            passages = self._conn.execute("SELECT COUNT(*) FROM passages").fetchone()[0]
+        return {'sources': sources, 'passages': passages}
 
-class LMStudioClient:
-    """Client for interacting with LM Studio API"""
+def evidence_fingerprint(evidence: List[Dict[str, Any]]) -> str:
+    """Hash of the usable sources' URLs and content, identifying an evidence set across nodes"""
+    digest = hashlib.sha256()
+    for item in unique_evidence(evidence):
+        if item.get('status') == 'success':
+            digest.update(item.get('url', '').encode('utf-8', 'replace') + b'\0')
+            digest.update(item.get('content', '').encode('utf-8', 'replace') + b'\0')
+    return digest.hexdigest()
+
+# Token usage by prompt section for the completion in progress, read when the call is logged.
+# A context variable keeps concurrent debates on one event loop from seeing each other's usage.
+PROMPT_SECTIONS: contextvars.ContextVar = contextvars.ContextVar('prompt_sections', default=None)
+# Why generate_response is regenerating an answer, if it is, so the calls it makes are logged as regenerations
+REGENERATION: contextvars.ContextVar = contextvars.ContextVar('regeneration', default=None)
+# The Streamlit script run behind a blocking verification, for nodes LangGraph runs on its worker threads
+SCRIPT_RUN_CONTEXT: contextvars.ContextVar = contextvars.ContextVar('script_run_context', default=None)
+
+class TokenCounter:
+    """Counts tokens with the model's own tokenizer when one is installed, caching the counts of repeated text.
+    
+    Falls back to tiktoken and then to a characters-per-token estimate, so budgets
+    are approximate, never absent, on a bare install. Counting only ever reads
+    tokenizer files from disk: anything missing is fetched once per process by a
+    background thread, and the estimate stands in until it lands.
+    """
+    
+    _fetches: Dict[Optional[str], threading.Thread] = {}  # Tokenizer name (None: tiktoken only) -> its fetch
+    _fetches_lock = threading.Lock()
+    _tiktoken_ready = threading.Event()  # Set once the tiktoken encoding file is in TIKTOKEN_CACHE_DIR
+    
+    def __init__(self, tokenizers: Dict[str, str] = MODEL_TOKENIZERS, cache_size: int = TOKEN_COUNT_CACHE_SIZE):
+        self.tokenizer_names = dict(tokenizers)
+        self._encoders: Dict[str, Tuple[str, Optional[Callable[[str], int]]]] = {}
+        self._lock = threading.Lock()
+        # Keyed by backend too, so counts estimated while a tokenizer was being fetched are not reused after
+        self._cached_count = functools.lru_cache(maxsize=cache_size)(
+            lambda text, model, backend: self._count(text, model))
+        for model in self.tokenizer_names:
+            self.prefetch(model)
+    
+    def count(self, text: str, model: str) -> int:
+        return self._cached_count(text, model, self.backend(model))
+    
+    def backend(self, model: str) -> str:
+        """Name of the tokenizer used for a model: 'tokenizers', 'tiktoken' or 'estimate'"""
+        return self._encoder(model)[0]
+    
+    def prefetch(self, model: str) -> threading.Thread:
+        """Start fetching the model's tokenizer files in the background unless already done or underway"""
+        name = self.tokenizer_names.get(model) if HF_TOKENIZERS_AVAILABLE else None
+        with self._fetches_lock:
+            fetch = self._fetches.get(name)
+            if fetch is None:
+                fetch = self._fetches[name] = threading.Thread(target=self._fetch, args=(name,),
+                                                               name="tokenizer-fetch", daemon=True)
+                fetch.start()
+            return fetch
+    
+    def _encoder(self, model: str) -> Tuple[str, Optional[Callable[[str], int]]]:
+        with self._lock:
+            encoder = self._encoders.get(model)
+        if encoder is not None:
+            return encoder
+        # Loaded without the lock held; at worst two threads both read the same file
+        fetching = self.prefetch(model).is_alive()
+        encoder = self._load_encoder(model)
+        if not fetching:
+            with self._lock:
+                encoder = self._encoders.setdefault(model, encoder)
+        return encoder
+    
+    @staticmethod
+    def _tokenizer_path(name: str) -> str:
+        return os.path.join(TOKENIZER_CACHE_DIR, name.replace('/', '--'), "tokenizer.json")
+    
+    @classmethod
+    def _fetch(cls, name: Optional[str]):
+        """Download the Hugging Face tokenizer, or failing that the tiktoken encoding, into the local cache"""
+        if name:
+            path = cls._tokenizer_path(name)
+            if os.path.exists(path):
+                return
+            try:
+                tokenizer = HFTokenizer.from_pretrained(name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                partial = f"{path}.{os.getpid()}.tmp"
+                tokenizer.save(partial)
+                os.replace(partial, path)  # Readers never see a half-written file
+                return
+            except Exception as e:
+                logger.warning(f"Tokenizer {name} could not be fetched, falling back: {str(e)}")
+        if TIKTOKEN_AVAILABLE:
+            try:
+                tiktoken.get_encoding(TIKTOKEN_ENCODING)  # Downloads into TIKTOKEN_CACHE_DIR on first use
+                cls._tiktoken_ready.set()
+            except Exception as e:
+                logger.warning(f"tiktoken encoding {TIKTOKEN_ENCODING} unavailable, estimating tokens: {str(e)}")
+    
+    def _load_encoder(self, model: str) -> Tuple[str, Optional[Callable[[str], int]]]:
+        """The best tokenizer already on disk; never touches the network"""
+        name = self.tokenizer_names.get(model)
+        if HF_TOKENIZERS_AVAILABLE and name and os.path.exists(self._tokenizer_path(name)):
+            try:
+                tokenizer = HFTokenizer.from_file(self._tokenizer_path(name))
+                return 'tokenizers', lambda text: len(tokenizer.encode(text, add_special_tokens=False).ids)
+            except Exception as e:
+                logger.warning(f"Tokenizer {name} unreadable for {model}, falling back: {str(e)}")
+        if TIKTOKEN_AVAILABLE and self._tiktoken_ready.is_set():
+            encoding = tiktoken.get_encoding(TIKTOKEN_ENCODING)  # Already loaded by the fetch
+            return 'tiktoken', lambda text: len(encoding.encode(text, disallowed_special=()))
+        return 'estimate', None
+    
+    def _count(self, text: str, model: str) -> int:
+        if not text:
+            return 0
+        encode = self._encoder(model)[1]
+        return encode(text) if encode else math.ceil(len(text) / CHARS_PER_TOKEN)
+    
+    def truncate(self, text: str, max_tokens: int, model: str) -> str:
+        """Longest prefix of text within max_tokens, cut at a line or sentence end and marked as truncated"""
+        if self.count(text, model) <= max_tokens:
+            return text
+        budget = max_tokens - self.count(TRUNCATION_MARKER, model) - 1
+        if budget <= 0:
+            return ""
+        
+        # Binary search over prefix lengths; probes bypass the count cache
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._count(text[:middle], model) <= budget:
+                low = middle
+            else:
+                high = middle - 1
+        boundary = max(text.rfind('\n', 0, low), text.rfind('. ', 0, low) + 1)
+        cut = boundary if boundary > low * 0.8 else low
+        return text[:cut].rstrip() + "\n" + TRUNCATION_MARKER
+    
+    def summary(self) -> Dict[str, Any]:
+        """Count cache occupancy and the tokenizer chosen for each model"""
+        info = self._cached_count.cache_info()
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'cached_texts': info.currsize,
+            'backends': {model: backend for model, (backend, _) in self._encoders.items()}
+        }
+
+class ContextBudgetAllocator:
+    """Splits a model's context window between fixed prompt text, prioritized flexible sections and the reserved answer"""
+    
+    def __init__(self, counter: Optional[TokenCounter] = None, context_tokens: Dict[str, int] = MODEL_CONTEXT_TOKENS,
+                 priorities: Dict[str, int] = CONTEXT_PRIORITIES):
+        self.counter = counter or TokenCounter()
+        self.context_tokens = dict(context_tokens)
+        self.priorities = dict(priorities)
+    
+    def context_window(self, model: str) -> int:
+        return self.context_tokens.get(model, DEFAULT_CONTEXT_TOKENS)
+    
+    def output_tokens(self, model: str, max_tokens: int) -> int:
+        """Tokens reserved for the answer: the requested max_tokens, capped to a share of the window"""
+        return min(max_tokens, int(self.context_window(model) * CONTEXT_MAX_OUTPUT_SHARE))
+    
+    def count(self, text: str, model: str) -> int:
+        return self.counter.count(text, model)
+    
+    def available(self, model: str, max_tokens: int, fixed_text: str) -> int:
+        """Prompt tokens left for flexible sections once the fixed text and the reserved answer are placed"""
+        return max(0, self.context_window(model) - self.output_tokens(model, max_tokens)
+                   - CONTEXT_SAFETY_TOKENS - self.count(fixed_text, model))
+    
+    def shares(self, available: int, sections: Tuple[str, ...]) -> Dict[str, int]:
+        """Fixed split of the available tokens by priority, independent of what the sections contain"""
+        total = sum(self.priorities.get(section, 1) for section in sections) or 1
+        return {section: available * self.priorities.get(section, 1) // total for section in sections}
+    
+    def fill(self, available: int, demands: Dict[str, int]) -> Dict[str, int]:
+        """Water-fill the available tokens across sections by priority; a section never gets more than it asks for
+        and whatever one leaves unused is shared among the others"""
+        budgets = {section: 0 for section in demands}
+        open_sections = {section for section, demand in demands.items() if demand > 0}
+        remaining = available
+        while open_sections and remaining > 0:
+            shares = self.shares(remaining, tuple(sorted(open_sections)))
+            satisfied = {section for section in open_sections if demands[section] - budgets[section] <= shares[section]}
+            if not satisfied:
+                for section in open_sections:
+                    budgets[section] += shares[section]
+                break
+            for section in satisfied:
+                remaining -= demands[section] - budgets[section]
+                budgets[section] = demands[section]
+            open_sections -= satisfied
+        return budgets
+    
+    def fit_arguments(self, arguments: List[str], budget: int, model: str) -> List[str]:
+        """Trim a list of arguments to a shared token budget, shortening only the longest ones"""
+        demands = {str(i): self.count(argument, model) for i, argument in enumerate(arguments)}
+        budgets = self.fill(budget, demands)
+        return [self.counter.truncate(argument, budgets[str(i)], model) for i, argument in enumerate(arguments)]
+    
+    def fit_messages(self, model: str, messages: List[Dict[str, str]], max_tokens: int) -> List[Dict[str, str]]:
+        """Last-resort guard: trim the longest messages until prompt and reserved answer fit the window"""
+        limit = self.context_window(model) - self.output_tokens(model, max_tokens) - CONTEXT_SAFETY_TOKENS
+        counts = [self.count(message['content'], model) for message in messages]
+        overflow = sum(counts) - limit
+        if overflow <= 0:
+            return messages
+        
+        logger.warning(f"Prompt for {model} exceeds its context budget by {overflow} tokens; trimming")
+        trimmed = [dict(message) for message in messages]
+        for index in sorted(range(len(trimmed)), key=lambda i: -counts[i]):
+            if overflow <= 0:
+                break
+            keep = max(0, counts[index] - overflow)
+            trimmed[index]['content'] = self.counter.truncate(trimmed[index]['content'], keep, model)
+            overflow -= counts[index] - self.count(trimmed[index]['content'], model)
+        return trimmed
+
+class LLMResponseCache:
+    """SQLite-backed, content-addressed cache of completions with TTL expiry and LRU eviction"""
+    
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl: float = LLM_CACHE_TTL,
+                 max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0}
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # A lost access time after a crash only skews eviction order; skip the fsync on every hit
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                role TEXT,
+                response TEXT,
+                created_at REAL,
+                accessed_at REAL,
+                size INTEGER
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed_at)")
+        self._conn.commit()
+    
+    @staticmethod
+    def key(model: str, processed_messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+        """SHA-256 over everything that determines the answer: model, final messages and sampling parameters"""
+        payload = json.dumps({'model': model, 'messages': processed_messages, 'params': params},
+                             sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def lookup(self, key: str) -> Optional[str]:
+        """Return the cached answer for a key, or None when missing or expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                self.stats['misses'] += 1
+                return None
+            
+            response, created_at = row
+            fresh = now - created_at < self.ttl
+            if fresh:
+                self.stats['hits'] += 1
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            else:
+                self.stats['expired'] += 1
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+        return response if fresh else None
+    
+    def store(self, key: str, model: str, role: Optional[str], response: str):
+        """Cache an answer and evict old entries if over budget"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, role, response, now, now, len(response.encode('utf-8')))
+            )
+            self._evict()
+            self._conn.commit()
+    
+    def _evict(self):
+        """Drop expired answers, then least recently used ones until the cache fits in max_bytes"""
+        self._conn.execute("DELETE FROM responses WHERE created_at <= ?", (time.time() - self.ttl,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+    
+    def summary(self) -> Dict[str, Any]:
+        """Counters and occupancy for display"""
+        with self._lock:
+            entries, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {**self.stats, 'entries': entries, 'size_bytes': total}
+
+class DegenerateGenerationError(Exception):
+    """Raised when a streamed answer is cancelled because it degenerated"""
+    
+    def __init__(self, reason: str, tokens: int, text: str = ""):
+        super().__init__(reason)
+        self.reason = reason
+        self.tokens = tokens  # Generated before the cancel, all of them wasted
+        self.text = text
+
+class DegeneracyMonitor:
+    """The repetition and coherence checks of LMStudioClient._validate_response, run while an answer streams.
+    
+    Deltas are fed as they arrive; the checks cover rolling windows of the last words,
+    word n-grams and sentences, so a model that falls into a loop is caught within a few
+    dozen tokens instead of after max_tokens. Sentence pieces without letters (list
+    numbers, decimals) are not counted as fragments.
+    """
     
-    def __init__(self, base_url: str = LM_STUDIO_BASE_URL):
-        self.base_url = base_url
+    def __init__(self, min_words: int = DEGENERACY_MIN_WORDS, window_words: int = DEGENERACY_WINDOW_WORDS,
+                 max_word_share: float = DEGENERACY_MAX_WORD_SHARE, ngram: int = DEGENERACY_NGRAM,
+                 max_repeated_ngrams: float = DEGENERACY_MAX_REPEATED_NGRAMS,
+                 sentence_window: int = DEGENERACY_SENTENCE_WINDOW,
+                 max_fragment_share: float = DEGENERACY_MAX_FRAGMENT_SHARE):
+        self.min_words = min_words
+        self.window_words = window_words
+        self.max_word_share = max_word_share
+        self.ngram = ngram
+        self.max_repeated_ngrams = max_repeated_ngrams
+        self.max_fragment_share = max_fragment_share
+        self.words_seen = 0
+        self.words = deque()
+        self.word_counts = Counter()
+        self.ngrams = deque()
+        self.ngram_counts = Counter()
+        self.repeated_ngrams = 0  # Phrases in the window that occurred earlier in it
+        self.sentences = deque(maxlen=sentence_window)  # True for each recent sentence that is a fragment
+        self.reason: Optional[str] = None
+        self._last_words = deque(maxlen=ngram)
+        self._partial_word = ""
+        self._partial_sentence = ""
+    
+    def feed(self, delta: str) -> Optional[str]:
+        """Take the next delta; returns why the answer degenerated once it has, else None"""
+        if self.reason:
+            return self.reason
+        
+        text = self._partial_word + delta
+        words = text.split()
+        self._partial_word = words.pop() if words and not text[-1].isspace() else ""
+        for word in words:
+            self._add_word(word.lower())
+            if self.reason:
+                return self.reason
+        
+        *sentences, partial = (self._partial_sentence + delta).split('.')
+        # Only the length matters for an unfinished sentence, so a long one need not be kept whole
+        self._partial_sentence = partial[-64:]
+        for sentence in sentences:
+            sentence = sentence.strip()
+            if sentence:
+                self.sentences.append(len(sentence) < 10 and any(c.isalpha() for c in sentence))
+        if len(self.sentences) == self.sentences.maxlen and self.words_seen >= self.min_words:
+            fragments = sum(self.sentences)
+            if fragments > self.max_fragment_share * len(self.sentences):
+                self.reason = f"{fragments} of the last {len(self.sentences)} sentences are fragments"
+        return self.reason
+    
+    def _add_word(self, word: str):
+        self.words_seen += 1
+        self.words.append(word)
+        self.word_counts[word] += 1
+        self._last_words.append(word)
+        if len(self._last_words) == self.ngram:
+            phrase = tuple(self._last_words)
+            self.ngram_counts[phrase] += 1
+            self.repeated_ngrams += self.ngram_counts[phrase] > 1
+            self.ngrams.append(phrase)
+        
+        if len(self.words) > self.window_words:
+            oldest = self.words.popleft()
+            self.word_counts[oldest] -= 1
+            if not self.word_counts[oldest]:
+                del self.word_counts[oldest]
+        if len(self.ngrams) > self.window_words - self.ngram + 1:
+            oldest = self.ngrams.popleft()
+            self.ngram_counts[oldest] -= 1
+            if self.ngram_counts[oldest]:
+                self.repeated_ngrams -= 1
+            else:
+                del self.ngram_counts[oldest]
+        
+        if self.words_seen < self.min_words:
+            return
+        top_word, top_count = self.word_counts.most_common(1)[0]
+        if top_count > self.max_word_share * len(self.words):
+            self.reason = f"'{top_word}' is {top_count / len(self.words):.0%} of the last {len(self.words)} words"
+        elif self.ngrams and self.repeated_ngrams > self.max_repeated_ngrams * len(self.ngrams):
+            self.reason = (f"{self.repeated_ngrams / len(self.ngrams):.0%} of the last {len(self.ngrams)} "
+                           f"{self.ngram}-word phrases repeat")
+
+class LLMTelemetry:
+    """Histograms and counters over every LLM call and graph node run, exportable in Prometheus text format.
+    
+    Unlike call_log, which belongs to one client and so to one verification, the
+    figures accumulate for the life of the process, as a scraped metrics endpoint expects.
+    """
+    
+    histograms = {  # name -> (help, bucket upper bounds)
+        'llm_time_to_first_token_seconds': ("Seconds from request to the first streamed token", TELEMETRY_LATENCY_BUCKETS),
+        'llm_call_duration_seconds': ("Seconds from request to the end of the answer", TELEMETRY_LATENCY_BUCKETS),
+        'llm_decode_tokens_per_second': ("Generation speed after the first token", TELEMETRY_THROUGHPUT_BUCKETS),
+        'llm_prompt_tokens': ("Prompt tokens per call", TELEMETRY_TOKEN_BUCKETS),
+        'llm_completion_tokens': ("Completion tokens per call", TELEMETRY_TOKEN_BUCKETS),
+        'debate_node_duration_seconds': ("Seconds spent in one run of a LangGraph node", TELEMETRY_LATENCY_BUCKETS),
+        'judging_duration_seconds': ("Seconds from the end of the debate to the verdict, by judging path", TELEMETRY_LATENCY_BUCKETS),
+    }
+    counters = {
+        'llm_calls_total': "LLM calls by finish reason (cached and degenerate included)",
+        'llm_regenerations_total': "Calls made to replace an answer that failed validation or degenerated",
+        'judging_paths_total': "Verdicts by judging path: quick (cascade, first stage), escalated (cascade, full Judge) or full",
+    }
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[Tuple, List]] = {}  # name -> labels -> [cumulative bucket counts, sum, count]
+        self._counters: Dict[str, Dict[Tuple, float]] = {}
+    
+    _shared: Optional['LLMTelemetry'] = None
+    _shared_lock = threading.Lock()
+    
+    @classmethod
+    def shared(cls) -> 'LLMTelemetry':
+        """The process-wide registry every client reports to"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+    
+    def observe_call(self, call: Dict[str, Any]):
+        """Fold one call_log entry into the metrics"""
+        labels = (('role', call['role'] or 'none'), ('model', call['model']))
+        with self._lock:
+            self._increment('llm_calls_total', labels + (('finish_reason', call['finish_reason'] or 'unknown'),))
+            if call['regeneration']:
+                self._increment('llm_regenerations_total', labels + (('reason', call['regeneration']),))
+            if call['cached']:
+                return
+            for name, value in (('llm_time_to_first_token_seconds', call['ttft_s']),
+                                ('llm_call_duration_seconds', call['total_s']),
+                                ('llm_decode_tokens_per_second', call['tokens_per_s']),
+                                ('llm_prompt_tokens', call['prompt_tokens']),
+                                ('llm_completion_tokens', call['completion_tokens'])):
+                if value is not None:
+                    self._observe(name, labels, value)
+    
+    def observe_node(self, node: str, seconds: float):
+        with self._lock:
+            self._observe('debate_node_duration_seconds', (('node', node),), seconds)
+    
+    def observe_judging(self, path: str, seconds: float):
+        with self._lock:
+            self._increment('judging_paths_total', (('path', path),))
+            self._observe('judging_duration_seconds', (('path', path),), seconds)
+    
+    def judging_summary(self) -> Dict[str, Any]:
+        """Verdicts and mean seconds per judging path, and the share of cascaded claims that reached the Judge"""
+        with self._lock:
+            counts = {labels[0][1]: int(value) for labels, value in self._counters.get('judging_paths_total', {}).items()}
+            means = {labels[0][1]: total / count
+                     for labels, (_, total, count) in self._histograms.get('judging_duration_seconds', {}).items()}
+        cascaded = counts.get('quick', 0) + counts.get('escalated', 0)
+        return {
+            'verdicts': counts,
+            'mean_seconds': means,
+            'escalation_rate': counts.get('escalated', 0) / cascaded if cascaded else None
+        }
+    
+    def _observe(self, name: str, labels: Tuple, value: float):
+        buckets = self.histograms[name][1]
+        series = self._histograms.setdefault(name, {}).setdefault(labels, [[0] * len(buckets), 0.0, 0])
+        for index, bound in enumerate(buckets):
+            if value <= bound:
+                series[0][index] += 1
+        series[1] += value
+        series[2] += 1
+    
+    def _increment(self, name: str, labels: Tuple, amount: float = 1):
+        counters = self._counters.setdefault(name, {})
+        counters[labels] = counters.get(labels, 0) + amount
+    
+    @staticmethod
+    def _labels(labels: Tuple, **extra: str) -> str:
+        def escape(value: str) -> str:
+            return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        return ','.join(f'{key}="{escape(value)}"' for key, value in labels + tuple(extra.items()))
+    
+    def prometheus_text(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, (help_text, buckets) in self.histograms.items():
+                if not self._histograms.get(name):
+                    continue
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for labels, (counts, total, count) in self._histograms[name].items():
+                    for bound, bucket_count in zip(buckets, counts):
+                        lines.append(f"{name}_bucket{{{self._labels(labels, le=str(bound))}}} {bucket_count}")
+                    lines.append(f"{name}_bucket{{{self._labels(labels, le='+Inf')}}} {count}")
+                    lines.append(f"{name}_sum{{{self._labels(labels)}}} {total}")
+                    lines.append(f"{name}_count{{{self._labels(labels)}}} {count}")
+            for name, help_text in self.counters.items():
+                if not self._counters.get(name):
+                    continue
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                lines += [f"{name}{{{self._labels(labels)}}} {value}" for labels, value in self._counters[name].items()]
+        return '\n'.join(lines) + '\n'
+    
+    def write_textfile(self, path: str):
+        """Write the metrics atomically, as node_exporter's textfile collector requires"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as handle:
+            handle.write(self.prometheus_text())
+        os.replace(temporary, path)
+
+class LatencyTracker:
+    """Rolling latency percentiles per model and role, and what hedging did with them.
+    
+    Streamed calls are judged by time to first token, unstreamed ones by total time,
+    since that is how long the caller waits before anything happens.
+    """
+    
+    def __init__(self, window: int = HEDGE_LATENCY_WINDOW, min_samples: int = HEDGE_MIN_SAMPLES,
+                 percentile: float = HEDGE_PERCENTILE):
+        self.window = window
+        self.min_samples = min_samples
+        self.percentile = percentile
+        self.samples: Dict[Tuple[str, Optional[str], bool], deque] = {}
+        self.outcomes: Dict[Tuple[str, Optional[str], bool], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, model: str, role: Optional[str], streamed: bool, latency: float):
+        with self._lock:
+            self.samples.setdefault((model, role, streamed), deque(maxlen=self.window)).append(latency)
+    
+    def quantile(self, model: str, role: Optional[str], streamed: bool) -> Optional[float]:
+        """The tracked percentile, or None until min_samples calls have been seen"""
+        with self._lock:
+            samples = sorted(self.samples.get((model, role, streamed), ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(self.percentile * len(samples)))]
+    
+    def hedge_delay(self, model: str, role: Optional[str], streamed: bool) -> Optional[float]:
+        """Seconds to wait for the first call before sending a duplicate, or None to not hedge"""
+        latency = self.quantile(model, role, streamed)
+        return None if latency is None else max(HEDGE_MIN_DELAY, latency)
+    
+    def timeout(self, model: str, role: Optional[str], streamed: bool) -> float:
+        latency = self.quantile(model, role, streamed)
+        return LLM_DEFAULT_TIMEOUT if latency is None else max(LLM_TIMEOUT_MIN, LLM_TIMEOUT_MULTIPLIER * latency)
+    
+    def record_outcome(self, model: str, role: Optional[str], streamed: bool, delivered: float,
+                       unhedged: float, hedged: bool, hedge_won: bool):
+        """One hedge-eligible call: the latency the caller saw and what the first attempt alone would have given
+        (at least; a cancelled first attempt counts with the time it had run)"""
+        with self._lock:
+            stats = self.outcomes.setdefault((model, role, streamed), {
+                'calls': 0, 'hedged': 0, 'hedge_wins': 0,
+                'delivered': deque(maxlen=self.window), 'unhedged': deque(maxlen=self.window)
+            })
+            stats['calls'] += 1
+            stats['hedged'] += hedged
+            stats['hedge_wins'] += hedge_won
+            stats['delivered'].append(delivered)
+            stats['unhedged'].append(unhedged)
+    
+    def summary(self) -> List[Dict[str, Any]]:
+        """Hedge rate and tail latency with and without hedging, per model and role"""
+        def p95(values):
+            values = sorted(values)
+            return values[min(len(values) - 1, int(0.95 * len(values)))] if values else None
+        
+        with self._lock:
+            return [{
+                'model': model,
+                'role': role,
+                'latency': 'first token' if streamed else 'total',
+                'calls': stats['calls'],
+                'hedge_rate': stats['hedged'] / stats['calls'],
+                'hedge_wins': stats['hedge_wins'],
+                'p95_s': p95(stats['delivered']),
+                'p95_unhedged_s': p95(stats['unhedged'])
+            } for (model, role, streamed), stats in self.outcomes.items()]
+
+class LLMEndpoint:
+    """One OpenAI-compatible server in an EndpointPool, with its load and health"""
+    
+    def __init__(self, base_url: str, models: Optional[List[str]] = None,
+                 max_retries: int = openai.DEFAULT_MAX_RETRIES, parallel: int = 1):
+        self.base_url = base_url.rstrip('/')
+        self.models = set(models) if models else None
+        self.parallel = max(1, parallel)  # Requests the server generates at once; LM Studio's default is one
+        self.listed_models: Optional[set] = None  # What the last successful probe of /v1/models reported
+        self.max_retries = max_retries
         self.client = openai.OpenAI(
-            base_url=base_url,
-            api_key="lm-studio"  # LM Studio doesn't require a real API key
+            base_url=self.base_url,
+            api_key="lm-studio",  # LM Studio doesn't require a real API key
+            max_retries=max_retries
         )
+        self._async_clients = weakref.WeakKeyDictionary()  # Event loop -> AsyncOpenAI client bound to it
+        self.healthy = True
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+    
+    def serves(self, model: str) -> bool:
+        models = self.models or self.listed_models
+        return models is None or model in models
+    
+    def async_client(self) -> openai.AsyncOpenAI:
+        """AsyncOpenAI client bound to the running event loop; its connection pool is shared by every call on that loop"""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = openai.AsyncOpenAI(base_url=self.base_url, api_key="lm-studio",
+                                                                    max_retries=self.max_retries)
+        return client
+
+class EndpointPool:
+    """OpenAI-compatible servers that requests are spread across.
+    
+    Each request goes to the healthy endpoint serving its model with the fewest requests
+    in flight. An endpoint whose request fails to connect or gets a 5xx is ejected until
+    a background probe of its /v1/models succeeds again; with every candidate ejected
+    they are tried anyway, so a single server behaves as it did without a pool.
+    """
+    
+    failure_types = (openai.APIConnectionError, openai.InternalServerError)  # Connection errors include timeouts
+    
+    def __init__(self, endpoints: List[Dict[str, Any]], probe_interval: float = ENDPOINT_PROBE_INTERVAL,
+                 probe_timeout: float = ENDPOINT_PROBE_TIMEOUT):
+        self.config = [dict(endpoint) for endpoint in endpoints]
+        # With somewhere else to go, failing over beats the OpenAI client's own retries against the same server
+        max_retries = 0 if len(endpoints) > 1 else openai.DEFAULT_MAX_RETRIES
+        self.endpoints = [LLMEndpoint(endpoint['base_url'], endpoint.get('models'), max_retries, endpoint.get('parallel', 1))
+                          for endpoint in endpoints]
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.latency = LatencyTracker()  # Kept with the pool so hedging learns across verifications
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if len(self.endpoints) > 1:
+            self._thread = threading.Thread(target=self._probe_loop, name="llm-endpoint-probes", daemon=True)
+            self._thread.start()
+    
+    _shared: Optional['EndpointPool'] = None
+    _shared_lock = threading.Lock()
+    
+    @classmethod
+    def shared(cls) -> 'EndpointPool':
+        """The process-wide pool for LLM_ENDPOINTS.
+        
+        A new client is built for every verification, so load, health and latency are
+        kept between runs (and shared by concurrent sessions) rather than rediscovered.
+        """
+        with cls._shared_lock:
+            if cls._shared is None or cls._shared.config != LLM_ENDPOINTS:
+                if cls._shared is not None:
+                    cls._shared.close()
+                cls._shared = cls(LLM_ENDPOINTS)
+            return cls._shared
+    
+    def candidates(self, model: str) -> List[LLMEndpoint]:
+        """Endpoints serving the model, or all of them if none claims to"""
+        return [endpoint for endpoint in self.endpoints if endpoint.serves(model)] or self.endpoints
+    
+    def can_hedge(self, model: str) -> bool:
+        """Whether a duplicate could go somewhere else: more than one healthy endpoint serves the model"""
+        with self._lock:
+            return sum(endpoint.healthy for endpoint in self.candidates(model)) > 1
+    
+    def has_free_slot(self, model: str) -> bool:
+        """Whether a healthy endpoint serving the model has fewer requests in flight than it generates at once"""
+        with self._lock:
+            return any(endpoint.healthy and endpoint.in_flight < endpoint.parallel
+                       for endpoint in self.candidates(model))
+    
+    @contextmanager
+    def lease(self, model: str) -> Iterator[LLMEndpoint]:
+        """Hold the least loaded healthy endpoint for the model for the duration of one request"""
+        with self._lock:
+            serving = self.candidates(model)
+            # An endpoint with a free slot starts generating at once; a full one queues the request
+            endpoint = min([candidate for candidate in serving if candidate.healthy] or serving,
+                           key=lambda candidate: (candidate.in_flight >= candidate.parallel, candidate.in_flight,
+                                                  candidate.requests))
+            endpoint.in_flight += 1
+            endpoint.requests += 1
+        try:
+            yield endpoint
+        except self.failure_types as e:
+            self._eject(endpoint, e)
+            raise
+        finally:
+            with self._lock:
+                endpoint.in_flight -= 1
+    
+    def probe(self, endpoint: LLMEndpoint) -> bool:
+        """Check an endpoint's /v1/models, readmitting it on success and ejecting it on failure"""
+        try:
+            response = requests.get(f"{endpoint.base_url}/models", timeout=self.probe_timeout)
+            response.raise_for_status()
+            listed = {model['id'] for model in response.json().get('data', [])}
+        except Exception as e:
+            self._eject(endpoint, e)
+            return False
+        
+        with self._lock:
+            if not endpoint.healthy:
+                logger.info(f"LLM endpoint {endpoint.base_url} is reachable again, readmitting it")
+            endpoint.healthy = True
+            endpoint.listed_models = listed
+        return True
+    
+    def _eject(self, endpoint: LLMEndpoint, error: Exception):
+        with self._lock:
+            endpoint.failures += 1
+            endpoint.last_error = str(error)
+            if endpoint.healthy:
+                logger.warning(f"Ejecting LLM endpoint {endpoint.base_url}: {str(error)}")
+            endpoint.healthy = False
+    
+    def _probe_loop(self):
+        while True:
+            for endpoint in self.endpoints:
+                self.probe(endpoint)
+            if self._stop.wait(self.probe_interval):
+                return
+    
+    def summary(self) -> List[Dict[str, Any]]:
+        """Health and load of every endpoint for display"""
+        with self._lock:
+            return [{
+                'endpoint': endpoint.base_url,
+                'healthy': endpoint.healthy,
+                'in_flight': endpoint.in_flight,
+                'requests': endpoint.requests,
+                'failures': endpoint.failures,
+                'models': ', '.join(sorted(endpoint.models or endpoint.listed_models or [])) or 'any',
+                'last_error': endpoint.last_error
+            } for endpoint in self.endpoints]
+    
+    def close(self):
+        self._stop.set()
+
+class LMStudioClient:
+    """Client for interacting with LM Studio API"""
+    
+    def __init__(self, base_url: Optional[str] = None, endpoints: Optional[List[Dict[str, Any]]] = None):
+        """base_url or endpoints give the client a pool of its own; otherwise it uses EndpointPool.shared()"""
+        self._owns_pool = bool(base_url or endpoints)
+        self.pool = EndpointPool(endpoints or [{'base_url': base_url}]) if self._owns_pool else EndpointPool.shared()
+        self.base_url = self.pool.endpoints[0].base_url
+        self.call_log: List[Dict[str, Any]] = []  # Latency figures for every completion
+        self.latency = self.pool.latency
+        self.telemetry = LLMTelemetry.shared()
+        self.cache = None
+        self.cache_roles = set(LLM_CACHE_ROLES)  # Add LLM_CACHE_OPT_IN_ROLES to cache debate turns too
+        self.cache_bypass = False  # Skip lookups but still store fresh answers
+        if LLM_CACHE_ENABLED:
+            try:
+                self.cache = LLMResponseCache()
+            except Exception as e:
+                logger.warning(f"LLM response cache unavailable, continuing without it: {str(e)}")
+        self.budget = ContextBudgetAllocator() if CONTEXT_BUDGET_ENABLED else None
     
     def generate_response(self, model: str, messages: List[Dict[str, str]], 
-                         temperature: float = 0.7, max_tokens: int = MAX_RESPONSE_TOKENS) -> str:
-        """Generate response using specified model with improved context management"""
+                         temperature: float = 0.7, max_tokens: int = MAX_RESPONSE_TOKENS,
+                         on_token: Optional[Callable[[str], None]] = None, role: Optional[str] = None,
+                         sections: Optional[Dict[str, int]] = None,
+                         response_format: Optional[Dict[str, Any]] = None) -> str:
+        """Generate response using specified model with improved context management.
+        
+        With on_token the answer is streamed and on_token receives the text generated
+        so far after every delta; a validation retry starts again from empty text.
+        A streamed answer that degenerates is cancelled as soon as the DegeneracyMonitor
+        notices and regenerated with DEGENERACY_RETRY_PARAMS.
+        sections is the caller's token count per prompt section, logged with the call.
+        response_format is passed to the server as is; a structured answer is left for the
+        caller to validate rather than checked as prose.
+        """
+        sections_token = PROMPT_SECTIONS.set(None)
         try:
-            # Better context management - keep essential context while truncating excess
-            processed_messages = []
-            for msg in messages:
-                content = msg['content']
-                # More intelligent truncation that preserves structure
-                if len(content) > 8000:  # Increased from 4000
-                    # Try to preserve key sections
-                    lines = content.split('\n')
-                    preserved_lines = []
-                    char_count = 0
-                    
-                    for line in lines:
-                        if char_count + len(line) > 7500:  # Increased from 3500
-                            preserved_lines.append("...[content truncated for context management]...")
-                            break
-                        preserved_lines.append(line)
-                        char_count += len(line)
-                    
-                    content = '\n'.join(preserved_lines)
+            processed_messages = self._prepare_messages(messages, model, max_tokens)
+            max_tokens = self._output_tokens(model, max_tokens)
+            PROMPT_SECTIONS.set(self._log_prompt_sections(model, role, processed_messages, max_tokens, sections))
+            structured = {'response_format': response_format} if response_format else {}
+            
+            try:
+                result = self._complete(model, processed_messages, on_token, role, temperature=temperature,
+                                        max_tokens=max_tokens, **structured,
+                                        # Adjusted parameters for better output
+                                        top_p=0.95,  # Slightly increased for more diverse responses
+                                        frequency_penalty=0.2,  # Increased to reduce repetition
+                                        presence_penalty=0.2)  # Increased to encourage more original content
+                # Validate response quality; try once more with lower temperature for more focused response
+                valid = structured or self._validate_response(result)
+                retry_params = None if valid else {'temperature': 0.5, 'top_p': 0.9}
+            except DegenerateGenerationError:
+                retry_params = DEGENERACY_RETRY_PARAMS
+            
+            if retry_params is not None:
+                logger.warning("Generated response failed validation, attempting regeneration...")
+                regeneration_token = REGENERATION.set('degenerate' if retry_params is DEGENERACY_RETRY_PARAMS else 'validation')
+                try:
+                    result = self._complete(model, processed_messages, on_token, role, max_tokens=max_tokens,
+                                            **structured, **retry_params)
+                except DegenerateGenerationError as e:
+                    result = e.text  # Keep what came before the second loop rather than generating it out
+                finally:
+                    REGENERATION.reset(regeneration_token)
+            
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error generating response with {model}: {str(e)}")
+            return f"Error: Could not generate response. Please ensure LM Studio is running and the model {model} is loaded."
+        finally:
+            PROMPT_SECTIONS.reset(sections_token)
+    
+    def stream_response(self, model: str, messages: List[Dict[str, str]], role: Optional[str] = None,
+                        **params) -> Iterator[str]:
+        """Yield the token deltas of one completion and log its timings once the stream ends"""
+        return self._stream(model, self._prepare_messages(messages, model, params.get('max_tokens', MAX_RESPONSE_TOKENS)),
+                            role, **params)
+    
+    def _stream(self, model: str, processed_messages: List[Dict[str, str]], role: Optional[str],
+                monitor: Optional[DegeneracyMonitor] = None, **params) -> Iterator[str]:
+        started = time.perf_counter()
+        first_token_at = None
+        deltas = 0
+        usage = None
+        timings = None
+        finish_reason = None
+        with self.pool.lease(model) as endpoint:
+            stream = endpoint.client.chat.completions.create(
+                model=model,
+                messages=processed_messages,
+                stream=True,
+                **params
+            )
+            try:
+                for chunk in stream:
+                    usage = getattr(chunk, 'usage', None) or usage
+                    timings = getattr(chunk, 'timings', None) or timings
+                    if not chunk.choices:
+                        continue
+                    finish_reason = chunk.choices[0].finish_reason or finish_reason
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                        deltas += 1
+                        reason = monitor.feed(delta) if monitor else None
+                        if reason:
+                            logger.warning(f"Cancelled a degenerate answer from {model} after {deltas} tokens: {reason}")
+                            self._record_call(model, role, started, first_token_at, deltas, streamed=True, aborted=reason,
+                                              finish_reason='degenerate', endpoint=endpoint.base_url,
+                                              prompt_stats=self._prompt_stats(usage, timings))
+                            raise DegenerateGenerationError(reason, deltas)
+                        yield delta
+            finally:
+                # Closing the connection is what makes LM Studio stop generating, also when a hedge race cancels us
+                stream.close()
+            # LM Studio sends one token per delta; prefer reported usage when the server includes it
+            self._record_call(model, role, started, first_token_at, (usage.completion_tokens if usage else None) or deltas,
+                              streamed=True, finish_reason=finish_reason, endpoint=endpoint.base_url, prompt_stats=self._prompt_stats(usage, timings))
+    
+    def _complete(self, model: str, processed_messages: List[Dict[str, str]],
+                  on_token: Optional[Callable[[str], None]], role: Optional[str], **params) -> str:
+        """One completion, served from the response cache when the role's policy allows"""
+        key = self._cache_key(model, processed_messages, role, params)
+        cached = self._cached_response(key, model, role, on_token)
+        if cached is not None:
+            return cached
+        
+        # A failed endpoint is ejected from the pool, so each attempt goes to another one
+        attempts = len(self.pool.candidates(model))
+        for attempt in range(1, attempts + 1):
+            try:
+                result = self._hedged_request(model, processed_messages, on_token, role, **params)
+                break
+            except EndpointPool.failure_types as e:
+                if attempt == attempts:
+                    raise
+                logger.warning(f"Request for {model} failed ({str(e)}), retrying on another endpoint")
+        self._cache_store(key, model, role, result)
+        return result
+    
+    def _hedged_request(self, model: str, processed_messages: List[Dict[str, str]],
+                        on_token: Optional[Callable[[str], None]], role: Optional[str], **params) -> str:
+        """_request with an adaptive timeout, raced against a duplicate once latencies for the model and role are known
+        and the pool has another endpoint to send it to"""
+        streamed = on_token is not None and STREAM_RESPONSES
+        if self._hedging(model, role, streamed):
+            # Racing two calls needs them in flight together, which the async client provides
+            return run_on_thread_loop(self._ahedged_request(model, processed_messages, on_token, role, **params))
+        return self._request(model, processed_messages, on_token, role,
+                             timeout=self.latency.timeout(model, role, streamed), **params)
+    
+    def _hedging(self, model: str, role: Optional[str], streamed: bool) -> bool:
+        """Whether calls for the model and role are raced against a duplicate"""
+        return (HEDGE_ENABLED and self.pool.can_hedge(model)
+                and self.latency.hedge_delay(model, role, streamed) is not None)
+    
+    def _request(self, model: str, processed_messages: List[Dict[str, str]],
+                 on_token: Optional[Callable[[str], None]], role: Optional[str], **params) -> str:
+        """One completion from the server, streamed through on_token when given"""
+        if on_token is None or not STREAM_RESPONSES:
+            started = time.perf_counter()
+            with self.pool.lease(model) as endpoint:
+                response = endpoint.client.chat.completions.create(
+                    model=model,
+                    messages=processed_messages,
+                    stream=False,
+                    **params
+                )
+                usage = getattr(response, 'usage', None)
+                self._record_call(model, role, started, None, usage.completion_tokens if usage else None, streamed=False,
+                                  finish_reason=response.choices[0].finish_reason, endpoint=endpoint.base_url,
+                                  prompt_stats=self._prompt_stats(usage, getattr(response, 'timings', None)))
+            return response.choices[0].message.content
+        
+        text = ""
+        on_token(text)
+        monitor = DegeneracyMonitor() if DEGENERACY_ABORT_ENABLED else None
+        try:
+            for delta in self._stream(model, processed_messages, role, monitor, **params):
+                text += delta
+                on_token(text)
+        except DegenerateGenerationError as e:
+            e.text = text
+            raise
+        return text
+    
+    async def agenerate_response(self, model: str, messages: List[Dict[str, str]],
+                                 temperature: float = 0.7, max_tokens: int = MAX_RESPONSE_TOKENS,
+                                 on_token: Optional[Callable[[str], None]] = None, role: Optional[str] = None,
+                                 sections: Optional[Dict[str, int]] = None,
+                                 response_format: Optional[Dict[str, Any]] = None) -> str:
+        """Async variant of generate_response with the same truncation, validation, early abort and retry"""
+        sections_token = PROMPT_SECTIONS.set(None)
+        try:
+            processed_messages = self._prepare_messages(messages, model, max_tokens)
+            max_tokens = self._output_tokens(model, max_tokens)
+            PROMPT_SECTIONS.set(self._log_prompt_sections(model, role, processed_messages, max_tokens, sections))
+            structured = {'response_format': response_format} if response_format else {}
+            
+            try:
+                result = await self._acomplete(model, processed_messages, on_token, role, temperature=temperature,
+                                               max_tokens=max_tokens, top_p=0.95, frequency_penalty=0.2,
+                                               presence_penalty=0.2, **structured)
+                valid = structured or self._validate_response(result)
+                retry_params = None if valid else {'temperature': 0.5, 'top_p': 0.9}
+            except DegenerateGenerationError:
+                retry_params = DEGENERACY_RETRY_PARAMS
+            
+            if retry_params is not None:
+                logger.warning("Generated response failed validation, attempting regeneration...")
+                regeneration_token = REGENERATION.set('degenerate' if retry_params is DEGENERACY_RETRY_PARAMS else 'validation')
+                try:
+                    result = await self._acomplete(model, processed_messages, on_token, role, max_tokens=max_tokens,
+                                                   **structured, **retry_params)
+                except DegenerateGenerationError as e:
+                    result = e.text
+                finally:
+                    REGENERATION.reset(regeneration_token)
+            
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error generating response with {model}: {str(e)}")
+            return f"Error: Could not generate response. Please ensure LM Studio is running and the model {model} is loaded."
+        finally:
+            PROMPT_SECTIONS.reset(sections_token)
+    
+    def astream_response(self, model: str, messages: List[Dict[str, str]], role: Optional[str] = None,
+                         **params) -> AsyncIterator[str]:
+        """Async iterator over the token deltas of one completion"""
+        return self._astream(model, self._prepare_messages(messages, model, params.get('max_tokens', MAX_RESPONSE_TOKENS)),
+                             role, **params)
+    
+    def close(self):
+        """Stop the health probes of a pool this client created itself"""
+        if self._owns_pool:
+            self.pool.close()
+    
+    async def _astream(self, model: str, processed_messages: List[Dict[str, str]], role: Optional[str],
+                       monitor: Optional[DegeneracyMonitor] = None, **params) -> AsyncIterator[str]:
+        started = time.perf_counter()
+        first_token_at = None
+        deltas = 0
+        usage = None
+        timings = None
+        finish_reason = None
+        with self.pool.lease(model) as endpoint:
+            stream = await endpoint.async_client().chat.completions.create(
+                model=model,
+                messages=processed_messages,
+                stream=True,
+                **params
+            )
+            try:
+                async for chunk in stream:
+                    usage = getattr(chunk, 'usage', None) or usage
+                    timings = getattr(chunk, 'timings', None) or timings
+                    if not chunk.choices:
+                        continue
+                    finish_reason = chunk.choices[0].finish_reason or finish_reason
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                        deltas += 1
+                        reason = monitor.feed(delta) if monitor else None
+                        if reason:
+                            logger.warning(f"Cancelled a degenerate answer from {model} after {deltas} tokens: {reason}")
+                            self._record_call(model, role, started, first_token_at, deltas, streamed=True, aborted=reason,
+                                              finish_reason='degenerate', endpoint=endpoint.base_url,
+                                              prompt_stats=self._prompt_stats(usage, timings))
+                            raise DegenerateGenerationError(reason, deltas)
+                        yield delta
+            finally:
+                # Closing the connection is what makes LM Studio stop generating, also when a hedge race cancels us
+                await stream.close()
+            self._record_call(model, role, started, first_token_at, (usage.completion_tokens if usage else None) or deltas,
+                              streamed=True, finish_reason=finish_reason, endpoint=endpoint.base_url, prompt_stats=self._prompt_stats(usage, timings))
+    
+    async def _acomplete(self, model: str, processed_messages: List[Dict[str, str]],
+                         on_token: Optional[Callable[[str], None]], role: Optional[str], **params) -> str:
+        """Async variant of _complete"""
+        key = self._cache_key(model, processed_messages, role, params)
+        cached = self._cached_response(key, model, role, on_token)
+        if cached is not None:
+            return cached
+        
+        # A failed endpoint is ejected from the pool, so each attempt goes to another one
+        attempts = len(self.pool.candidates(model))
+        for attempt in range(1, attempts + 1):
+            try:
+                result = await self._ahedged_request(model, processed_messages, on_token, role, **params)
+                break
+            except EndpointPool.failure_types as e:
+                if attempt == attempts:
+                    raise
+                logger.warning(f"Request for {model} failed ({str(e)}), retrying on another endpoint")
+        self._cache_store(key, model, role, result)
+        return result
+    
+    async def _ahedged_request(self, model: str, processed_messages: List[Dict[str, str]],
+                               on_token: Optional[Callable[[str], None]], role: Optional[str], **params) -> str:
+        """Send the call and, if it has produced nothing after the usual latency, a duplicate.
+        
+        Only hedged when the pool has another healthy endpoint for the model and, once the
+        delay has passed, one of them has a free slot: a single LM Studio server generates
+        one request at a time, so a duplicate there would only queue behind the slow call.
+        The duplicate goes to the least loaded endpoint. Both run until one returns an answer
+        that passes validation; the other is then cancelled. on_token shows whichever attempt
+        streamed first, and switches to the other if that one fails.
+        """
+        streamed = on_token is not None and STREAM_RESPONSES
+        params['timeout'] = self.latency.timeout(model, role, streamed)
+        delay = self.latency.hedge_delay(model, role, streamed) if self._hedging(model, role, streamed) else None
+        if delay is None:
+            return await self._arequest(model, processed_messages, on_token, role, **params)
+        
+        started = time.perf_counter()
+        texts = ["", ""]
+        first_output_at: List[Optional[float]] = [None, None]
+        finished_at: List[Optional[float]] = [None, None]
+        leader = None  # The attempt on_token is showing
+        first_output = asyncio.Event()
+        
+        def attempt_on_token(index: int) -> Optional[Callable[[str], None]]:
+            if on_token is None:
+                return None
+            
+            def forward(text: str):
+                nonlocal leader
+                texts[index] = text
+                if text and first_output_at[index] is None:
+                    first_output_at[index] = time.perf_counter()
+                    if leader is None:
+                        leader = index
+                        first_output.set()
+                if leader == index or (leader is None and index == 0):
+                    on_token(text)
+            return forward
+        
+        def start_attempt(index: int) -> asyncio.Task:
+            task = asyncio.create_task(self._arequest(model, processed_messages, attempt_on_token(index), role, **params))
+            task.add_done_callback(lambda _: finished_at.__setitem__(index, time.perf_counter()))
+            return task
+        
+        attempts = [start_attempt(0)]
+        waiter = asyncio.create_task(first_output.wait())
+        await asyncio.wait({attempts[0], waiter}, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+        waiter.cancel()
+        hedged = not attempts[0].done() and not first_output.is_set() and self.pool.has_free_slot(model)
+        if hedged:
+            logger.info(f"No {'first token' if streamed else 'answer'} from {model} for {role or 'call'} "
+                        f"after {delay:.2f}s, sending a hedged request")
+            attempts.append(start_attempt(1))
+        
+        pending = set(attempts)
+        result, fallback, error = None, None, None
+        try:
+            while pending and result is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=attempts.index):
+                    try:
+                        answer = task.result()
+                    except (DegenerateGenerationError, *EndpointPool.failure_types) as e:
+                        error = e
+                        continue
+                    if self._validate_response(answer):
+                        result, winner = answer, attempts.index(task)
+                        break
+                    fallback = answer
+                if result is None and pending and leader is not None and attempts[leader] not in pending:
+                    # The attempt on screen failed; show the one still running instead
+                    leader = attempts.index(next(iter(pending)))
+                    on_token(texts[leader])
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        if result is None:
+            if fallback is None:
+                raise error
+            result, winner = fallback, None
+        if on_token is not None and winner != leader:
+            on_token(result)
+        
+        now = time.perf_counter()
+        if streamed:
+            delivered = min([at for at in first_output_at if at is not None] or [now]) - started
+            unhedged = (first_output_at[0] or finished_at[0] or now) - started
+        else:
+            delivered = now - started
+            unhedged = (finished_at[0] or now) - started
+        self.latency.record_outcome(model, role, streamed, delivered, unhedged, hedged, hedged and winner == 1)
+        return result
+    
+    async def _arequest(self, model: str, processed_messages: List[Dict[str, str]],
+                        on_token: Optional[Callable[[str], None]], role: Optional[str], **params) -> str:
+        """Async variant of _request"""
+        if on_token is None or not STREAM_RESPONSES:
+            started = time.perf_counter()
+            with self.pool.lease(model) as endpoint:
+                response = await endpoint.async_client().chat.completions.create(
+                    model=model,
+                    messages=processed_messages,
+                    stream=False,
+                    **params
+                )
+                usage = getattr(response, 'usage', None)
+                self._record_call(model, role, started, None, usage.completion_tokens if usage else None, streamed=False,
+                                  finish_reason=response.choices[0].finish_reason, endpoint=endpoint.base_url,
+                                  prompt_stats=self._prompt_stats(usage, getattr(response, 'timings', None)))
+            return response.choices[0].message.content
+        
+        text = ""
+        on_token(text)
+        monitor = DegeneracyMonitor() if DEGENERACY_ABORT_ENABLED else None
+        try:
+            # Closed right here when a hedge race cancels this attempt, not whenever the loop gets to it
+            async with aclosing(self._astream(model, processed_messages, role, monitor, **params)) as deltas:
+                async for delta in deltas:
+                    text += delta
+                    on_token(text)
+        except DegenerateGenerationError as e:
+            e.text = text
+            raise
+        return text
+    
+    def _cache_key(self, model: str, processed_messages: List[Dict[str, str]], role: Optional[str],
+                   params: Dict[str, Any]) -> Optional[str]:
+        """Cache key for a call, or None when the role's answers are not cached"""
+        if self.cache is None or role not in self.cache_roles:
+            return None
+        return self.cache.key(model, processed_messages, params)
+    
+    def _cached_response(self, key: Optional[str], model: str, role: Optional[str],
+                         on_token: Optional[Callable[[str], None]]) -> Optional[str]:
+        """Serve a cached answer, logged like a call, unless caching is off or bypassed"""
+        if key is None or self.cache_bypass:
+            return None
+        started = time.perf_counter()
+        try:
+            result = self.cache.lookup(key)
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {str(e)}")
+            return None
+        if result is None:
+            return None
+        
+        if on_token is not None:
+            on_token(result)
+        self._record_call(model, role, started, None, None, streamed=False, cached=True, finish_reason='cached')
+        return result
+    
+    def _cache_store(self, key: Optional[str], model: str, role: Optional[str], result: str):
+        # Answers that would trigger a regeneration are not worth replaying
+        if key is None or not self._validate_response(result):
+            return
+        try:
+            self.cache.store(key, model, role, result)
+        except Exception as e:
+            logger.warning(f"Could not cache LLM response: {str(e)}")
+    
+    @staticmethod
+    def _prompt_stats(usage: Any, timings: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Prompt tokens, tokens reused from the server's prompt cache and prefill time, as far as the server reports them.
+        
+        llama.cpp-based servers add a 'timings' object (prompt_n counts only the tokens evaluated,
+        cache_n those reused); OpenAI-style servers report usage.prompt_tokens_details.cached_tokens.
+        """
+        stats = {'prompt_tokens': None, 'cached_prompt_tokens': None, 'prompt_ms': None}
+        if usage is not None:
+            stats['prompt_tokens'] = getattr(usage, 'prompt_tokens', None)
+            details = getattr(usage, 'prompt_tokens_details', None)
+            stats['cached_prompt_tokens'] = getattr(details, 'cached_tokens', None) if details else None
+        if timings:
+            evaluated, reused = timings.get('prompt_n'), timings.get('cache_n')
+            if reused is not None:
+                stats['cached_prompt_tokens'] = reused
+                if evaluated is not None:
+                    stats['prompt_tokens'] = evaluated + reused
+            stats['prompt_ms'] = timings.get('prompt_ms')
+        return stats
+    
+    def _record_call(self, model: str, role: Optional[str], started: float, first_token_at: Optional[float],
+                     completion_tokens: Optional[int], streamed: bool, cached: bool = False,
+                     prompt_stats: Optional[Dict[str, Any]] = None, aborted: Optional[str] = None,
+                     endpoint: Optional[str] = None, finish_reason: Optional[str] = None):
+        """Append one call's figures to call_log and the telemetry; aborted is why a degenerate answer was cancelled"""
+        finished = time.perf_counter()
+        generation_started = first_token_at or started
+        if not cached:
+            self.latency.observe(model, role, streamed,
+                                 first_token_at - started if streamed and first_token_at else finished - started)
+        prompt_stats = prompt_stats or {'prompt_tokens': None, 'cached_prompt_tokens': None, 'prompt_ms': None}
+        call = {
+            'role': role,
+            'model': model,
+            'endpoint': endpoint,
+            'streamed': streamed,
+            'cached': cached,
+            'ttft_s': first_token_at - started if first_token_at else None,
+            'total_s': finished - started,
+            'completion_tokens': completion_tokens,
+            # Decode speed after the first token, so prompt processing does not dilute it
+            'tokens_per_s': (completion_tokens / (finished - generation_started)
+                             if completion_tokens and finished > generation_started else None),
+            **prompt_stats,
+            'aborted': aborted,
+            'finish_reason': finish_reason,
+            'regeneration': REGENERATION.get(),
+            'prompt_sections': PROMPT_SECTIONS.get()
+        }
+        self.call_log.append(call)
+        self.telemetry.observe_call(call)
+    
+    def abort_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per model: streamed calls, how many were cancelled as degenerate and the tokens those generated first"""
+        summary = {}
+        for call in self.call_log:
+            if not call['streamed']:
+                continue
+            stats = summary.setdefault(call['model'], {'streamed_calls': 0, 'aborts': 0, 'wasted_tokens': 0})
+            stats['streamed_calls'] += 1
+            if call.get('aborted'):
+                stats['aborts'] += 1
+                stats['wasted_tokens'] += call['completion_tokens'] or 0
+        for stats in summary.values():
+            stats['abort_rate'] = stats['aborts'] / stats['streamed_calls']
+            stats['wasted_tokens_per_abort'] = stats['wasted_tokens'] / stats['aborts'] if stats['aborts'] else 0.0
+        return summary
+    
+    def _output_tokens(self, model: str, max_tokens: int) -> int:
+        """max_tokens to request, capped so the answer leaves room for the prompt"""
+        return self.budget.output_tokens(model, max_tokens) if self.budget else max_tokens
+    
+    def _log_prompt_sections(self, model: str, role: Optional[str], processed_messages: List[Dict[str, str]],
+                             max_tokens: int, sections: Optional[Dict[str, int]]) -> Optional[Dict[str, int]]:
+        """Log and return the token usage of every prompt section plus the whole prompt and the reserved answer"""
+        if not self.budget:
+            return None
+        usage = dict(sections or {})
+        usage['prompt_total'] = sum(self.budget.count(message['content'], model) for message in processed_messages)
+        usage['output_reserved'] = max_tokens
+        usage['context_window'] = self.budget.context_window(model)
+        logger.info(f"Prompt tokens for {role or 'call'} on {model} "
+                    f"({self.budget.counter.backend(model)}): " + ', '.join(f"{name}={tokens}" for name, tokens in usage.items()))
+        return usage
+    
+    def _prepare_messages(self, messages: List[Dict[str, str]], model: Optional[str] = None,
+                          max_tokens: int = MAX_RESPONSE_TOKENS) -> List[Dict[str, str]]:
+        """Better context management - keep essential context while truncating excess.
+        
+        With a context budget the prompt is measured in the model's tokens and only trimmed
+        if it would not fit next to the reserved answer; otherwise long messages are cut by characters.
+        """
+        if self.budget and model:
+            return self.budget.fit_messages(model, [{'role': msg['role'], 'content': msg['content']} for msg in messages],
+                                            max_tokens)
+        
+        processed_messages = []
+        for msg in messages:
+            content = msg['content']
+            # More intelligent truncation that preserves structure
+            if len(content) > 8000:  # Increased from 4000
+                # Try to preserve key sections
+                lines = content.split('\n')
+                preserved_lines = []
+                char_count = 0
                 
-                processed_messages.append({
-                    'role': msg['role'],
-                    'content': content
-                })
-            
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=processed_messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                stream=False,
-                # Adjusted parameters for better output
-                top_p=0.95,  # Slightly increased for more diverse responses
-                frequency_penalty=0.2,  # Increased to reduce repetition
-                presence_penalty=0.2  # Increased to encourage more original content
-            )
-            
-            result = response.choices[0].message.content
-            
-            # Validate response quality
-            if not self._validate_response(result):
-                logger.warning("Generated response failed validation, attempting regeneration...")
-                # Try once more with lower temperature for more focused response
-                response = self.client.chat.completions.create(
-                    model=model,
-                    messages=processed_messages,
-                    temperature=0.5,
-                    max_tokens=max_tokens,
-                    stream=False,
-                    top_p=0.9
-                )
-                result = response.choices[0].message.content
-            
-            return result
+                for line in lines:
+                    if char_count + len(line) > 7500:  # Increased from 3500
+                        preserved_lines.append("...[content truncated for context management]...")
+                        break
+                    preserved_lines.append(line)
+                    char_count += len(line)
+                
+                content = '\n'.join(preserved_lines)
             
-        except Exception as e:
-            logger.error(f"Error generating response with {model}: {str(e)}")
-            return f"Error: Could not generate response. Please ensure LM Studio is running and the model {model} is loaded."
+            processed_messages.append({
+                'role': msg['role'],
+                'content': content
+            })
+        return processed_messages
     
     def _validate_response(self, response: str) -> bool:
         """Validate response quality and coherence"""
@@ -274,39 +3387,239 @@ class LMStudioClient:
 class DebateAgent:
     """Base class for debate agents"""
     
-    def __init__(self, role: AgentRole, model: str, client: LMStudioClient):
+    evidence_window = VERIFIER_EVIDENCE_WINDOW
+    opponent_evidence_share = OPPONENT_EVIDENCE_SHARE
+    temperature = 0.7
+    max_tokens = 2048
+    
+    flexible_sections = ('evidence', 'opponent_evidence', 'opponent_history')  # Prompt parts sized by the context budget
+    
+    # Prompt text; everything except the opponent context and round number is fixed for a debate
+    opponent_name = "Opponent"
+    opponent_role: Optional[AgentRole] = None
+    system_prompt = ""
+    prompt_intro = ""
+    claim_label = "CLAIM"
+    task_instructions = ""
+    closing = ""
+    
+    def __init__(self, role: AgentRole, model: str, client: LMStudioClient,
+                 passage_index: Optional[PassageIndex] = None):
         self.role = role
         self.model = model
         self.client = client  # Add this line that was missing
+        self.passage_index = passage_index
         self.conversation_history = []
+        self.budget = getattr(client, 'budget', None)
+        self.prompt_sections: Optional[Dict[str, int]] = None  # Token usage of the last prompt built
     
-    def generate_argument(self, claim: str, evidence: List[Dict[str, Any]], 
-                         opponent_arguments: List[str] = None, round_num: int = 1) -> str:
-        """Generate argument based on role and evidence"""
-        raise NotImplementedError
-
-class VerifierAgent(DebateAgent):
-    """Agent that argues in favor of the claim with improved prompting"""
+    def generate_argument(self, claim: str, evidence: Union[List[Dict[str, Any]], EvidencePack], 
+                         opponent_arguments: List[str] = None, round_num: int = 1,
+                         on_token: Optional[Callable[[str], None]] = None,
+                         debate_memory: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+        """Generate argument based on role and evidence.
+        
+        debate_memory maps each role to its DebateMemory digest; with it the opponent's
+        earlier rounds are summarized and only their latest argument is shown in full.
+        """
+        messages = self._build_messages(claim, evidence, opponent_arguments, round_num, debate_memory)
+        return self.client.generate_response(self.model, messages, temperature=self.temperature,
+                                             max_tokens=self.max_tokens, on_token=on_token, role=self.role.value,
+                                             sections=self.prompt_sections)
+    
+    async def agenerate_argument(self, claim: str, evidence: Union[List[Dict[str, Any]], EvidencePack], 
+                                 opponent_arguments: List[str] = None, round_num: int = 1,
+                                 on_token: Optional[Callable[[str], None]] = None,
+                                 debate_memory: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+        """Async variant of generate_argument"""
+        messages = self._build_messages(claim, evidence, opponent_arguments, round_num, debate_memory)
+        return await self.client.agenerate_response(self.model, messages, temperature=self.temperature,
+                                                    max_tokens=self.max_tokens, on_token=on_token, role=self.role.value,
+                                                    sections=self.prompt_sections)
     
-    def generate_argument(self, claim: str, evidence: List[Dict[str, Any]], 
-                         opponent_arguments: List[str] = None, round_num: int = 1) -> str:
+    def _build_messages(self, claim: str, evidence: Union[List[Dict[str, Any]], EvidencePack],
+                        opponent_arguments: List[str] = None, round_num: int = 1,
+                        debate_memory: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, str]]:
+        """Chat messages for one turn, laid out according to PROMPT_LAYOUT"""
+        memory_text, opponent_arguments = self._debate_memory_text(opponent_arguments or [], debate_memory)
+        last_opponent_argument = opponent_arguments[-1] if opponent_arguments else None
+        evidence_text, shown = self._claim_evidence(claim, evidence)
+        if self.budget:
+            opponent_evidence, opponent_context = self._budgeted_debate_context(
+                claim, evidence_text, shown, opponent_arguments, round_num, memory_text)
+        else:
+            opponent_evidence = self._opponent_passages(claim, last_opponent_argument, shown)
+            opponent_context = memory_text + self._process_opponent_arguments(opponent_arguments, self.opponent_name)
         
-        # Better evidence processing
-        evidence_text = self._process_evidence(evidence)
-        opponent_context = self._process_opponent_arguments(opponent_arguments, "Counter-Explainer")
+        if PROMPT_LAYOUT == "stable_prefix":
+            return self._stable_prefix_messages(claim, evidence_text, opponent_evidence + opponent_context, round_num)
         
-        # More structured and specific prompt
-        prompt = f"""You are a skilled fact-checker and debater. Your role is to present a strong, evidence-based argument supporting this claim:
+        prompt = f"""{self.prompt_intro}
 
-CLAIM TO SUPPORT: "{claim}"
+{self.claim_label}: "{claim}"
 
 AVAILABLE EVIDENCE:
-{evidence_text}
+{evidence_text}{opponent_evidence}
 
 {opponent_context}
 
 TASK FOR ROUND {round_num}:
-Write a focused argument that SUPPORTS the claim. Your response must:
+{self.task_instructions}
+
+{self.closing}"""
+        
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _stable_prefix_messages(self, claim: str, evidence_text: str, debate_context: str,
+                                round_num: int) -> List[Dict[str, str]]:
+        """Everything fixed for the debate goes in the system message, so every turn of this role starts with
+        byte-identical text and the server only evaluates the opponent context and round that follow it"""
+        system = f"""{self.system_prompt}
+
+{self.prompt_intro}
+
+YOUR TASK IN EVERY ROUND:
+{self.task_instructions}
+
+{self.claim_label}: "{claim}"
+
+AVAILABLE EVIDENCE:
+{evidence_text}"""
+        
+        user = f"""{debate_context.strip()}
+
+TASK FOR ROUND {round_num}: {self.closing}"""
+        
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user.strip()}
+        ]
+    
+    def _process_opponent_arguments(self, arguments: List[str], opponent_name: str,
+                                    budget_tokens: Optional[int] = None) -> str:
+        """Opponent arguments for context"""
+        return ""
+    
+    def _debate_memory_text(self, opponent_arguments: List[str],
+                            debate_memory: Optional[Dict[str, Dict[str, Any]]]) -> Tuple[str, List[str]]:
+        """Digest of both sides' earlier rounds and the opponent arguments still shown in full"""
+        opponent_digest = (debate_memory or {}).get(self.opponent_role.value) if self.opponent_role else None
+        if not opponent_digest or not opponent_arguments:
+            return "", opponent_arguments
+        digests = [DebateMemory.render(debate_memory.get(self.role.value), "Your side"),
+                   DebateMemory.render(opponent_digest, self.opponent_name, before_round=opponent_digest['through_round'])]
+        text = '\n\n'.join(digest for digest in digests if digest)
+        return (f"\n\n{text}" if text else ""), opponent_arguments[-1:]
+    
+    def _fixed_prompt_text(self, claim: str, round_num: int = 1) -> str:
+        """All prompt text that does not depend on the evidence or the debate so far"""
+        return ''.join(message['content'] for message in self._stable_prefix_messages(claim, "", "", round_num))
+    
+    def _section_budgets(self, claim: str) -> Dict[str, int]:
+        """Fixed token share of every flexible section; depends only on the claim, so it is the same every round"""
+        available = self.budget.available(self.model, self.max_tokens, self._fixed_prompt_text(claim))
+        return self.budget.shares(available, self.flexible_sections)
+    
+    def _measure(self, text: str) -> int:
+        return self.budget.count(text, self.model)
+    
+    def _budgeted_debate_context(self, claim: str, evidence_text: str, shown: Tuple[int, ...],
+                                 opponent_arguments: List[str], round_num: int, memory_text: str = "") -> Tuple[str, str]:
+        """Opponent passages and argument history sized to the tokens the fixed text, evidence and digest leave free"""
+        fixed_text = self._fixed_prompt_text(claim, round_num)
+        available = self.budget.available(self.model, self.max_tokens, fixed_text + evidence_text + memory_text)
+        recent = opponent_arguments[-2:]  # Only use last 2 arguments to avoid token overflow
+        wants_passages = self.passage_index and opponent_arguments and self.opponent_evidence_share
+        budgets = self.budget.fill(available, {
+            # Opponent passages are a supplement: they never grow past their fixed share
+            'opponent_evidence': self._section_budgets(claim)['opponent_evidence'] if wants_passages else 0,
+            'opponent_history': sum(self._measure(argument) for argument in recent)
+        })
+        
+        opponent_evidence = self._opponent_passages(claim, opponent_arguments[-1] if opponent_arguments else None,
+                                                    shown, budgets['opponent_evidence'])
+        opponent_context = memory_text + self._process_opponent_arguments(opponent_arguments, self.opponent_name,
+                                                                          budgets['opponent_history'])
+        self.prompt_sections = {
+            'fixed': self._measure(fixed_text),
+            'evidence': self._measure(evidence_text),
+            'opponent_evidence': self._measure(opponent_evidence),
+            'opponent_history': self._measure(opponent_context)
+        }
+        return opponent_evidence, opponent_context
+    
+    def _recent_arguments(self, arguments: List[str], max_chars: int, budget_tokens: Optional[int]) -> List[str]:
+        """Arguments cut to a shared token budget, or each to max_chars without a context budget"""
+        if budget_tokens is None:
+            return [f"{argument[:max_chars]}..." for argument in arguments]
+        return self.budget.fit_arguments(arguments, budget_tokens, self.model)
+    
+    def _select_passages(self, claim: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+        """Passages ranked against the claim that fill the claim's part of the evidence budget, or None without an index"""
+        if not self.passage_index or not claim:
+            return None
+        if self.budget:
+            return self.passage_index.select(claim, self._section_budgets(claim)['evidence'], measure=self._measure)
+        max_sources, max_chars = self.evidence_window
+        return self.passage_index.select(claim, int(max_sources * max_chars * (1 - self.opponent_evidence_share)))
+    
+    def _process_evidence(self, evidence: List[Dict[str, Any]], claim: Optional[str] = None) -> str:
+        """Render evidence for this role's prompt"""
+        raise NotImplementedError
+    
+    def render_evidence(self, evidence: List[Dict[str, Any]], claim: str) -> Tuple[str, Tuple[int, ...]]:
+        """Claim-ranked evidence text for this role and the passage ids it contains"""
+        selections = self._select_passages(claim) or []
+        shown = tuple(passage for selection in selections for passage in selection['passage_ids'])
+        text = self._process_evidence(evidence, claim)
+        if self.budget and claim:
+            # Source headers are not part of the passage budget, so the rendering may still need a trim
+            text = self.budget.counter.truncate(text, self._section_budgets(claim)['evidence'], self.model)
+        return text, shown
+    
+    def _evidence_text(self, claim: str, evidence: Union[List[Dict[str, Any]], EvidencePack], opponent_argument: Optional[str] = None) -> str:
+        """Evidence from the debate's EvidencePack (or a raw source list) plus passages aimed at the opponent"""
+        text, shown = self._claim_evidence(claim, evidence)
+        return text + self._opponent_passages(claim, opponent_argument, shown)
+    
+    def _claim_evidence(self, claim: str, evidence: Union[List[Dict[str, Any]], EvidencePack]) -> Tuple[str, Tuple[int, ...]]:
+        """The claim-ranked evidence text, identical for every turn of the debate, and the passage ids it shows"""
+        if isinstance(evidence, EvidencePack):
+            return evidence.rendering(self.role.value), evidence.shown_passages(self.role.value)
+        return self.render_evidence(evidence, claim)
+    
+    def _opponent_passages(self, claim: str, opponent_argument: Optional[str], shown: Tuple[int, ...],
+                           budget_tokens: Optional[int] = None) -> str:
+        """Extra passages matching the opponent's last argument that the claim-ranked evidence left out"""
+        if not self.passage_index or not opponent_argument or not self.opponent_evidence_share:
+            return ""
+        if budget_tokens is not None:
+            selections = self.passage_index.select(claim, budget_tokens, opponent_argument, exclude=shown,
+                                                   measure=self._measure)
+        else:
+            max_sources, max_chars = self.evidence_window
+            budget = int(max_sources * max_chars * self.opponent_evidence_share)
+            selections = self.passage_index.select(claim, budget, opponent_argument, exclude=shown)
+        if not selections:
+            return ""
+        passages = [f"SOURCE {selection['number']}: {selection['text']}" for selection in selections]
+        return "\n\nPASSAGES RELEVANT TO THE OPPONENT'S LAST ARGUMENT:\n" + '\n\n'.join(passages)
+
+class VerifierAgent(DebateAgent):
+    """Agent that argues in favor of the claim with improved prompting"""
+    
+    evidence_window = VERIFIER_EVIDENCE_WINDOW
+    temperature = 0.6
+    
+    opponent_name = "Counter-Explainer"
+    opponent_role = AgentRole.COUNTER_EXPLAINER
+    system_prompt = """You are an expert fact-checker and debater specializing in evidence-based argumentation. You present clear, logical arguments supporting claims using credible sources. Always stay on topic and provide structured, coherent responses. Focus on quality over quantity."""
+    prompt_intro = "You are a skilled fact-checker and debater. Your role is to present a strong, evidence-based argument supporting this claim:"
+    claim_label = "CLAIM TO SUPPORT"
+    task_instructions = """Write a focused argument that SUPPORTS the claim. Your response must:
 
 1. START with a clear thesis statement about why the claim is true
 2. PRESENT 2-3 specific pieces of evidence from the sources
@@ -319,71 +3632,62 @@ REQUIREMENTS:
 - Use logical reasoning and evidence-based arguments
 - Stay focused on supporting the claim
 - Be persuasive but factual
-- Do not repeat previous arguments unless building upon them
-
-Write your argument now:"""
-
-        messages = [
-            {
-                "role": "system", 
-                "content": """You are an expert fact-checker and debater specializing in evidence-based argumentation. You present clear, logical arguments supporting claims using credible sources. Always stay on topic and provide structured, coherent responses. Focus on quality over quantity."""
-            },
-            {"role": "user", "content": prompt}
-        ]
-        
-        return self.client.generate_response(self.model, messages, temperature=0.6, max_tokens=2048)
+- Do not repeat previous arguments unless building upon them"""
+    closing = "Write your argument now:"
     
-    def _process_evidence(self, evidence: List[Dict[str, Any]]) -> str:
+    def _process_evidence(self, evidence: List[Dict[str, Any]], claim: Optional[str] = None) -> str:
         """Process evidence into a clean, structured format"""
         if not evidence:
             return "No evidence available."
         
+        selections = self._select_passages(claim)
+        if selections is not None:
+            processed = [f"""SOURCE {selection['number']}: {selection['source'].get('title', 'Unknown Source')[:200]}
+URL: {selection['source'].get('url', '')}{format_corroboration(selection['source'])}
+CONTENT: {selection['text']}
+---""" for selection in selections]
+            return '\n\n'.join(processed) if processed else "No valid evidence found."
+        
+        max_sources, max_chars = self.evidence_window
         processed = []
-        for i, item in enumerate(evidence[:5]):  # Limit to top 5 sources
+        for i, item in enumerate(unique_evidence(evidence)[:max_sources]):  # Limit to top 5 sources
             if item.get('status') == 'success':
                 title = item.get('title', 'Unknown Source')[:200]  # Increased from 100
                 url = item.get('url', '')
-                content = item.get('content', '')[:2000]  # Increased from 800
+                content = item.get('content', '')[:max_chars]  # Increased from 800
+                corroboration = format_corroboration(item)
                 
                 processed.append(f"""SOURCE {i+1}: {title}
-URL: {url}
+URL: {url}{corroboration}
 CONTENT: {content}
 ---""")
         
         return '\n\n'.join(processed) if processed else "No valid evidence found."
     
-    def _process_opponent_arguments(self, arguments: List[str], opponent_name: str) -> str:
+    def _process_opponent_arguments(self, arguments: List[str], opponent_name: str,
+                                    budget_tokens: Optional[int] = None) -> str:
         """Process opponent arguments for context"""
         if not arguments:
             return ""
         
         formatted_args = []
-        for i, arg in enumerate(arguments[-2:]):  # Only use last 2 arguments to avoid token overflow
-            formatted_args.append(f"{opponent_name} Argument {i+1}: {arg[:1000]}...")  # Increased from 500
+        # Only use last 2 arguments to avoid token overflow
+        for i, arg in enumerate(self._recent_arguments(arguments[-2:], 1000, budget_tokens)):  # Increased from 500
+            formatted_args.append(f"{opponent_name} Argument {i+1}: {arg}")
         
         return f"\n\nPREVIOUS {opponent_name.upper()} ARGUMENTS:\n" + '\n\n'.join(formatted_args)
 
 class CounterExplainerAgent(DebateAgent):
     """Agent that provides alternative explanations with improved prompting"""
     
-    def generate_argument(self, claim: str, evidence: List[Dict[str, Any]], 
-                         opponent_arguments: List[str] = None, round_num: int = 1) -> str:
-        
-        evidence_text = self._process_evidence(evidence)
-        verifier_context = self._process_opponent_arguments(opponent_arguments, "Verifier")
-        
-        # More structured prompt with clear role definition
-        prompt = f"""You are a thoughtful analyst providing balanced perspective on complex topics. Your role is to offer nuanced analysis and alternative viewpoints.
-
-CLAIM BEING DISCUSSED: "{claim}"
-
-AVAILABLE EVIDENCE:
-{evidence_text}
-
-{verifier_context}
-
-TASK FOR ROUND {round_num}:
-Provide a balanced analysis that adds depth and nuance to the discussion. Your response should:
+    evidence_window = COUNTER_EXPLAINER_EVIDENCE_WINDOW
+    
+    opponent_name = "Verifier"
+    opponent_role = AgentRole.VERIFIER
+    system_prompt = """You are a thoughtful analyst who provides nuanced perspectives on complex topics. You excel at identifying alternative explanations, adding important context, and highlighting the complexity of issues. You are constructive and balanced, seeking to enrich understanding rather than simply oppose. Always provide substantive, well-reasoned analysis."""
+    prompt_intro = "You are a thoughtful analyst providing balanced perspective on complex topics. Your role is to offer nuanced analysis and alternative viewpoints."
+    claim_label = "CLAIM BEING DISCUSSED"
+    task_instructions = """Provide a balanced analysis that adds depth and nuance to the discussion. Your response should:
 
 1. START with acknowledgment of any valid points from the Verifier
 2. IDENTIFY alternative explanations or interpretations of the evidence
@@ -403,64 +3707,149 @@ REQUIREMENTS:
 - Keep response between 500-1000 words
 - Stay focused and avoid repetition
 - Provide substantive analysis
-- Be respectful of different viewpoints
-
-Write your analysis now:"""
-
-        messages = [
-            {
-                "role": "system", 
-                "content": """You are a thoughtful analyst who provides nuanced perspectives on complex topics. You excel at identifying alternative explanations, adding important context, and highlighting the complexity of issues. You are constructive and balanced, seeking to enrich understanding rather than simply oppose. Always provide substantive, well-reasoned analysis."""
-            },
-            {"role": "user", "content": prompt}
-        ]
-        
-        return self.client.generate_response(self.model, messages, temperature=0.7, max_tokens=2048)
+- Be respectful of different viewpoints"""
+    closing = "Write your analysis now:"
     
-    def _process_evidence(self, evidence: List[Dict[str, Any]]) -> str:
+    def _process_evidence(self, evidence: List[Dict[str, Any]], claim: Optional[str] = None) -> str:
         """Process evidence into a clean, structured format"""
         if not evidence:
             return "No evidence available."
         
+        selections = self._select_passages(claim)
+        if selections is not None:
+            processed = [f"""SOURCE {selection['number']}: {selection['source'].get('title', 'Unknown Source')[:100]}
+URL: {selection['source'].get('url', '')}{format_corroboration(selection['source'])}
+CONTENT: {selection['text']}
+---""" for selection in selections]
+            return '\n\n'.join(processed) if processed else "No valid evidence found."
+        
+        max_sources, max_chars = self.evidence_window
         processed = []
-        for i, item in enumerate(evidence[:5]):
+        for i, item in enumerate(unique_evidence(evidence)[:max_sources]):
             if item.get('status') == 'success':
                 title = item.get('title', 'Unknown Source')[:100]
                 url = item.get('url', '')
-                content = item.get('content', '')[:800]
+                content = item.get('content', '')[:max_chars]
+                corroboration = format_corroboration(item)
                 
                 processed.append(f"""SOURCE {i+1}: {title}
-URL: {url}
+URL: {url}{corroboration}
 CONTENT: {content}
 ---""")
         
         return '\n\n'.join(processed) if processed else "No valid evidence found."
     
-    def _process_opponent_arguments(self, arguments: List[str], opponent_name: str) -> str:
+    def _process_opponent_arguments(self, arguments: List[str], opponent_name: str,
+                                    budget_tokens: Optional[int] = None) -> str:
         """Process opponent arguments for context"""
         if not arguments:
             return ""
         
         formatted_args = []
-        for i, arg in enumerate(arguments[-2:]):
-            formatted_args.append(f"{opponent_name} Argument {i+1}: {arg[:500]}...")
+        for i, arg in enumerate(self._recent_arguments(arguments[-2:], 500, budget_tokens)):
+            formatted_args.append(f"{opponent_name} Argument {i+1}: {arg}")
         
         return f"\n\nPREVIOUS {opponent_name.upper()} ARGUMENTS TO ANALYZE:\n" + '\n\n'.join(formatted_args)
 
 class JudgeAgent(DebateAgent):
     """Agent that provides comprehensive debate analysis with structured, detailed prompting"""
     
-    def make_judgment(self, claim: str, evidence: List[Dict[str, Any]], 
-                     verifier_arguments: List[str], counter_explainer_arguments: List[str]) -> str:
+    evidence_window = JUDGE_EVIDENCE_WINDOW
+    opponent_evidence_share = 0  # The Judge has no opponent; the whole budget goes to the claim
+    flexible_sections = ('evidence', 'debate_history')
+    
+    temperature = 0.3  # Lower temperature for more focused, structured responses
+    
+    def make_judgment(self, claim: str, evidence: Union[List[Dict[str, Any]], EvidencePack], 
+                     verifier_arguments: List[str], counter_explainer_arguments: List[str],
+                     on_token: Optional[Callable[[str], None]] = None,
+                     debate_memory: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
         
         # Validate inputs first
         if not verifier_arguments or not counter_explainer_arguments:
             return "Insufficient debate content to analyze. At least one argument from each side is required."
         
-        evidence_summary = self._summarize_evidence_safely(evidence)
-        verifier_summary = self._format_arguments_for_analysis(verifier_arguments, "Verifier")
-        counter_explainer_summary = self._format_arguments_for_analysis(counter_explainer_arguments, "Counter-Explainer")
+        messages = self._build_judgment_messages(claim, evidence, verifier_arguments, counter_explainer_arguments,
+                                                 debate_memory)
+        response = self.client.generate_response(self.model, messages, temperature=self.temperature,
+                                                 max_tokens=self.max_tokens, on_token=on_token, role=self.role.value,
+                                                 sections=self.prompt_sections)
         
+        # Validate the response structure
+        return self._validate_structured_response(response, verifier_arguments, counter_explainer_arguments, evidence)
+    
+    async def amake_judgment(self, claim: str, evidence: Union[List[Dict[str, Any]], EvidencePack], 
+                             verifier_arguments: List[str], counter_explainer_arguments: List[str],
+                             on_token: Optional[Callable[[str], None]] = None,
+                             debate_memory: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+        """Async variant of make_judgment"""
+        if not verifier_arguments or not counter_explainer_arguments:
+            return "Insufficient debate content to analyze. At least one argument from each side is required."
+        
+        messages = self._build_judgment_messages(claim, evidence, verifier_arguments, counter_explainer_arguments,
+                                                 debate_memory)
+        response = await self.client.agenerate_response(self.model, messages, temperature=self.temperature,
+                                                        max_tokens=self.max_tokens, on_token=on_token,
+                                                        role=self.role.value, sections=self.prompt_sections)
+        return self._validate_structured_response(response, verifier_arguments, counter_explainer_arguments, evidence)
+    
+    def _build_judgment_messages(self, claim: str, evidence: Union[List[Dict[str, Any]], EvidencePack],
+                                 verifier_arguments: List[str], counter_explainer_arguments: List[str],
+                                 debate_memory: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, str]]:
+        """Chat messages asking for the structured debate analysis"""
+        evidence_summary = self._evidence_text(claim, evidence)
+        debate_memory = debate_memory or {}
+        verifier_earlier, verifier_arguments, verifier_first = self._earlier_rounds(
+            verifier_arguments, debate_memory.get(AgentRole.VERIFIER.value), "Verifier")
+        counter_earlier, counter_explainer_arguments, counter_first = self._earlier_rounds(
+            counter_explainer_arguments, debate_memory.get(AgentRole.COUNTER_EXPLAINER.value), "Counter-Explainer")
+        if self.budget:
+            # The digests are placed as they are; the arguments share what they leave
+            verifier_arguments, counter_explainer_arguments = self._fit_debate_history(
+                claim, evidence_summary + verifier_earlier + counter_earlier, verifier_arguments,
+                counter_explainer_arguments)
+        verifier_summary = verifier_earlier + self._format_arguments_for_analysis(
+            verifier_arguments, "Verifier", verifier_first)
+        counter_explainer_summary = counter_earlier + self._format_arguments_for_analysis(
+            counter_explainer_arguments, "Counter-Explainer", counter_first)
+        
+        messages = self._judgment_messages(claim, evidence_summary, verifier_summary, counter_explainer_summary)
+        if self.budget:
+            self.prompt_sections = {
+                'fixed': self._measure(self._fixed_prompt_text(claim)),
+                'evidence': self._measure(evidence_summary),
+                'debate_history': self._measure(verifier_summary) + self._measure(counter_explainer_summary)
+            }
+        return messages
+    
+    def _fixed_prompt_text(self, claim: str, round_num: int = 1) -> str:
+        return ''.join(message['content'] for message in self._judgment_messages(claim, "", "", ""))
+    
+    def _earlier_rounds(self, arguments: List[str], digest: Optional[Dict[str, Any]],
+                        side_name: str) -> Tuple[str, List[str], int]:
+        """Digest of the rounds not read in full, the arguments that are, and the round the first of them was"""
+        if not digest or len(arguments) <= DEBATE_MEMORY_JUDGE_ROUNDS:
+            return "", arguments, 1
+        first_round = len(arguments) - DEBATE_MEMORY_JUDGE_ROUNDS + 1
+        text = DebateMemory.render(digest, side_name, before_round=first_round)
+        return (f"{text}\n\n" if text else ""), arguments[-DEBATE_MEMORY_JUDGE_ROUNDS:], first_round
+    
+    def _fit_debate_history(self, claim: str, evidence_summary: str, verifier_arguments: List[str],
+                            counter_explainer_arguments: List[str]) -> Tuple[List[str], List[str]]:
+        """Trim both sides' arguments to the tokens left after the fixed text, the evidence and the round markers"""
+        markers = (self._format_arguments_for_analysis([""] * len(verifier_arguments), "Verifier")
+                   + self._format_arguments_for_analysis([""] * len(counter_explainer_arguments), "Counter-Explainer"))
+        available = self.budget.available(self.model, self.max_tokens,
+                                          self._fixed_prompt_text(claim) + evidence_summary + markers)
+        budgets = self.budget.fill(available, {
+            'verifier': sum(self._measure(argument) for argument in verifier_arguments),
+            'counter_explainer': sum(self._measure(argument) for argument in counter_explainer_arguments)
+        })
+        return (self.budget.fit_arguments(verifier_arguments, budgets['verifier'], self.model),
+                self.budget.fit_arguments(counter_explainer_arguments, budgets['counter_explainer'], self.model))
+    
+    def _judgment_messages(self, claim: str, evidence_summary: str, verifier_summary: str,
+                           counter_explainer_summary: str) -> List[Dict[str, str]]:
         # Detailed, structured prompt similar to other agents
         prompt = f"""You are an expert debate judge and critical analyst. Your role is to provide a thorough, objective analysis of the debate between two AI agents regarding a specific claim.
 
@@ -534,15 +3923,9 @@ You NEVER introduce information not present in the source materials. You quote d
             {"role": "user", "content": prompt}
         ]
         
-        # Use lower temperature for more focused, structured responses
-        response = self.client.generate_response(self.model, messages, temperature=0.3, max_tokens=2048)
-        
-        # Validate the response structure
-        validated_response = self._validate_structured_response(response, verifier_arguments, counter_explainer_arguments, evidence)
-        
-        return validated_response
+        return messages
     
-    def _format_arguments_for_analysis(self, arguments: List[str], role_name: str) -> str:
+    def _format_arguments_for_analysis(self, arguments: List[str], role_name: str, first_round: int = 1) -> str:
         """Format arguments in a clear, structured way for judge analysis"""
         if not arguments:
             return f"{role_name}: No arguments were presented during the debate."
@@ -551,7 +3934,7 @@ You NEVER introduce information not present in the source materials. You quote d
         
         for i, arg in enumerate(arguments):
             # Add clear argument markers and preserve full content
-            formatted += f"--- {role_name.upper()} ROUND {i+1} ARGUMENT ---\n"
+            formatted += f"--- {role_name.upper()} ROUND {first_round + i} ARGUMENT ---\n"
             formatted += f"{arg}\n\n"
         
         return formatted
@@ -596,39 +3979,194 @@ You NEVER introduce information not present in the source materials. You quote d
         # The method now just returns the response unchanged
         return response
     
-    def _summarize_evidence_safely(self, evidence: List[Dict[str, Any]]) -> str:
+    def _process_evidence(self, evidence: List[Dict[str, Any]], claim: Optional[str] = None) -> str:
+        return self._summarize_evidence_safely(evidence, claim)
+    
+    def _summarize_evidence_safely(self, evidence: List[Dict[str, Any]], claim: Optional[str] = None) -> str:
         """Enhanced evidence summary with better structure"""
         if not evidence:
             return "No evidence sources were provided for analysis."
         
-        successful_sources = [e for e in evidence if e.get('status') == 'success']
-        failed_sources = len(evidence) - len(successful_sources)
+        max_sources, max_chars = self.evidence_window
+        successful_sources = [e for e in unique_evidence(evidence) if e.get('status') == 'success']
+        failed_sources = len([e for e in evidence if e.get('status') != 'success'])
+        duplicate_sources = len(evidence) - len(unique_evidence(evidence))
         
         if not successful_sources:
             return f"EVIDENCE STATUS: All {len(evidence)} evidence sources failed to load successfully.\nNo source content available for analysis."
         
-        summary = f"EVIDENCE STATUS: Successfully loaded {len(successful_sources)} out of {len(evidence)} sources.\n"
+        summary = f"EVIDENCE STATUS: Successfully loaded {len(successful_sources) + duplicate_sources} out of {len(evidence)} sources.\n"
         if failed_sources > 0:
-            summary += f"Note: {failed_sources} source(s) failed to load and are not included in this analysis.\n\n"
+            summary += f"Note: {failed_sources} source(s) failed to load and are not included in this analysis.\n"
+        if duplicate_sources > 0:
+            summary += f"Note: {duplicate_sources} source(s) repeat another source's text and are listed as corroborating it.\n"
+        summary += "\n"
         
         summary += "AVAILABLE EVIDENCE SOURCES:\n\n"
         
-        for i, source in enumerate(successful_sources[:4]):  # Limit to top 4 to prevent overflow
+        selections = self._select_passages(claim)
+        if selections is not None:
+            for selection in selections:
+                source = selection['source']
+                summary += f"SOURCE {selection['number']}:\n"
+                summary += f"Title: {source.get('title', 'No title available')[:100]}\n"
+                summary += f"URL: {source.get('url', 'No URL')}{format_corroboration(source)}\n"
+                summary += f"Most Relevant Passages: {selection['text']}\n"
+                summary += f"[Content length: ~{len(source.get('content', ''))} characters]\n\n"
+            if len(successful_sources) > len(selections):
+                summary += f"[{len(successful_sources) - len(selections)} additional sources available but not shown because their passages ranked below the context budget]\n\n"
+            return summary
+        
+        for i, source in enumerate(successful_sources[:max_sources]):  # Limit to top 4 to prevent overflow
             title = source.get('title', 'No title available')[:100]
             url = source.get('url', 'No URL')
-            content_preview = source.get('content', 'No content')[:400]  # Increased preview
+            content_preview = source.get('content', 'No content')[:max_chars]  # Increased preview
             
             summary += f"SOURCE {i+1}:\n"
             summary += f"Title: {title}\n"
-            summary += f"URL: {url}\n"
+            summary += f"URL: {url}{format_corroboration(source)}\n"
             summary += f"Content Preview: {content_preview}\n"
             summary += f"[Content length: ~{len(source.get('content', ''))} characters]\n\n"
         
-        if len(successful_sources) > 4:
-            summary += f"[{len(successful_sources) - 4} additional sources available but not shown in detail to manage context length]\n\n"
+        if len(successful_sources) > max_sources:
+            summary += f"[{len(successful_sources) - max_sources} additional sources available but not shown in detail to manage context length]\n\n"
         
         return summary
 
+_PARTIAL_JSON_STRING_RE = re.compile(r'"(\w+)"\s*:\s*"((?:[^"\\]|\\.)*)')
+
+def partial_json_strings(text: str) -> Dict[str, str]:
+    """String fields of a JSON object that may still be streaming; the last one can be cut short"""
+    fields = {}
+    for name, raw in _PARTIAL_JSON_STRING_RE.findall(text):
+        try:
+            fields[name] = json.loads(f'"{raw}"')
+        except json.JSONDecodeError:  # Cut inside an escape sequence
+            fields[name] = raw
+    return fields
+
+class FusedJudgeAgent(JudgeAgent):
+    """Judge that writes its analysis and the structured verdict in one schema-constrained generation
+    
+    LM Studio compiles a json_schema response_format into a grammar, so every token the
+    model samples keeps the answer valid JSON with exactly these fields. That saves the
+    ScoringAgent call, which otherwise re-reads the whole analysis just to fill them in.
+    A server without structured output support answers with an error or free text, and
+    the make_fused_judgment methods return None so the caller can fall back to two calls.
+    """
+    
+    analysis_fields = (
+        ('argument_quality_assessment', "ARGUMENT QUALITY ASSESSMENT"),
+        ('evidence_utilization_analysis', "EVIDENCE UTILIZATION ANALYSIS"),
+        ('debate_dynamics_evaluation', "DEBATE DYNAMICS EVALUATION"),
+        ('critical_gaps_and_limitations', "CRITICAL GAPS AND LIMITATIONS"),
+        ('overall_assessment', "OVERALL ASSESSMENT")
+    )
+    verdict_fields = {
+        'verdict': {"type": "string", "enum": ["TRUE", "FALSE", "INSUFFICIENT_EVIDENCE"]},
+        'confidence': {"type": "number", "minimum": 0, "maximum": 1},
+        'reasoning': {"type": "string"},
+        'evidence_quality': {"type": "string", "enum": ["STRONG", "MODERATE", "WEAK"]},
+        'winning_side': {"type": "string", "enum": ["verifier", "counter_explainer", "tie"]},
+        'key_evidence': {"type": "array", "items": {"type": "string"}, "minItems": 1, "maxItems": 5}
+    }
+    
+    closing = """OUTPUT FORMAT:
+Answer with one JSON object. Write each of the five sections above into its own field, in order, then score the debate based ONLY on your analysis:
+- verdict: TRUE, FALSE or INSUFFICIENT_EVIDENCE (use INSUFFICIENT_EVIDENCE if your analysis is unclear)
+- confidence: 0.0-1.0, how clearly your analysis reached its conclusion
+- reasoning: brief summary quoting your analysis
+- evidence_quality: STRONG, MODERATE or WEAK
+- winning_side: verifier, counter_explainer or tie
+- key_evidence: up to 5 key evidence points from your analysis
+
+Begin the JSON object now:"""
+    
+    @classmethod
+    def response_format(cls) -> Dict[str, Any]:
+        properties = {name: {"type": "string"} for name, _ in cls.analysis_fields}
+        properties.update(cls.verdict_fields)
+        return {"type": "json_schema", "json_schema": {
+            "name": "debate_judgment",
+            "strict": True,
+            "schema": {"type": "object", "properties": properties, "required": list(properties),
+                       "additionalProperties": False}
+        }}
+    
+    def make_fused_judgment(self, claim: str, evidence: Union[List[Dict[str, Any]], EvidencePack],
+                            verifier_arguments: List[str], counter_explainer_arguments: List[str],
+                            on_token: Optional[Callable[[str], None]] = None,
+                            debate_memory: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """The analysis as markdown and the verdict, or None when the answer is not a complete judgment"""
+        if not verifier_arguments or not counter_explainer_arguments:
+            return None  # make_judgment explains the missing debate content
+        messages = self._build_judgment_messages(claim, evidence, verifier_arguments, counter_explainer_arguments,
+                                                 debate_memory)
+        response = self.client.generate_response(self.model, messages, temperature=self.temperature,
+                                                 max_tokens=self.max_tokens, on_token=self._analysis_renderer(on_token),
+                                                 role=self.role.value, sections=self.prompt_sections,
+                                                 response_format=self.response_format())
+        return self._parse_judgment(response)
+    
+    async def amake_fused_judgment(self, claim: str, evidence: Union[List[Dict[str, Any]], EvidencePack],
+                                   verifier_arguments: List[str], counter_explainer_arguments: List[str],
+                                   on_token: Optional[Callable[[str], None]] = None,
+                                   debate_memory: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Async variant of make_fused_judgment"""
+        if not verifier_arguments or not counter_explainer_arguments:
+            return None
+        messages = self._build_judgment_messages(claim, evidence, verifier_arguments, counter_explainer_arguments,
+                                                 debate_memory)
+        response = await self.client.agenerate_response(self.model, messages, temperature=self.temperature,
+                                                        max_tokens=self.max_tokens,
+                                                        on_token=self._analysis_renderer(on_token),
+                                                        role=self.role.value, sections=self.prompt_sections,
+                                                        response_format=self.response_format())
+        return self._parse_judgment(response)
+    
+    def _judgment_messages(self, claim: str, evidence_summary: str, verifier_summary: str,
+                           counter_explainer_summary: str) -> List[Dict[str, str]]:
+        messages = super()._judgment_messages(claim, evidence_summary, verifier_summary, counter_explainer_summary)
+        prompt = messages[-1]['content'].replace("Begin your structured analysis now:", self.closing)
+        return messages[:-1] + [{"role": "user", "content": prompt}]
+    
+    def _analysis_renderer(self, on_token: Optional[Callable[[str], None]]) -> Optional[Callable[[str], None]]:
+        """Show the streaming JSON as the markdown analysis it will become"""
+        if on_token is None:
+            return None
+        return lambda text: on_token(self._analysis_text(partial_json_strings(text)))
+    
+    def _analysis_text(self, fields: Dict[str, Any]) -> str:
+        return "\n\n".join(f"**{i}. {title}**\n\n{fields[name]}"
+                            for i, (name, title) in enumerate(self.analysis_fields, 1) if name in fields)
+    
+    def _parse_judgment(self, response: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        try:
+            judgment = json.loads(response)
+        except json.JSONDecodeError:
+            logger.warning("Structured judgment was not valid JSON; the server may not support response_format")
+            return None
+        if not isinstance(judgment, dict):
+            return None
+        
+        if not all(isinstance(judgment.get(name), str) and judgment[name].strip() for name, _ in self.analysis_fields):
+            logger.warning("Structured judgment is missing analysis sections")
+            return None
+        verdict = {name: judgment.get(name) for name in self.verdict_fields}
+        for name, schema in self.verdict_fields.items():
+            if 'enum' in schema and verdict[name] not in schema['enum']:
+                logger.warning(f"Structured judgment has an invalid {name}: {verdict[name]!r}")
+                return None
+        try:
+            verdict['confidence'] = min(max(float(verdict['confidence']), 0.0), 1.0)
+        except (TypeError, ValueError):
+            logger.warning(f"Structured judgment has an invalid confidence: {verdict['confidence']!r}")
+            return None
+        verdict['reasoning'] = str(verdict['reasoning'] or '')
+        key_evidence = verdict['key_evidence'] if isinstance(verdict['key_evidence'], list) else []
+        verdict['key_evidence'] = [str(point) for point in key_evidence if str(point).strip()][:5]
+        return self._analysis_text(judgment), verdict
+
 class ScoringAgent:
     """Enhanced scoring agent with strict anti-hallucination measures"""
     
@@ -638,7 +4176,40 @@ class ScoringAgent:
     
     def score_debate(self, judge_summary: str, claim: str) -> Dict[str, Any]:
         """Convert judge summary into structured verdict with strict validation"""
+        messages = self._build_messages(judge_summary, claim)
+        try:
+            # Use very low temperature to minimize creativity/hallucination
+            response = self.client.generate_response(self.model, messages, temperature=0.1, max_tokens=600,
+                                                     role="scoring")
+            return self._verdict_from_response(response, judge_summary, claim)
+        except Exception as e:
+            logger.error(f"Error parsing scoring response: {str(e)}")
+        
+        # Enhanced fallback scoring based only on judge's actual text
+        return self._create_evidence_based_fallback(judge_summary, claim)
+    
+    async def ascore_debate(self, judge_summary: str, claim: str) -> Dict[str, Any]:
+        """Async variant of score_debate"""
+        messages = self._build_messages(judge_summary, claim)
+        try:
+            response = await self.client.agenerate_response(self.model, messages, temperature=0.1, max_tokens=600,
+                                                            role="scoring")
+            return self._verdict_from_response(response, judge_summary, claim)
+        except Exception as e:
+            logger.error(f"Error parsing scoring response: {str(e)}")
         
+        return self._create_evidence_based_fallback(judge_summary, claim)
+    
+    def _verdict_from_response(self, response: str, judge_summary: str, claim: str) -> Dict[str, Any]:
+        """Validated verdict from the model's JSON, or the evidence-based fallback"""
+        # Enhanced JSON extraction with validation
+        verdict = self._extract_and_validate_json(response, judge_summary)
+        if verdict:
+            return self._validate_verdict_against_source(verdict, judge_summary)
+        return self._create_evidence_based_fallback(judge_summary, claim)
+    
+    def _build_messages(self, judge_summary: str, claim: str) -> List[Dict[str, str]]:
+        """Chat messages asking for the JSON verdict"""
         prompt = f"""Convert the judge's analysis into a structured verdict. Base your scoring ONLY on the judge's actual analysis.
 
 ORIGINAL CLAIM: "{claim}"
@@ -673,29 +4244,26 @@ JSON OUTPUT:"""
             },
             {"role": "user", "content": prompt}
         ]
-        
-        try:
-            # Use very low temperature to minimize creativity/hallucination
-            response = self.client.generate_response(self.model, messages, temperature=0.1, max_tokens=600)
-            
-            # Enhanced JSON extraction with validation
-            verdict = self._extract_and_validate_json(response, judge_summary)
-            if verdict:
-                return self._validate_verdict_against_source(verdict, judge_summary)
-                
-        except Exception as e:
-            logger.error(f"Error parsing scoring response: {str(e)}")
-        
-        # Enhanced fallback scoring based only on judge's actual text
-        return self._create_evidence_based_fallback(judge_summary, claim)
+        return messages
     
     def _extract_and_validate_json(self, response: str, judge_summary: str) -> Dict[str, Any]:
         """Extract JSON and validate against source material"""
         verdict = self._extract_json_verdict(response)
         if not verdict:
             return None
-        
-        # Validate that reasoning is grounded in judge's analysis
+        return self._ground_reasoning(verdict, judge_summary)
+    
+    def review_verdict(self, verdict: Dict[str, Any], judge_summary: str) -> Dict[str, Any]:
+        """Apply score_debate's checks to a verdict the Judge wrote alongside its own analysis"""
+        key_evidence = verdict.get('key_evidence')
+        verdict = self._validate_verdict_against_source(self._ground_reasoning(dict(verdict), judge_summary),
+                                                        judge_summary)
+        if key_evidence:
+            verdict['key_evidence'] = key_evidence  # The Judge picked these while writing the analysis
+        return verdict
+    
+    def _ground_reasoning(self, verdict: Dict[str, Any], judge_summary: str) -> Dict[str, Any]:
+        """Lower the confidence of a verdict whose reasoning strays from the judge's analysis"""
         reasoning = verdict.get('reasoning', '')
         if reasoning and len(reasoning) > 50:
             # Check if reasoning contains concepts actually mentioned in judge summary
@@ -903,15 +4471,336 @@ JSON OUTPUT:"""
         
         return unique_evidence
 
+class QuickScorer(ScoringAgent):
+    """First stage of the judging cascade: a verdict straight from the compressed debate.
+    
+    Reads each side's DebateMemory digest and latest argument instead of the Judge's
+    full prompt, on the debaters' model, and answers with ScoringAgent's JSON verdict.
+    The verdict stands only when it picks a side with at least the threshold
+    confidence after ScoringAgent's grounding check; anything vaguer, or an answer
+    that does not parse, escalates to the full Judge.
+    """
+    
+    role = "quick_scoring"
+    
+    def __init__(self, client: LMStudioClient, model: str = CASCADE_MODEL,
+                 threshold: float = CASCADE_CONFIDENCE_THRESHOLD):
+        super().__init__(client, model)
+        self.threshold = threshold
+    
+    def score(self, claim: str, verifier_arguments: List[str], counter_explainer_arguments: List[str],
+              debate_memory: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+        """The quick verdict, or None when the answer is unusable"""
+        debate = self._compressed_debate(verifier_arguments, counter_explainer_arguments, debate_memory)
+        response = self.client.generate_response(self.model, self._quick_messages(claim, debate), temperature=0.1,
+                                                 max_tokens=CASCADE_MAX_TOKENS, role=self.role)
+        return self._quick_verdict(response, debate)
+    
+    async def ascore(self, claim: str, verifier_arguments: List[str], counter_explainer_arguments: List[str],
+                     debate_memory: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+        """Async variant of score"""
+        debate = self._compressed_debate(verifier_arguments, counter_explainer_arguments, debate_memory)
+        response = await self.client.agenerate_response(self.model, self._quick_messages(claim, debate),
+                                                        temperature=0.1, max_tokens=CASCADE_MAX_TOKENS, role=self.role)
+        return self._quick_verdict(response, debate)
+    
+    def confident(self, verdict: Optional[Dict[str, Any]]) -> bool:
+        """Whether a quick verdict may stand without the Judge"""
+        return (verdict is not None and verdict['verdict'] != 'INSUFFICIENT_EVIDENCE'
+                and verdict['confidence'] >= self.threshold)
+    
+    @staticmethod
+    def summary(verdict: Dict[str, Any]) -> str:
+        """Stands in for the Judge's analysis when the quick verdict is final"""
+        return (f"**Quick verdict** ({verdict['confidence']:.0%} confidence; the debate was clear-cut enough "
+                f"that the full Judge was not consulted)\n\n{verdict['reasoning']}")
+    
+    def _compressed_debate(self, verifier_arguments: List[str], counter_explainer_arguments: List[str],
+                           debate_memory: Optional[Dict[str, Dict[str, Any]]]) -> str:
+        sides = []
+        for role, name, stance, arguments in (
+                (AgentRole.VERIFIER, "Verifier", "supporting the claim", verifier_arguments),
+                (AgentRole.COUNTER_EXPLAINER, "Counter-Explainer", "providing alternative perspectives",
+                 counter_explainer_arguments)):
+            made = [argument for argument in arguments if not argument.startswith("Error in round")]
+            latest = made[-1][:CASCADE_ARGUMENT_CHARS] if made else "No argument was made."
+            memory = (debate_memory or {}).get(role.value)
+            digest = DebateMemory.render(memory, name, before_round=memory['through_round']) if memory else ""
+            sides.append(f"{name.upper()} ({stance}):\n{digest + chr(10) if digest else ''}"
+                         f"LATEST ARGUMENT: {latest}")
+        return '\n\n'.join(sides)
+    
+    def _quick_messages(self, claim: str, debate: str) -> List[Dict[str, str]]:
+        prompt = f"""Decide the claim from the debate below. For each side you see a digest of its earlier rounds and its latest argument.
+
+CLAIM: "{claim}"
+
+{debate}
+
+STRICT RULES:
+- Use ONLY the debate above
+- Give a confidence of 0.85 or more only when one side's case is clearly stronger and rests on cited evidence
+- If the debate is balanced or unclear, use "INSUFFICIENT_EVIDENCE" with a low confidence
+
+OUTPUT ONLY THIS JSON FORMAT:
+{{
+    "verdict": "TRUE/FALSE/INSUFFICIENT_EVIDENCE",
+    "confidence": 0.0-1.0,
+    "reasoning": "Brief summary based only on the debate",
+    "evidence_quality": "STRONG/MODERATE/WEAK",
+    "winning_side": "verifier/counter_explainer/tie"
+}}
+
+JSON OUTPUT:"""
+        return [
+            {"role": "system", "content": "You score debates into structured JSON verdicts using only the arguments provided. Output valid JSON only."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _quick_verdict(self, response: str, debate: str) -> Optional[Dict[str, Any]]:
+        verdict = self._extract_json_verdict(response)
+        if not verdict or verdict.get('verdict') not in ('TRUE', 'FALSE', 'INSUFFICIENT_EVIDENCE'):
+            return None
+        try:
+            verdict['confidence'] = min(max(float(verdict.get('confidence', 0)), 0.0), 1.0)
+        except (TypeError, ValueError):
+            return None
+        verdict['reasoning'] = str(verdict.get('reasoning') or '')
+        if verdict.get('evidence_quality') not in ('STRONG', 'MODERATE', 'WEAK'):
+            verdict['evidence_quality'] = 'MODERATE'
+        if verdict.get('winning_side') not in ('verifier', 'counter_explainer', 'tie'):
+            verdict['winning_side'] = {'TRUE': 'verifier', 'FALSE': 'counter_explainer'}.get(verdict['verdict'], 'tie')
+        verdict = self._ground_reasoning(verdict, debate)
+        verdict['key_evidence'] = self._extract_key_evidence(debate)[:5]
+        return verdict
+
+_CITATION_RE = re.compile(r'\bsource\s*#?\s*(\d+)|\[s(\d+)\]|\bs(\d+)\b|(https?://[^\s)\]>"\']+)', re.IGNORECASE)
+_QUOTE_RE = re.compile(r'["\u201c]([^"\u201d]{20,400})["\u201d]')
+
+class ConvergenceDetector:
+    """Decides when a debate round only restates what each side argued before.
+    
+    A side restates itself when most of its new argument's word n-grams already
+    appeared in its previous argument and it cites no source, URL or quote it had
+    not cited in an earlier round. Once both sides do so for stale_rounds rounds
+    in a row, further rounds would add nothing for the Judge.
+    """
+    
+    def __init__(self, min_rounds: int = CONVERGENCE_MIN_ROUNDS, max_overlap: float = CONVERGENCE_MAX_OVERLAP,
+                 ngram: int = CONVERGENCE_NGRAM, stale_rounds: int = CONVERGENCE_STALE_ROUNDS):
+        self.min_rounds = max(2, min_rounds)  # The first round has nothing to converge with
+        self.max_overlap = max_overlap
+        self.ngram = ngram
+        self.stale_rounds = max(1, stale_rounds)
+    
+    def phrases(self, argument: str) -> set:
+        terms = tokenize_terms(argument)
+        return {tuple(terms[i:i + self.ngram]) for i in range(len(terms) - self.ngram + 1)}
+    
+    @staticmethod
+    def citations(argument: str) -> set:
+        """Sources cited by number, URLs and quoted passages, normalised for comparison across rounds"""
+        cited = set()
+        for number, bracketed, short, url in _CITATION_RE.findall(argument):
+            if url:
+                cited.add(normalize_url(url.rstrip('.,;:')))
+            else:
+                cited.add(f"S{number or bracketed or short}")
+        cited.update(' '.join(tokenize_terms(quote)) for quote in _QUOTE_RE.findall(argument))
+        return cited
+    
+    def overlap(self, argument: str, previous: str) -> float:
+        """Share of the argument's phrases that the previous argument already contained"""
+        phrases = self.phrases(argument)
+        if not phrases:
+            return 1.0
+        return len(phrases & self.phrases(previous)) / len(phrases)
+    
+    def assess(self, round_num: int, sides: Dict[str, List[str]], history: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Assess the round just completed; sides maps each agent to its arguments so far, oldest first.
+        
+        history is the assessments of earlier rounds, used to count consecutive stale rounds.
+        """
+        assessment = {'round': round_num}
+        stale = True
+        for side, arguments in sides.items():
+            latest, earlier = arguments[-1], arguments[:-1]
+            if not earlier or any(argument.startswith("Error in round") for argument in (latest, earlier[-1])):
+                return {**assessment, 'stale': False, 'stale_streak': 0, 'converged': False}
+            overlap = self.overlap(latest, earlier[-1])
+            new_citations = self.citations(latest) - set().union(*(self.citations(argument) for argument in earlier))
+            assessment[f"{side}_overlap"] = overlap
+            assessment[f"{side}_new_citations"] = len(new_citations)
+            stale = stale and overlap >= self.max_overlap and not new_citations
+        streak = (history[-1]['stale_streak'] if history else 0) + 1 if stale else 0
+        return {
+            **assessment,
+            'stale': stale,
+            'stale_streak': streak,
+            'converged': streak >= self.stale_rounds and round_num >= self.min_rounds
+        }
+
+_CONCESSION_RE = re.compile(r"\b(acknowledge[sd]?|concede[sd]?|agree[sd]?|granted|admittedly|valid point|fair point|"
+                            r"it is true that|is correct that|rightly)\b", re.IGNORECASE)
+_ASSERTION_RE = re.compile(r"\b(shows?|demonstrates?|confirms?|indicates?|suggests?|proves?|therefore|because|"
+                           r"evidence|supports?|contradicts?|fails? to)\b", re.IGNORECASE)
+
+class DebateMemory:
+    """Compact running digest of one side's claims, concessions and cited sources.
+    
+    Each argument is read once, when it is made: its thesis and most assertive sentences
+    become claims unless they restate a claim already kept, sentences granting the
+    opponent a point become concessions, and cited sources are added in order. Every
+    list is capped, so the digest stays the same size however many rounds are played.
+    Digests are plain dicts so they live in the graph state and its checkpoints.
+    """
+    
+    def __init__(self, claims_per_round: int = DEBATE_MEMORY_CLAIMS_PER_ROUND,
+                 max_claims: int = DEBATE_MEMORY_MAX_CLAIMS, max_concessions: int = DEBATE_MEMORY_MAX_CONCESSIONS,
+                 max_sources: int = DEBATE_MEMORY_MAX_SOURCES, sentence_chars: int = DEBATE_MEMORY_SENTENCE_CHARS):
+        self.claims_per_round = claims_per_round
+        self.max_claims = max_claims
+        self.max_concessions = max_concessions
+        self.max_sources = max_sources
+        self.sentence_chars = sentence_chars
+        self.detector = ConvergenceDetector()  # Shares the n-gram overlap and citation parsing
+    
+    @staticmethod
+    def empty() -> Dict[str, Any]:
+        return {'through_round': 0, 'claims': [], 'concessions': [], 'sources': {}}
+    
+    def update(self, digest: Optional[Dict[str, Any]], argument: str, round_num: int) -> Dict[str, Any]:
+        """A new digest with the argument of round_num folded in; the one passed in is left unchanged"""
+        digest = digest or self.empty()
+        if not argument or argument.startswith(("Error in round", "Error:")):
+            return digest
+        sentences = [sentence for sentence in _SENTENCE_BOUNDARY_RE.split(' '.join(argument.split()))
+                     if len(tokenize_terms(sentence)) >= 4]
+        concessions = [sentence for sentence in sentences if _CONCESSION_RE.search(sentence)]
+        candidates = [sentence for sentence in sentences if sentence not in concessions]
+        
+        claims = list(digest['claims'])
+        ranked = sorted(range(len(candidates)), key=lambda i: -self._claim_score(candidates[i], i))
+        added = 0
+        for i in ranked:
+            if added == self.claims_per_round:
+                break
+            if any(self.detector.overlap(candidates[i], claim['text']) >= CONVERGENCE_MAX_OVERLAP for claim in claims):
+                continue  # A restatement of a point already in the digest
+            claims.append({'round': round_num, 'text': self._shorten(candidates[i])})
+            added += 1
+        
+        sources = dict(digest['sources'])
+        for source in sorted(self._sources(argument)):
+            if source not in sources and len(sources) < self.max_sources:
+                sources[source] = round_num
+        return {
+            'through_round': max(round_num, digest['through_round']),
+            'claims': claims[-self.max_claims:],
+            'concessions': (digest['concessions'] + [{'round': round_num, 'text': self._shorten(sentence)}
+                                                     for sentence in concessions])[-self.max_concessions:],
+            'sources': sources
+        }
+    
+    @staticmethod
+    def render(digest: Optional[Dict[str, Any]], side_name: str, before_round: Optional[int] = None) -> str:
+        """The digest as prompt text, limited to rounds before before_round; empty when nothing qualifies"""
+        if not digest:
+            return ""
+        def kept(entries):
+            return [entry for entry in entries if before_round is None or entry['round'] < before_round]
+        claims, concessions = kept(digest['claims']), kept(digest['concessions'])
+        sources = [source for source, first in digest['sources'].items() if before_round is None or first < before_round]
+        if not (claims or concessions or sources):
+            return ""
+        lines = [f"{side_name.upper()} IN EARLIER ROUNDS (digest):"]
+        lines += [f"- Round {claim['round']} claim: {claim['text']}" for claim in claims]
+        lines += [f"- Round {concession['round']} conceded: {concession['text']}" for concession in concessions]
+        if sources:
+            lines.append(f"- Sources cited: {', '.join(sources)}")
+        return '\n'.join(lines)
+    
+    def _claim_score(self, sentence: str, position: int) -> float:
+        """Thesis first, then sentences that cite or assert something"""
+        score = 2.0 if position == 0 else 0.0
+        score += 2.0 if _CITATION_RE.search(sentence) else 0.0
+        return score + len(_ASSERTION_RE.findall(sentence)) - position * 0.01
+    
+    def _sources(self, argument: str) -> set:
+        """Source numbers and URLs; quoted passages are too long for the digest"""
+        return {citation for citation in self.detector.citations(argument)
+                if re.fullmatch(r'S\d+', citation) or '://' in citation}
+    
+    def _shorten(self, sentence: str) -> str:
+        if len(sentence) <= self.sentence_chars:
+            return sentence
+        return sentence[:self.sentence_chars].rsplit(' ', 1)[0] + "..."
+
 class LangGraphClaimVerificationSystem:
     """LangGraph-based claim verification system"""
     
-    def __init__(self):
+    def __init__(self, extraction_backend: str = EXTRACTION_BACKEND):
         self.client = LMStudioClient()
-        self.scraper = WebScraper()
+        self.scraper = WebScraper(extraction_backend)
+        self.deduplicator = EvidenceDeduplicator() if DEDUP_ENABLED else None
+        self.convergence_detector = ConvergenceDetector()
+        self.debate_memory = DebateMemory() if DEBATE_MEMORY_ENABLED else None
+        self.cascade_threshold = CASCADE_CONFIDENCE_THRESHOLD
+        self.passage_indexes: Dict[str, PassageIndex] = {}  # Keyed by evidence fingerprint
+        self.evidence_store = None
+        if EVIDENCE_STORE_ENABLED:
+            try:
+                self.evidence_store = EvidenceStore()
+            except Exception as e:
+                logger.warning(f"Evidence store unavailable, continuing without it: {str(e)}")
         # Add memory saver for state persistence
         self.memory = MemorySaver()
         self.graph = self._build_graph()
+        self.async_graph = self._build_graph(asynchronous=True)
+    
+    def passage_index(self, evidence: List[Dict[str, Any]]) -> Optional[PassageIndex]:
+        """BM25 index over the debate's evidence, built once and shared by every agent turn"""
+        if not PASSAGE_RETRIEVAL_ENABLED:
+            return None
+        key = evidence_fingerprint(evidence)
+        if key not in self.passage_indexes:
+            if len(self.passage_indexes) >= 8:
+                self.passage_indexes.pop(next(iter(self.passage_indexes)))
+            self.passage_indexes[key] = PassageIndex(evidence)
+        return self.passage_indexes[key]
+    
+    def build_evidence_pack(self, claim: str, evidence: List[Dict[str, Any]]) -> EvidencePack:
+        """Render every role's evidence once so all rounds share identical, precomputed text"""
+        passage_index = self.passage_index(evidence)
+        agents = [
+            VerifierAgent(AgentRole.VERIFIER, QWEN_MODEL, self.client, passage_index),
+            CounterExplainerAgent(AgentRole.COUNTER_EXPLAINER, QWEN_MODEL, self.client, passage_index),
+            JudgeAgent(AgentRole.JUDGE, PHI_MODEL, self.client, passage_index)
+        ]
+        renderings, shown = [], []
+        for agent in agents:
+            text, passage_ids = agent.render_evidence(evidence, claim)
+            renderings.append((agent.role.value, text))
+            shown.append((agent.role.value, passage_ids))
+        
+        usable = [item for item in unique_evidence(evidence) if item.get('status') == 'success']
+        sources = tuple(
+            EvidenceSource(
+                source_id=f"S{number}",
+                url=item.get('url', ''),
+                title=item.get('title', ''),
+                text=item.get('content', ''),
+                corroborating_urls=tuple(item.get('corroborating_urls', ()))
+            )
+            for number, item in enumerate(usable, start=1)
+        )
+        return EvidencePack(
+            fingerprint=evidence_fingerprint(evidence),
+            claim=claim,
+            sources=sources,
+            renderings=tuple(renderings),
+            shown=tuple(shown)
+        )
     
     def validate_state(self, state: GraphState) -> bool:
         """Validate state transitions"""
@@ -940,11 +4829,29 @@ class LangGraphClaimVerificationSystem:
             return "retry" if retry_count < 3 else "error"
         return "success"
 
+    def route_openings(self, state: GraphState) -> Union[str, List[str]]:
+        """Route a successful scrape to the first Verifier turn, or fan out both opening statements"""
+        route = self.route_after_scraping(state)
+        if route == "success" and state.get("parallel_openings"):
+            return ["opening_verifier", "opening_counter_explainer"]
+        return route
+    
+    def route_after_verifier(self, state: GraphState) -> Literal["success", "round_done", "retry", "error"]:
+        """Routing after a Verifier turn; a retried opening skips a Counter-Explainer opening that already stands"""
+        route = self.route_after_agent(state)
+        if (route == "success" and state.get("parallel_openings") and state["current_round"] == 1
+                and state.get("opposer_arguments")):
+            return "round_done"
+        return route
+    
     def should_continue_debate(self, state: GraphState) -> Literal["continue", "end", "error"]:
         """Enhanced debate continuation logic"""
         if state.get("error_message"):
             return "error"
         
+        if state.get("converged_round"):
+            return "end"
+        
         current_round = state.get("current_round", 1)
         max_rounds = state.get("max_rounds", 2)
         
@@ -972,38 +4879,91 @@ class LangGraphClaimVerificationSystem:
         else:
             return "error"
 
-    def _build_graph(self) -> StateGraph:
-        """Build the LangGraph workflow with enhanced error handling and retries"""
+    def _timed_node(self, name: str, node: Callable) -> Callable:
+        """Wrap a graph node so its wall time lands in node_timings and the telemetry histograms"""
+        def timed_update(update: GraphState, started: float) -> GraphState:
+            seconds = time.perf_counter() - started
+            self.client.telemetry.observe_node(name, seconds)
+            return {**update, 'node_timings': [{'node': name, 'seconds': seconds}]}
+        
+        if asyncio.iscoroutinefunction(node):
+            @functools.wraps(node)
+            async def timed(state: GraphState) -> GraphState:
+                started = time.perf_counter()
+                return timed_update(await node(state), started)
+        else:
+            @functools.wraps(node)
+            def timed(state: GraphState) -> GraphState:
+                started = time.perf_counter()
+                return timed_update(node(state), started)
+        return timed
+    
+    def _build_graph(self, asynchronous: bool = False) -> StateGraph:
+        """Build the LangGraph workflow with enhanced error handling and retries.
+        
+        The asynchronous variant wires in coroutine nodes for ainvoke, so many debates
+        can share one event loop and the async client's connection pool."""
         try:
             workflow = StateGraph(GraphState)
             
             # Add nodes including retry handler
-            workflow.add_node("scrape_evidence", self.scrape_evidence_node)
-            workflow.add_node("verifier_turn", self.verifier_node)
-            workflow.add_node("counter_explainer_turn", self.counter_explainer_node)
-            workflow.add_node("judge_decision", self.judge_node)
-            workflow.add_node("check_rounds", self.check_rounds_node)
-            workflow.add_node("error_handler", self.error_handler_node)
-            workflow.add_node("retry_handler", self.retry_handler_node)
+            if asynchronous:
+                workflow.add_node("scrape_evidence", self._timed_node("scrape_evidence", self.ascrape_evidence_node))
+                workflow.add_node("verifier_turn", self._timed_node("verifier_turn", self.averifier_node))
+                workflow.add_node("counter_explainer_turn", self._timed_node("counter_explainer_turn", self.acounter_explainer_node))
+                workflow.add_node("opening_verifier", self._timed_node("opening_verifier", self.aopening_verifier_node))
+                workflow.add_node("opening_counter_explainer", self._timed_node("opening_counter_explainer", self.aopening_counter_explainer_node))
+                workflow.add_node("join_openings", self._timed_node("join_openings", self.ajoin_openings_node))
+                workflow.add_node("judge_decision", self._timed_node("judge_decision", self.ajudge_node))
+                workflow.add_node("check_rounds", self._timed_node("check_rounds", self.acheck_rounds_node))
+                workflow.add_node("error_handler", self._timed_node("error_handler", self.aerror_handler_node))
+                workflow.add_node("retry_handler", self._timed_node("retry_handler", self.aretry_handler_node))
+            else:
+                workflow.add_node("scrape_evidence", self._timed_node("scrape_evidence", self.scrape_evidence_node))
+                workflow.add_node("verifier_turn", self._timed_node("verifier_turn", self.verifier_node))
+                workflow.add_node("counter_explainer_turn", self._timed_node("counter_explainer_turn", self.counter_explainer_node))
+                workflow.add_node("opening_verifier", self._timed_node("opening_verifier", self.opening_verifier_node))
+                workflow.add_node("opening_counter_explainer", self._timed_node("opening_counter_explainer", self.opening_counter_explainer_node))
+                workflow.add_node("join_openings", self._timed_node("join_openings", self.join_openings_node))
+                workflow.add_node("judge_decision", self._timed_node("judge_decision", self.judge_node))
+                workflow.add_node("check_rounds", self._timed_node("check_rounds", self.check_rounds_node))
+                workflow.add_node("error_handler", self._timed_node("error_handler", self.error_handler_node))
+                workflow.add_node("retry_handler", self._timed_node("retry_handler", self.retry_handler_node))
             
             # Define edges with retry logic
             workflow.add_edge(START, "scrape_evidence")
             
             workflow.add_conditional_edges(
                 "scrape_evidence",
-                self.route_after_scraping,
+                self.route_openings,
                 {
                     "success": "verifier_turn",
+                    "opening_verifier": "opening_verifier",
+                    "opening_counter_explainer": "opening_counter_explainer",
                     "retry": "retry_handler",
                     "error": "error_handler"
                 }
             )
             
+            # Parallel openings: both round-1 statements run as concurrent branches and meet at the join
+            workflow.add_edge(["opening_verifier", "opening_counter_explainer"], "join_openings")
+            
             workflow.add_conditional_edges(
-                "verifier_turn",
+                "join_openings",
                 self.route_after_agent,
+                {
+                    "success": "check_rounds",
+                    "retry": "retry_handler",
+                    "error": "error_handler"
+                }
+            )
+            
+            workflow.add_conditional_edges(
+                "verifier_turn",
+                self.route_after_verifier,
                 {
                     "success": "counter_explainer_turn",
+                    "round_done": "check_rounds",
                     "retry": "retry_handler", 
                     "error": "error_handler"
                 }
@@ -1052,10 +5012,8 @@ class LangGraphClaimVerificationSystem:
     def validate_state_node(self, state: GraphState) -> GraphState:
         """Node: Validate initial state"""
         if not self.validate_state(state):
-            new_state = dict(state)
-            new_state["error_message"] = "Invalid state: missing required fields"
-            return new_state
-        return state
+            return {"error_message": "Invalid state: missing required fields"}
+        return {}
     
     def check_state_valid(self, state: GraphState) -> Literal["valid", "invalid"]:
         """Check if state is valid"""
@@ -1067,27 +5025,72 @@ class LangGraphClaimVerificationSystem:
         
         try:
             scraped_content = self.scraper.scrape_urls(state["urls"])
-            successful_scrapes = [item for item in scraped_content if item['status'] == 'success']
-            st.write(f"✅ Successfully scraped {len(successful_scrapes)} out of {len(state['urls'])} URLs")
-            
-            return {
-                **state,
-                "scraped_content": scraped_content,
-                "messages": state["messages"] + [HumanMessage(content=f"Scraped {len(successful_scrapes)} sources successfully")],
-                "error_message": None,
-                "retry_count": 0
-            }
-            
+            return self._evidence_update(state, scraped_content)
         except Exception as e:
-            st.error(f"Scraping failed: {str(e)}")
-            return {
-                **state,
-                "error_message": f"Scraping failed: {str(e)}",
-                "scraped_content": [],
-                "messages": state["messages"] + [HumanMessage(content=f"Scraping failed: {str(e)}")],
-                "retry_count": state.get("retry_count", 0) + 1,
-                "last_error_node": "scrape_evidence"
-            }
+            return self._scrape_error_update(state, e)
+    
+    async def ascrape_evidence_node(self, state: GraphState) -> GraphState:
+        """Async node: Scrape evidence from URLs on the running event loop"""
+        st.write("## 🔍 Scraping Evidence")
+        
+        try:
+            for url in state["urls"]:
+                st.write(f"🔍 Scraping: {url}")
+            scraped_content = await self.scraper.scrape_urls_async(state["urls"])
+            return self._evidence_update(state, scraped_content)
+        except Exception as e:
+            return self._scrape_error_update(state, e)
+    
+    def _evidence_update(self, state: GraphState, scraped_content: List[Dict[str, Any]]) -> GraphState:
+        """Merge stored evidence, deduplicate, index and pack freshly scraped sources"""
+        successful_scrapes = [item for item in scraped_content if item['status'] == 'success']
+        if state["urls"]:
+            st.write(f"✅ Successfully scraped {len(successful_scrapes)} out of {len(state['urls'])} URLs")
+        
+        store_stats = None
+        if self.evidence_store and state.get("use_evidence_store"):
+            started = time.perf_counter()
+            stored_sources = self.evidence_store.search(state["claim"], exclude_urls=state["urls"])
+            store_stats = {'pulled': len(stored_sources), 'query_ms': (time.perf_counter() - started) * 1000}
+            if stored_sources:
+                st.write(f"🗄️ Added {len(stored_sources)} previously indexed source(s) from the evidence store "
+                         f"({store_stats['query_ms']:.1f} ms)")
+            scraped_content = scraped_content + stored_sources
+            successful_scrapes = successful_scrapes + stored_sources
+        
+        dedup_stats = None
+        if self.deduplicator:
+            scraped_content, dedup_stats = self.deduplicator.deduplicate(scraped_content, rounds=state["max_rounds"])
+            if dedup_stats['duplicates']:
+                st.write(f"🔁 Merged {dedup_stats['duplicates']} near-duplicate source(s) into {dedup_stats['clusters']} unique stories "
+                         f"(~{dedup_stats['tokens_saved']:,} prompt tokens saved)")
+        
+        if self.evidence_store:
+            try:
+                ingest_stats = self.evidence_store.ingest(scraped_content)
+                store_stats = {**(store_stats or {}), 'ingest': ingest_stats, **self.evidence_store.summary()}
+            except Exception as e:
+                logger.error(f"Evidence store ingest failed: {str(e)}")
+        
+        return {
+            "scraped_content": scraped_content,
+            "dedup_stats": dedup_stats,
+            "store_stats": store_stats,
+            "evidence_pack": self.build_evidence_pack(state["claim"], scraped_content),
+            "messages": [HumanMessage(content=f"Scraped {len(successful_scrapes)} sources successfully")],
+            "error_message": None,
+            "retry_count": 0
+        }
+    
+    def _scrape_error_update(self, state: GraphState, error: Exception) -> GraphState:
+        st.error(f"Scraping failed: {str(error)}")
+        return {
+            "error_message": f"Scraping failed: {str(error)}",
+            "scraped_content": [],
+            "messages": [HumanMessage(content=f"Scraping failed: {str(error)}")],
+            "retry_count": state.get("retry_count", 0) + 1,
+            "last_error_node": "scrape_evidence"
+        }
     
     def verifier_node(self, state: GraphState) -> GraphState:
         """Node: Generate verifier argument"""
@@ -1095,133 +5098,438 @@ class LangGraphClaimVerificationSystem:
         st.write(f"### Round {round_num}")
         
         try:
+            st.write("**🟢 Verifier (Supporting the claim):**")
+            placeholder = st.empty()
+            calls_before = len(self.client.call_log)
             with st.spinner("🟢 Verifier Agent thinking..."):
-                verifier = VerifierAgent(AgentRole.VERIFIER, QWEN_MODEL, self.client)
+                verifier = VerifierAgent(AgentRole.VERIFIER, QWEN_MODEL, self.client,
+                                         self.passage_index(state["scraped_content"]))
                 argument = verifier.generate_argument(
                     state["claim"], 
-                    state["scraped_content"], 
+                    state.get("evidence_pack") or state["scraped_content"], 
                     state["opposer_arguments"], 
-                    round_num
+                    round_num,
+                    on_token=TokenStreamRenderer(placeholder),
+                    debate_memory=self._debate_memory(state)
                 )
             
+            placeholder.write(argument)
+            self._show_call_timings(calls_before)
+            return self._verifier_update(state, argument)
+            
+        except Exception as e:
+            return self._verifier_error_update(state, e)
+    
+    async def averifier_node(self, state: GraphState) -> GraphState:
+        """Async node: Generate verifier argument"""
+        round_num = state["current_round"]
+        st.write(f"### Round {round_num}")
+        
+        try:
             st.write("**🟢 Verifier (Supporting the claim):**")
-            st.write(argument)
+            placeholder = st.empty()
+            calls_before = len(self.client.call_log)
+            verifier = VerifierAgent(AgentRole.VERIFIER, QWEN_MODEL, self.client,
+                                     self.passage_index(state["scraped_content"]))
+            argument = await verifier.agenerate_argument(
+                state["claim"],
+                state.get("evidence_pack") or state["scraped_content"],
+                state["opposer_arguments"],
+                round_num,
+                on_token=TokenStreamRenderer(placeholder),
+                debate_memory=self._debate_memory(state)
+            )
             
-            return {
-                **state,
-                "verifier_arguments": state["verifier_arguments"] + [argument],
-                "messages": state["messages"] + [AIMessage(content=f"Verifier Round {round_num}: {argument}")],
-                "error_message": None,
-                "retry_count": 0
-            }
+            placeholder.write(argument)
+            self._show_call_timings(calls_before)
+            return self._verifier_update(state, argument)
             
         except Exception as e:
-            st.error(f"Verifier error: {str(e)}")
-            return {
-                **state,
-                "error_message": f"Verifier error: {str(e)}",
-                "verifier_arguments": state["verifier_arguments"] + [f"Error in round {round_num}: Unable to generate argument"],
-                "retry_count": state.get("retry_count", 0) + 1,
-                "last_error_node": "verifier_turn"
-            }
+            return self._verifier_error_update(state, e)
+    
+    def _verifier_update(self, state: GraphState, argument: str) -> GraphState:
+        update = {
+            "verifier_arguments": [argument],
+            "messages": [AIMessage(content=f"Verifier Round {state['current_round']}: {argument}")],
+            "error_message": None,
+            "retry_count": 0
+        }
+        if self.debate_memory is not None:
+            update["verifier_digest"] = self.debate_memory.update(state.get("verifier_digest"), argument,
+                                                                  state["current_round"])
+        return update
+    
+    def _verifier_error_update(self, state: GraphState, error: Exception) -> GraphState:
+        st.error(f"Verifier error: {str(error)}")
+        return {
+            "error_message": f"Verifier error: {str(error)}",
+            "verifier_arguments": [f"Error in round {state['current_round']}: Unable to generate argument"],
+            "retry_count": state.get("retry_count", 0) + 1,
+            "last_error_node": "verifier_turn"
+        }
     
     def counter_explainer_node(self, state: GraphState) -> GraphState:
         """Node: Generate counter-explainer analysis"""
         round_num = state["current_round"]
         
         try:
+            st.write("**🔄 Counter-Explainer (Providing alternative perspectives):**")
+            placeholder = st.empty()
+            calls_before = len(self.client.call_log)
             with st.spinner("🔄 Counter-Explainer Agent analyzing..."):
-                counter_explainer = CounterExplainerAgent(AgentRole.COUNTER_EXPLAINER, QWEN_MODEL, self.client)
+                counter_explainer = CounterExplainerAgent(AgentRole.COUNTER_EXPLAINER, QWEN_MODEL, self.client,
+                                                          self.passage_index(state["scraped_content"]))
                 argument = counter_explainer.generate_argument(
                     state["claim"], 
-                    state["scraped_content"], 
+                    state.get("evidence_pack") or state["scraped_content"], 
                     state["verifier_arguments"], 
-                    round_num
+                    round_num,
+                    on_token=TokenStreamRenderer(placeholder),
+                    debate_memory=self._debate_memory(state)
                 )
             
+            placeholder.write(argument)
+            self._show_call_timings(calls_before)
+            return self._counter_explainer_update(state, argument)
+            
+        except Exception as e:
+            return self._counter_explainer_error_update(state, e)
+    
+    async def acounter_explainer_node(self, state: GraphState) -> GraphState:
+        """Async node: Generate counter-explainer analysis"""
+        round_num = state["current_round"]
+        
+        try:
             st.write("**🔄 Counter-Explainer (Providing alternative perspectives):**")
-            st.write(argument)
+            placeholder = st.empty()
+            calls_before = len(self.client.call_log)
+            counter_explainer = CounterExplainerAgent(AgentRole.COUNTER_EXPLAINER, QWEN_MODEL, self.client,
+                                                      self.passage_index(state["scraped_content"]))
+            argument = await counter_explainer.agenerate_argument(
+                state["claim"],
+                state.get("evidence_pack") or state["scraped_content"],
+                state["verifier_arguments"],
+                round_num,
+                on_token=TokenStreamRenderer(placeholder),
+                debate_memory=self._debate_memory(state)
+            )
             
-            return {
-                **state,
-                "opposer_arguments": state["opposer_arguments"] + [argument],
-                "messages": state["messages"] + [AIMessage(content=f"Counter-Explainer Round {round_num}: {argument}")],
-                "error_message": None,
-                "retry_count": 0
-            }
+            placeholder.write(argument)
+            self._show_call_timings(calls_before)
+            return self._counter_explainer_update(state, argument)
             
         except Exception as e:
-            st.error(f"Counter-Explainer error: {str(e)}")
-            return {
-                **state,
-                "error_message": f"Counter-Explainer error: {str(e)}",
-                "opposer_arguments": state["opposer_arguments"] + [f"Error in round {round_num}: Unable to generate analysis"],
-                "retry_count": state.get("retry_count", 0) + 1,
-                "last_error_node": "counter_explainer_turn"
-            }
+            return self._counter_explainer_error_update(state, e)
+    
+    def _counter_explainer_update(self, state: GraphState, argument: str) -> GraphState:
+        update = {
+            "opposer_arguments": [argument],
+            "messages": [AIMessage(content=f"Counter-Explainer Round {state['current_round']}: {argument}")],
+            "error_message": None,
+            "retry_count": 0
+        }
+        if self.debate_memory is not None:
+            update["opposer_digest"] = self.debate_memory.update(state.get("opposer_digest"), argument,
+                                                                 state["current_round"])
+        return update
+    
+    def _counter_explainer_error_update(self, state: GraphState, error: Exception) -> GraphState:
+        st.error(f"Counter-Explainer error: {str(error)}")
+        return {
+            "error_message": f"Counter-Explainer error: {str(error)}",
+            "opposer_arguments": [f"Error in round {state['current_round']}: Unable to generate analysis"],
+            "retry_count": state.get("retry_count", 0) + 1,
+            "last_error_node": "counter_explainer_turn"
+        }
+    
+    def opening_verifier_node(self, state: GraphState) -> GraphState:
+        """Node: Verifier's opening statement, generated alongside the Counter-Explainer's"""
+        self._attach_script_run_ctx()
+        with st.container():
+            return self._opening_update(self.verifier_node(state))
+    
+    async def aopening_verifier_node(self, state: GraphState) -> GraphState:
+        """Async node: Verifier's opening statement, generated alongside the Counter-Explainer's"""
+        with st.container():
+            return self._opening_update(await self.averifier_node(state))
+    
+    def opening_counter_explainer_node(self, state: GraphState) -> GraphState:
+        """Node: Counter-Explainer's independent opening analysis of the evidence"""
+        self._attach_script_run_ctx()
+        with st.container():
+            return self._opening_update(self.counter_explainer_node(state))
+    
+    async def aopening_counter_explainer_node(self, state: GraphState) -> GraphState:
+        """Async node: Counter-Explainer's independent opening analysis of the evidence"""
+        with st.container():
+            return self._opening_update(await self.acounter_explainer_node(state))
+    
+    def _debate_memory(self, state: GraphState) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Both sides' digests keyed by role, or None with the debate memory off"""
+        if self.debate_memory is None:
+            return None
+        return {AgentRole.VERIFIER.value: state.get("verifier_digest"),
+                AgentRole.COUNTER_EXPLAINER.value: state.get("opposer_digest")}
+    
+    def _attach_script_run_ctx(self):
+        """LangGraph runs concurrent branches on worker threads, which Streamlit ignores unless told whose script they serve"""
+        ctx = SCRIPT_RUN_CONTEXT.get()
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+    
+    def _opening_update(self, update: GraphState) -> GraphState:
+        """Keep a parallel opening to keys no other branch writes; the join settles errors and retries.
+        
+        A failed side leaves no placeholder argument, so its retry runs it alone."""
+        error_message = update.pop("error_message", None)
+        failed_node = update.pop("last_error_node", None)
+        update.pop("retry_count", None)
+        if error_message:
+            update.pop("verifier_arguments", None)
+            update.pop("opposer_arguments", None)
+            update["opening_errors"] = [{"node": failed_node, "error": error_message}]
+        return update
+    
+    def join_openings_node(self, state: GraphState) -> GraphState:
+        """Node: Wait for both opening statements; a failed side is retried through the sequential turns"""
+        errors = state.get("opening_errors", [])
+        if not errors:
+            return {"error_message": None, "retry_count": 0}
+        failed_nodes = [error["node"] for error in errors]
+        return {
+            "error_message": "; ".join(error["error"] for error in errors),
+            # The Verifier first when both failed, so its retry is followed by the Counter-Explainer's
+            "last_error_node": "verifier_turn" if "verifier_turn" in failed_nodes else failed_nodes[0],
+            "retry_count": state.get("retry_count", 0) + 1
+        }
+    
+    async def ajoin_openings_node(self, state: GraphState) -> GraphState:
+        """Async node: Wait for both opening statements"""
+        return self.join_openings_node(state)
+    
+    def _show_call_timings(self, calls_before: int):
+        """Caption the latest LLM call made by a node, if it reached the server"""
+        if len(self.client.call_log) > calls_before:
+            st.caption(format_call_timing(self.client.call_log[-1]))
     
     def check_rounds_node(self, state: GraphState) -> GraphState:
         """Node: Check if we should continue the debate"""
-        return {
-            **state,
+        update = {
             "current_round": state["current_round"] + 1,
             "round_complete": True,
             "error_message": None
         }
+        round_num = state["current_round"]
+        if round_num < 2 or round_num >= state["max_rounds"]:
+            return update
+        
+        assessment = self.convergence_detector.assess(
+            round_num,
+            {"verifier": state["verifier_arguments"], "counter_explainer": state["opposer_arguments"]},
+            state.get("convergence", [])
+        )
+        update["convergence"] = [assessment]
+        if assessment['converged'] and state.get("stop_on_convergence"):
+            update["converged_round"] = round_num
+            st.info(f"🧭 Both sides restated their arguments in round {round_num} without citing new evidence; "
+                    f"ending the debate {state['max_rounds'] - round_num} round(s) early")
+        return update
+    
+    async def acheck_rounds_node(self, state: GraphState) -> GraphState:
+        """Async node: Check if we should continue the debate"""
+        return self.check_rounds_node(state)
     
     def judge_node(self, state: GraphState) -> GraphState:
         """Node: Generate natural language summary and structured verdict"""
         st.write("## ⚖️ Final Judgment")
         
         try:
-            with st.spinner("🧑‍⚖️ Judge Agent analyzing debate..."):
-                judge = JudgeAgent(AgentRole.JUDGE, PHI_MODEL, self.client)
-                judge_summary = judge.make_judgment(
-                    state["claim"], 
-                    state["scraped_content"], 
-                    state["verifier_arguments"], 
-                    state["opposer_arguments"]
-                )
+            started = time.perf_counter()
+            quick = None
+            if state.get("judging_cascade"):
+                calls_before = len(self.client.call_log)
+                scorer = QuickScorer(self.client, threshold=self.cascade_threshold)
+                with st.spinner("⚡ Quick scorer reading the compressed debate..."):
+                    quick = scorer.score(state["claim"], state["verifier_arguments"], state["opposer_arguments"],
+                                         self._debate_memory(state))
+                self._show_call_timings(calls_before)
+                if scorer.confident(quick):
+                    return self._quick_judgment_update(state, quick, started)
+                self._show_escalation(quick, scorer)
             
             st.write("### 📝 Judge's Analysis")
-            display_judge_analysis(judge_summary)
+            placeholder = st.empty()
+            calls_before = len(self.client.call_log)
+            scoring_agent = ScoringAgent(self.client, PHI_MODEL)
+            fused = None
+            if state.get("fused_judgment"):
+                with st.spinner("🧑‍⚖️ Judge Agent analyzing and scoring debate..."):
+                    judge = FusedJudgeAgent(AgentRole.JUDGE, PHI_MODEL, self.client,
+                                            self.passage_index(state["scraped_content"]))
+                    fused = judge.make_fused_judgment(
+                        state["claim"],
+                        state.get("evidence_pack") or state["scraped_content"],
+                        state["verifier_arguments"],
+                        state["opposer_arguments"],
+                        on_token=TokenStreamRenderer(placeholder),
+                        debate_memory=self._debate_memory(state)
+                    )
+                if fused is None:
+                    st.caption("Structured judgment failed; judging and scoring in separate calls")
             
-            with st.spinner("📊 Scoring the debate..."):
-                scoring_agent = ScoringAgent(self.client, PHI_MODEL)
-                structured_verdict = scoring_agent.score_debate(judge_summary, state["claim"])
+            if fused is None:
+                with st.spinner("🧑‍⚖️ Judge Agent analyzing debate..."):
+                    judge = JudgeAgent(AgentRole.JUDGE, PHI_MODEL, self.client,
+                                       self.passage_index(state["scraped_content"]))
+                    judge_summary = judge.make_judgment(
+                        state["claim"], 
+                        state.get("evidence_pack") or state["scraped_content"], 
+                        state["verifier_arguments"], 
+                        state["opposer_arguments"],
+                        on_token=TokenStreamRenderer(placeholder),
+                        debate_memory=self._debate_memory(state)
+                    )
+            else:
+                judge_summary = fused[0]
             
-            # Combine judge summary with structured verdict
-            final_judgment = {
-                **structured_verdict,
-                "judge_summary": judge_summary
-            }
+            with placeholder.container():
+                display_judge_analysis(judge_summary)
+            self._show_call_timings(calls_before)
             
-            return {
-                **state,
-                "final_judgment": final_judgment,
-                "debate_complete": True,
-                "messages": state["messages"] + [AIMessage(content=f"Final judgment: {structured_verdict['verdict']} with {structured_verdict['confidence']:.2f} confidence")],
-                "error_message": None
-            }
+            if fused is None:
+                with st.spinner("📊 Scoring the debate..."):
+                    structured_verdict = scoring_agent.score_debate(judge_summary, state["claim"])
+            else:
+                structured_verdict = scoring_agent.review_verdict(fused[1], judge_summary)
+            
+            return {**self._judgment_update(state, judge_summary, structured_verdict),
+                    "judging": self._judging_stats("escalated" if state.get("judging_cascade") else "full", started, quick)}
             
         except Exception as e:
-            st.error(f"Judge/Scoring error: {str(e)}")
-            fallback_judgment = {
-                "verdict": "INSUFFICIENT_EVIDENCE",
-                "confidence": 0.5,
-                "reasoning": f"Technical error prevented proper judgment: {str(e)}",
-                "evidence_quality": "MODERATE",
-                "winning_side": "tie",
-                "judge_summary": f"Analysis incomplete due to technical error: {str(e)}"
-            }
+            return self._judgment_error_update(state, e)
+    
+    async def ajudge_node(self, state: GraphState) -> GraphState:
+        """Async node: Generate natural language summary and structured verdict"""
+        st.write("## ⚖️ Final Judgment")
+        
+        try:
+            started = time.perf_counter()
+            quick = None
+            if state.get("judging_cascade"):
+                calls_before = len(self.client.call_log)
+                scorer = QuickScorer(self.client, threshold=self.cascade_threshold)
+                quick = await scorer.ascore(state["claim"], state["verifier_arguments"], state["opposer_arguments"],
+                                            self._debate_memory(state))
+                self._show_call_timings(calls_before)
+                if scorer.confident(quick):
+                    return self._quick_judgment_update(state, quick, started)
+                self._show_escalation(quick, scorer)
             
-            return {
-                **state,
-                "final_judgment": fallback_judgment,
-                "debate_complete": True,
-                "error_message": f"Judge error: {str(e)}",
-                "messages": state["messages"] + [AIMessage(content="Final judgment completed with errors")]
-            }
+            st.write("### 📝 Judge's Analysis")
+            placeholder = st.empty()
+            calls_before = len(self.client.call_log)
+            scoring_agent = ScoringAgent(self.client, PHI_MODEL)
+            fused = None
+            if state.get("fused_judgment"):
+                judge = FusedJudgeAgent(AgentRole.JUDGE, PHI_MODEL, self.client,
+                                        self.passage_index(state["scraped_content"]))
+                fused = await judge.amake_fused_judgment(
+                    state["claim"],
+                    state.get("evidence_pack") or state["scraped_content"],
+                    state["verifier_arguments"],
+                    state["opposer_arguments"],
+                    on_token=TokenStreamRenderer(placeholder),
+                    debate_memory=self._debate_memory(state)
+                )
+                if fused is None:
+                    st.caption("Structured judgment failed; judging and scoring in separate calls")
+            
+            if fused is None:
+                judge = JudgeAgent(AgentRole.JUDGE, PHI_MODEL, self.client,
+                                   self.passage_index(state["scraped_content"]))
+                judge_summary = await judge.amake_judgment(
+                    state["claim"],
+                    state.get("evidence_pack") or state["scraped_content"],
+                    state["verifier_arguments"],
+                    state["opposer_arguments"],
+                    on_token=TokenStreamRenderer(placeholder),
+                    debate_memory=self._debate_memory(state)
+                )
+            else:
+                judge_summary = fused[0]
+            
+            with placeholder.container():
+                display_judge_analysis(judge_summary)
+            self._show_call_timings(calls_before)
+            
+            if fused is None:
+                structured_verdict = await scoring_agent.ascore_debate(judge_summary, state["claim"])
+            else:
+                structured_verdict = scoring_agent.review_verdict(fused[1], judge_summary)
+            
+            return {**self._judgment_update(state, judge_summary, structured_verdict),
+                    "judging": self._judging_stats("escalated" if state.get("judging_cascade") else "full", started, quick)}
+            
+        except Exception as e:
+            return self._judgment_error_update(state, e)
+    
+    def _quick_judgment_update(self, state: GraphState, verdict: Dict[str, Any], started: float) -> GraphState:
+        """The cascade's first-stage verdict stands; the Judge is skipped"""
+        judge_summary = QuickScorer.summary(verdict)
+        st.write("### ⚡ Quick Verdict")
+        display_judge_analysis(judge_summary)
+        return {**self._judgment_update(state, judge_summary, verdict),
+                "judging": self._judging_stats("quick", started, verdict)}
+    
+    def _show_escalation(self, quick: Optional[Dict[str, Any]], scorer: QuickScorer):
+        if quick is None:
+            st.caption("⚡ The quick scorer's answer was unusable; escalating to the full Judge")
+        else:
+            st.caption(f"⚡ Quick verdict {quick['verdict']} at {quick['confidence']:.0%} confidence is below the "
+                       f"{scorer.threshold:.0%} needed to stand; escalating to the full Judge")
+    
+    def _judging_stats(self, path: str, started: float, quick: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """How the verdict was reached and how long it took, also recorded in the process-wide telemetry"""
+        seconds = time.perf_counter() - started
+        self.client.telemetry.observe_judging(path, seconds)
+        return {
+            'path': path,
+            'seconds': seconds,
+            'quick_verdict': quick['verdict'] if quick else None,
+            'quick_confidence': quick['confidence'] if quick else None
+        }
+    
+    def _judgment_update(self, state: GraphState, judge_summary: str, structured_verdict: Dict[str, Any]) -> GraphState:
+        # Combine judge summary with structured verdict
+        final_judgment = {
+            **structured_verdict,
+            "judge_summary": judge_summary
+        }
+        
+        return {
+            "final_judgment": final_judgment,
+            "debate_complete": True,
+            "messages": [AIMessage(content=f"Final judgment: {structured_verdict['verdict']} with {structured_verdict['confidence']:.2f} confidence")],
+            "error_message": None
+        }
+    
+    def _judgment_error_update(self, state: GraphState, error: Exception) -> GraphState:
+        st.error(f"Judge/Scoring error: {str(error)}")
+        fallback_judgment = {
+            "verdict": "INSUFFICIENT_EVIDENCE",
+            "confidence": 0.5,
+            "reasoning": f"Technical error prevented proper judgment: {str(error)}",
+            "evidence_quality": "MODERATE",
+            "winning_side": "tie",
+            "judge_summary": f"Analysis incomplete due to technical error: {str(error)}"
+        }
+        
+        return {
+            "final_judgment": fallback_judgment,
+            "debate_complete": True,
+            "error_message": f"Judge error: {str(error)}",
+            "messages": [AIMessage(content="Final judgment completed with errors")]
+        }
     
     def check_scraping_success(self, state: GraphState) -> Literal["success", "error"]:
         """Check if scraping was successful"""
@@ -1255,26 +5563,51 @@ class LangGraphClaimVerificationSystem:
             "messages": [AIMessage(content=f"Process terminated due to error: {error_msg}")]
         }
     
+    async def aerror_handler_node(self, state: GraphState) -> GraphState:
+        """Async node: Handle errors gracefully"""
+        return self.error_handler_node(state)
+    
     def retry_handler_node(self, state: GraphState) -> GraphState:
         """Node: Handle retries with exponential backoff"""
+        sleep_time = self._retry_backoff(state)
+        if sleep_time is None:
+            return self._retries_exhausted_update(state)
+        time.sleep(sleep_time)
+        return {}
+    
+    async def aretry_handler_node(self, state: GraphState) -> GraphState:
+        """Async node: Handle retries with exponential backoff without blocking other debates"""
+        sleep_time = self._retry_backoff(state)
+        if sleep_time is None:
+            return self._retries_exhausted_update(state)
+        await asyncio.sleep(sleep_time)
+        return {}
+    
+    def _retry_backoff(self, state: GraphState) -> Optional[int]:
+        """Seconds to wait before the next attempt, or None once retries are exhausted"""
         retry_count = state.get("retry_count", 0)
         max_retries = 3
-        
         if retry_count >= max_retries:
-            return {
-                **state,
-                "error_message": f"Max retries ({max_retries}) exceeded for node: {state.get('last_error_node', 'unknown')}",
-                "debate_complete": True
-            }
+            return None
         
         # Exponential backoff
         sleep_time = 2 ** retry_count
         st.info(f"Retrying in {sleep_time} seconds... (Attempt {retry_count + 1}/{max_retries})")
-        time.sleep(sleep_time)
-        
-        return state
+        return sleep_time
+    
+    def _retries_exhausted_update(self, state: GraphState) -> GraphState:
+        max_retries = 3
+        return {
+            "error_message": f"Max retries ({max_retries}) exceeded for node: {state.get('last_error_node', 'unknown')}",
+            "debate_complete": True
+        }
     
-    def run_verification(self, claim: str, urls: List[str], num_rounds: int = 2) -> Dict[str, Any]:
+    def run_verification(self, claim: str, urls: List[str], num_rounds: int = 2,
+                         use_evidence_store: bool = EVIDENCE_STORE_RECALL,
+                         parallel_openings: bool = PARALLEL_OPENINGS,
+                         stop_on_convergence: bool = CONVERGENCE_ENABLED,
+                         fused_judgment: bool = FUSED_JUDGMENT,
+                         judging_cascade: bool = JUDGING_CASCADE) -> Dict[str, Any]:
         """Run the complete verification process using LangGraph"""
         
         # Check dependencies first
@@ -1284,11 +5617,67 @@ class LangGraphClaimVerificationSystem:
                 'error': 'Missing required dependencies'
             }
         
-        # Initialize the state
-        initial_state: GraphState = {
+        initial_state = self._initial_state(claim, urls, num_rounds, use_evidence_store, parallel_openings,
+                                            stop_on_convergence, fused_judgment, judging_cascade)
+        
+        try:
+            st.write("🚀 **Starting LangGraph Execution**")
+            
+            # Execute the graph with proper config
+            script_run_token = SCRIPT_RUN_CONTEXT.set(get_script_run_ctx())
+            try:
+                final_state = self.graph.invoke(initial_state, config=self._run_config())
+            finally:
+                SCRIPT_RUN_CONTEXT.reset(script_run_token)
+            
+            st.success("✅ LangGraph execution completed successfully")
+            return self._verification_results(final_state)
+            
+        except Exception as e:
+            return self._failed_verification_results(initial_state, e)
+    
+    async def arun_verification(self, claim: str, urls: List[str], num_rounds: int = 2,
+                                use_evidence_store: bool = EVIDENCE_STORE_RECALL,
+                                parallel_openings: bool = PARALLEL_OPENINGS,
+                                stop_on_convergence: bool = CONVERGENCE_ENABLED,
+                                fused_judgment: bool = FUSED_JUDGMENT,
+                                judging_cascade: bool = JUDGING_CASCADE) -> Dict[str, Any]:
+        """Run the complete verification process on the running event loop using the async graph"""
+        
+        # Check dependencies first
+        if not check_dependencies():
+            return {
+                'success': False,
+                'error': 'Missing required dependencies'
+            }
+        
+        initial_state = self._initial_state(claim, urls, num_rounds, use_evidence_store, parallel_openings,
+                                            stop_on_convergence, fused_judgment, judging_cascade)
+        
+        try:
+            st.write("🚀 **Starting LangGraph Execution**")
+            
+            final_state = await self.async_graph.ainvoke(initial_state, config=self._run_config())
+            
+            st.success("✅ LangGraph execution completed successfully")
+            return self._verification_results(final_state)
+            
+        except Exception as e:
+            return self._failed_verification_results(initial_state, e)
+    
+    def _initial_state(self, claim: str, urls: List[str], num_rounds: int, use_evidence_store: bool,
+                       parallel_openings: bool = PARALLEL_OPENINGS,
+                       stop_on_convergence: bool = CONVERGENCE_ENABLED,
+                       fused_judgment: bool = FUSED_JUDGMENT,
+                       judging_cascade: bool = JUDGING_CASCADE) -> GraphState:
+        return {
             "claim": claim,
             "urls": urls,
             "scraped_content": [],
+            "dedup_stats": None,
+            "use_evidence_store": use_evidence_store,
+            "store_stats": None,
+            "evidence_pack": None,
             "verifier_arguments": [],
             "opposer_arguments": [],
             "current_round": 1,
@@ -1300,53 +5689,108 @@ class LangGraphClaimVerificationSystem:
             "error_message": None,
             "debate_complete": False,
             "retry_count": 0,
-            "last_error_node": None
+            "last_error_node": None,
+            "node_timings": [],
+            "parallel_openings": parallel_openings,
+            "opening_errors": [],
+            "stop_on_convergence": stop_on_convergence,
+            "convergence": [],
+            "converged_round": None,
+            "fused_judgment": fused_judgment,
+            "verifier_digest": None,
+            "opposer_digest": None,
+            "judging_cascade": judging_cascade,
+            "judging": None
+        }
+    
+    def _run_config(self) -> RunnableConfig:
+        # A unique thread ID per verification session; concurrent debates must not share checkpoints
+        thread_id = f"verification_{int(time.time())}_{uuid.uuid4().hex[:8]}"
+        return RunnableConfig(configurable={"thread_id": thread_id})
+    
+    def _verification_results(self, final_state: GraphState) -> Dict[str, Any]:
+        passage_index = self.passage_index(final_state.get('scraped_content', []))
+        return {
+            'state': final_state,
+            'judgment': final_state.get('final_judgment', {}),
+            'scraped_content': final_state.get('scraped_content', []),
+            'dedup_stats': final_state.get('dedup_stats'),
+            'store_stats': final_state.get('store_stats'),
+            'retrieval_stats': passage_index.stats() if passage_index else None,
+            'llm_calls': list(self.client.call_log),
+            'llm_cache_stats': self.client.cache.summary() if self.client.cache else None,
+            'abort_stats': self.client.abort_summary(),
+            'endpoint_stats': self.client.pool.summary(),
+            'hedge_stats': self.client.latency.summary(),
+            'node_timings': final_state.get('node_timings', []),
+            'prometheus_metrics': self._export_telemetry(),
+            'convergence_stats': self._convergence_stats(final_state),
+            'debate_memory': self._debate_memory(final_state),
+            'judging_stats': final_state.get('judging'),
+            'debate_history': self._extract_debate_history(final_state),
+            'messages': final_state.get('messages', []),
+            'success': True,
+            'error': final_state.get('error_message')
+        }
+    
+    def _convergence_stats(self, final_state: GraphState) -> Optional[Dict[str, Any]]:
+        """Round-by-round convergence and, if the debate ended early, the rounds and LLM calls it saved"""
+        assessments = final_state.get('convergence', [])
+        if not assessments:
+            return None
+        converged_round = final_state.get('converged_round')
+        rounds_saved = final_state.get('max_rounds', 0) - converged_round if converged_round else 0
+        return {
+            'converged_round': converged_round,
+            'rounds_saved': rounds_saved,
+            'calls_saved': 2 * rounds_saved,  # One Verifier and one Counter-Explainer generation per round
+            'rounds': assessments
         }
+    
+    def _export_telemetry(self) -> str:
+        """Render the process-wide LLM telemetry, also writing it to TELEMETRY_TEXTFILE_PATH when set"""
+        if TELEMETRY_TEXTFILE_PATH:
+            try:
+                self.client.telemetry.write_textfile(TELEMETRY_TEXTFILE_PATH)
+            except OSError as e:
+                logger.warning(f"Could not write telemetry to {TELEMETRY_TEXTFILE_PATH}: {e}")
+        return self.client.telemetry.prometheus_text()
+    
+    def _failed_verification_results(self, initial_state: GraphState, error: Exception) -> Dict[str, Any]:
+        error_msg = f"LangGraph execution error: {str(error)}"
+        st.error(error_msg)
+        logger.error(error_msg)
         
-        try:
-            st.write("🚀 **Starting LangGraph Execution**")
-            
-            # Create a unique thread ID for this verification session
-            thread_id = f"verification_{int(time.time())}"
-            config = RunnableConfig(configurable={"thread_id": thread_id})
-            
-            # Execute the graph with proper config
-            final_state = self.graph.invoke(initial_state, config=config)
-            
-            st.success("✅ LangGraph execution completed successfully")
-            
-            return {
-                'state': final_state,
-                'judgment': final_state.get('final_judgment', {}),
-                'scraped_content': final_state.get('scraped_content', []),
-                'debate_history': self._extract_debate_history(final_state),
-                'messages': final_state.get('messages', []),
-                'success': True,
-                'error': final_state.get('error_message')
-            }
-            
-        except Exception as e:
-            error_msg = f"LangGraph execution error: {str(e)}"
-            st.error(error_msg)
-            logger.error(error_msg)
-            
-            return {
-                'state': initial_state,
-                'judgment': {
-                    "verdict": "INSUFFICIENT_EVIDENCE",
-                    "confidence": 0.0,
-                    "reasoning": error_msg,
-                    "key_evidence": ["Analysis failed due to system error"],
-                    "verifier_score": 0,
-                    "opposer_score": 0,
-                    "evidence_quality": "WEAK"
-                },
-                'scraped_content': [],
-                'debate_history': [],
-                'messages': [HumanMessage(content=error_msg)],
-                'success': False,
-                'error': error_msg
-            }
+        return {
+            'state': initial_state,
+            'judgment': {
+                "verdict": "INSUFFICIENT_EVIDENCE",
+                "confidence": 0.0,
+                "reasoning": error_msg,
+                "key_evidence": ["Analysis failed due to system error"],
+                "verifier_score": 0,
+                "opposer_score": 0,
+                "evidence_quality": "WEAK"
+            },
+            'scraped_content': [],
+            'dedup_stats': None,
+            'store_stats': None,
+            'retrieval_stats': None,
+            'llm_calls': list(self.client.call_log),
+            'llm_cache_stats': None,
+            'abort_stats': self.client.abort_summary(),
+            'endpoint_stats': self.client.pool.summary(),
+            'hedge_stats': self.client.latency.summary(),
+            'node_timings': [],
+            'prometheus_metrics': self._export_telemetry(),
+            'convergence_stats': None,
+            'debate_memory': None,
+            'judging_stats': None,
+            'debate_history': [],
+            'messages': [HumanMessage(content=error_msg)],
+            'success': False,
+            'error': error_msg
+        }
     
     def _extract_debate_history(self, final_state: GraphState) -> List[Dict[str, Any]]:
         """Extract debate history from the final state"""
@@ -1365,6 +5809,37 @@ class LangGraphClaimVerificationSystem:
         
         return history
 
+class TokenStreamRenderer:
+    """on_token callback that redraws a Streamlit placeholder with the text generated so far"""
+    
+    def __init__(self, placeholder, interval: float = STREAM_RENDER_INTERVAL):
+        self.placeholder = placeholder
+        self.interval = interval
+        self._last_render = 0.0
+    
+    def __call__(self, text: str):
+        now = time.perf_counter()
+        # Redraw at most every interval; an empty text means a (re)start and is always shown
+        if not text or now - self._last_render >= self.interval:
+            self.placeholder.markdown(text + "▌")
+            self._last_render = now
+
+def format_call_timing(call: Dict[str, Any]) -> str:
+    """One-line summary of an LLM call's latency figures"""
+    if call.get('cached'):
+        return f"⏱️ served from the response cache in {call['total_s'] * 1000:.1f} ms"
+    if call.get('aborted'):
+        return f"⏱️ cancelled as degenerate after {call['completion_tokens']} tokens: {call['aborted']}"
+    parts = []
+    if call.get('ttft_s') is not None:
+        parts.append(f"first token after {call['ttft_s']:.2f}s")
+    if call.get('tokens_per_s'):
+        parts.append(f"{call['tokens_per_s']:.1f} tokens/s")
+    if call.get('completion_tokens'):
+        parts.append(f"{call['completion_tokens']} tokens")
+    parts.append(f"{call['total_s']:.1f}s total")
+    return "⏱️ " + " · ".join(parts)
+
 def display_judge_analysis(judge_summary: str):
     """Display judge analysis with LaTeX support"""
     # Check if the response contains LaTeX formatting
@@ -1423,16 +5898,88 @@ def main():
     urls = [url.strip() for url in urls_text.split('\n') if url.strip()]
     
     # Number of debate rounds
-    num_rounds = st.slider("Number of debate rounds:", min_value=1, max_value=5, value=2)
+    num_rounds = st.slider("Number of debate rounds:", min_value=1, max_value=MAX_DEBATE_ROUNDS, value=2)
+    
+    # HTML extraction backend
+    backends = available_extraction_backends()
+    extraction_backend = st.selectbox(
+        "HTML extraction backend:",
+        backends,
+        index=backends.index(EXTRACTION_BACKEND) if EXTRACTION_BACKEND in backends else 0,
+        help="lxml and selectolax parse pages much faster than BeautifulSoup. Both are in requirements.txt; one missing here failed to import."
+    )
+    
+    # Previously scraped evidence
+    use_evidence_store = st.checkbox(
+        "Include relevant sources from the evidence store",
+        value=EVIDENCE_STORE_RECALL and EVIDENCE_STORE_ENABLED,
+        disabled=not EVIDENCE_STORE_ENABLED,
+        help="Every successfully scraped page is indexed locally, including pages scraped for earlier, unrelated claims. With this on, the best matching stored pages join the debate alongside your URLs, so URLs become optional."
+    )
+    
+    # Adaptive debate length
+    stop_on_convergence = st.checkbox(
+        "End the debate early when arguments converge",
+        value=CONVERGENCE_ENABLED,
+        help=f"After at least {CONVERGENCE_MIN_ROUNDS} rounds, stop once both sides mostly repeat their previous argument "
+             f"(at least {CONVERGENCE_MAX_OVERLAP:.0%} of its {CONVERGENCE_NGRAM}-word phrases) without citing new evidence."
+    )
+    
+    # Concurrent round-1 statements
+    parallel_openings = st.checkbox(
+        "Parallel opening statements",
+        value=PARALLEL_OPENINGS,
+        help="The Counter-Explainer's first analysis does not wait for the Verifier's opening, saving one generation per debate. "
+             "It then cannot respond to the Verifier until round 2; with several LM Studio endpoints or parallel slots the two run at once."
+    )
+    
+    # One judge call instead of two
+    fused_judgment = st.checkbox(
+        "Judge and score in one call",
+        value=FUSED_JUDGMENT,
+        help="The Judge writes its analysis and the structured verdict as one JSON answer constrained by a schema, "
+             "skipping the separate scoring call. Needs an LM Studio version with structured output; "
+             "otherwise the app falls back to judging and scoring separately."
+    )
+    
+    # Quick verdicts for clear-cut debates
+    judging_cascade = st.checkbox(
+        "Quick verdict first, full Judge only when unsure",
+        value=JUDGING_CASCADE,
+        help=f"A quick scorer on the debaters' model reads the compressed debate; its verdict stands when it picks a side "
+             f"with at least {CASCADE_CONFIDENCE_THRESHOLD:.0%} confidence, otherwise the full Judge decides. "
+             "Saves the Judge's long prompt on clear-cut claims."
+    )
+    
+    # Replaying identical LLM calls
+    col1, col2 = st.columns(2)
+    with col1:
+        cache_debate_turns = st.checkbox(
+            "Cache debate turns",
+            value=False,
+            disabled=not LLM_CACHE_ENABLED,
+            help="Scoring answers are always cached. With this on, re-running a claim on the same evidence also replays identical Verifier, Counter-Explainer and Judge prompts from the cache."
+        )
+    with col2:
+        bypass_llm_cache = st.checkbox(
+            "Bypass the LLM response cache",
+            value=False,
+            disabled=not LLM_CACHE_ENABLED,
+            help="Ask LM Studio for every answer; fresh answers still replace the cached ones."
+        )
     
     # Verification button
-    if st.button("🚀 Start Verification", type="primary", disabled=not (claim and urls)):
-        if claim and urls:
+    if st.button("🚀 Start Verification", type="primary", disabled=not (claim and (urls or use_evidence_store))):
+        if claim and (urls or use_evidence_store):
             with st.spinner("Initializing LangGraph AI system..."):
-                system = LangGraphClaimVerificationSystem()
+                system = LangGraphClaimVerificationSystem(extraction_backend)
+                if cache_debate_turns:
+                    system.client.cache_roles.update(LLM_CACHE_OPT_IN_ROLES)
+                system.client.cache_bypass = bypass_llm_cache
                 
             start_time = time.time()
-            results = system.run_verification(claim, urls, num_rounds)
+            results = system.run_verification(claim, urls, num_rounds, use_evidence_store, parallel_openings,
+                                              stop_on_convergence, fused_judgment, judging_cascade)
             end_time = time.time()
             
             st.success(f"✅ LangGraph verification completed in {end_time - start_time:.1f} seconds")
@@ -1451,9 +5998,150 @@ def main():
                     st.metric("Confidence", f"{judgment['confidence']:.2%}")
                 with col3:
                     st.metric("Evidence Quality", judgment['evidence_quality'])
+                
+                # Which stage of the judging cascade decided
+                judging_stats = results.get('judging_stats')
+                if judging_stats and judging_stats['path'] != 'full':
+                    cascade = system.client.telemetry.judging_summary()
+                    st.caption(f"Judged by the {'quick scorer' if judging_stats['path'] == 'quick' else 'full Judge after escalation'} "
+                               f"in {judging_stats['seconds']:.1f}s; {cascade['escalation_rate']:.0%} of cascaded claims "
+                               f"since the app started escalated")
+
+            # Rounds cut short by converging arguments
+            convergence_stats = results.get('convergence_stats')
+            if convergence_stats:
+                if convergence_stats['converged_round']:
+                    st.success(f"🧭 Arguments converged after round {convergence_stats['converged_round']} of {num_rounds}: "
+                               f"{convergence_stats['rounds_saved']} round(s) and {convergence_stats['calls_saved']} LLM calls saved")
+                with st.expander("🧭 Argument convergence by round"):
+                    st.caption("Overlap is the share of an argument's phrases already in the same side's previous argument; "
+                               "a round is stale when both sides restate themselves and cite nothing new")
+                    st.dataframe(pd.DataFrame(convergence_stats['rounds']).rename(columns={
+                        'round': 'Round', 'verifier_overlap': 'Verifier Overlap',
+                        'verifier_new_citations': 'Verifier New Citations',
+                        'counter_explainer_overlap': 'Counter-Explainer Overlap',
+                        'counter_explainer_new_citations': 'Counter-Explainer New Citations',
+                        'stale': 'Stale', 'stale_streak': 'Stale Streak', 'converged': 'Converged'
+                    }).round(2), use_container_width=True)
+
+            # What the agents remembered of earlier rounds
+            debate_memory = results.get('debate_memory')
+            if debate_memory and any(debate_memory.values()):
+                with st.expander("🧠 Debate memory"):
+                    st.caption(f"Each debater saw the digest of earlier rounds plus the opponent's latest argument in full; "
+                               f"the Judge read the last {DEBATE_MEMORY_JUDGE_ROUNDS} rounds in full")
+                    for role, name in ((AgentRole.VERIFIER, "Verifier"), (AgentRole.COUNTER_EXPLAINER, "Counter-Explainer")):
+                        st.text(DebateMemory.render(debate_memory[role.value], name) or f"{name}: nothing recorded")
+
+            # Per-call generation latency
+            if results.get('llm_calls'):
+                st.write("## ⏱️ Generation Performance")
+                calls_df = pd.DataFrame(results['llm_calls']).drop(columns=['prompt_sections'], errors='ignore').rename(columns={
+                    'role': 'Role', 'model': 'Model', 'endpoint': 'Endpoint', 'streamed': 'Streamed', 'cached': 'Cached', 'ttft_s': 'First Token (s)',
+                    'total_s': 'Total (s)', 'completion_tokens': 'Tokens', 'tokens_per_s': 'Tokens/s',
+                    'prompt_tokens': 'Prompt Tokens', 'cached_prompt_tokens': 'Reused Prompt Tokens',
+                    'prompt_ms': 'Prefill (ms)', 'aborted': 'Aborted (degenerate)', 'finish_reason': 'Finish Reason',
+                    'regeneration': 'Regeneration'
+                })
+                st.dataframe(calls_df.round(2), use_container_width=True)
+                st.write("### 🔬 Run Summary")
+                st.caption("Where this run's time went: wall time per graph node, then the LLM calls behind it per role and model")
+                node_timings = results.get('node_timings') or []
+                if node_timings:
+                    nodes_df = pd.DataFrame(node_timings).groupby('node', sort=False)['seconds'].agg(['count', 'sum', 'max'])
+                    st.dataframe(nodes_df.rename(columns={'count': 'Runs', 'sum': 'Total (s)', 'max': 'Slowest (s)'})
+                                 .rename_axis('Node').sort_values('Total (s)', ascending=False).round(2),
+                                 use_container_width=True)
+                roles_df = pd.DataFrame(results['llm_calls']).groupby(['role', 'model'], dropna=False).agg(
+                    calls=('total_s', 'size'),
+                    regenerations=('regeneration', 'count'),
+                    prompt_tokens=('prompt_tokens', 'sum'),
+                    completion_tokens=('completion_tokens', 'sum'),
+                    mean_ttft_s=('ttft_s', 'mean'),
+                    p95_ttft_s=('ttft_s', lambda values: values.quantile(0.95)),
+                    total_s=('total_s', 'sum')
+                ).reset_index()
+                st.dataframe(roles_df.rename(columns={
+                    'role': 'Role', 'model': 'Model', 'calls': 'Calls', 'regenerations': 'Regenerations',
+                    'prompt_tokens': 'Prompt Tokens', 'completion_tokens': 'Completion Tokens',
+                    'mean_ttft_s': 'Mean First Token (s)', 'p95_ttft_s': 'p95 First Token (s)', 'total_s': 'Total (s)'
+                }).round(2), use_container_width=True)
+                if results.get('prometheus_metrics'):
+                    st.download_button("📈 Download Prometheus metrics", results['prometheus_metrics'],
+                                       file_name="ai_debator_metrics.prom", mime="text/plain")
+                budgets = [{'Role': call['role'], **call['prompt_sections']}
+                           for call in results['llm_calls'] if call.get('prompt_sections')]
+                if budgets:
+                    st.write("### 🧮 Prompt Token Budget")
+                    st.caption("Tokens per prompt section, the answer reservation and the model's context window for each call")
+                    st.dataframe(pd.DataFrame(budgets).fillna(0), use_container_width=True)
+                endpoint_stats = results.get('endpoint_stats') or []
+                if len(endpoint_stats) > 1:
+                    st.write("### 🖧 LLM Endpoints")
+                    st.caption("Requests go to the least loaded healthy endpoint serving the model; failed endpoints sit out until a health probe succeeds")
+                    st.dataframe(pd.DataFrame(endpoint_stats).rename(columns={
+                        'endpoint': 'Endpoint', 'healthy': 'Healthy', 'in_flight': 'In Flight', 'requests': 'Requests',
+                        'failures': 'Failures', 'models': 'Models', 'last_error': 'Last Error'
+                    }), use_container_width=True)
+                hedge_stats = results.get('hedge_stats')
+                if hedge_stats:
+                    st.write("### 🏁 Hedged Requests")
+                    st.caption("Calls slower than the usual p95 get a duplicate and keep the first good answer; "
+                               "'p95 unhedged' is what the first attempts alone would have given (at least)")
+                    st.dataframe(pd.DataFrame(hedge_stats).rename(columns={
+                        'model': 'Model', 'role': 'Role', 'latency': 'Latency', 'calls': 'Calls',
+                        'hedge_rate': 'Hedge Rate', 'hedge_wins': 'Hedge Wins', 'p95_s': 'p95 (s)',
+                        'p95_unhedged_s': 'p95 Unhedged (s)'
+                    }).round(3), use_container_width=True)
+                aborts = {model: stats for model, stats in (results.get('abort_stats') or {}).items() if stats['aborts']}
+                if aborts:
+                    st.caption("Degenerate answers cancelled mid-stream: " + "; ".join(
+                        f"{model}: {stats['aborts']} of {stats['streamed_calls']} streamed calls "
+                        f"({stats['abort_rate']:.0%}), {stats['wasted_tokens_per_abort']:.0f} tokens wasted per abort"
+                        for model, stats in aborts.items()
+                    ))
+                cache_stats = results.get('llm_cache_stats')
+                if cache_stats:
+                    st.caption(
+                        f"LLM response cache: {cache_stats['hits']} hit(s), {cache_stats['misses']} miss(es) this run; "
+                        f"{cache_stats['entries']:,} answers / {cache_stats['size_bytes'] / 2**20:.1f} MB stored"
+                    )
             
             # Display scraped sources with full content
             st.write("## 📚 Sources")
+            cache_statuses = [source.get('cache_status') for source in results['scraped_content']]
+            if system.scraper.cache:
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Cache Hits", cache_statuses.count('hit'))
+                with col2:
+                    st.metric("Revalidated (304)", cache_statuses.count('revalidated'))
+                with col3:
+                    st.metric("Cache Misses", cache_statuses.count('miss'))
+            dedup_stats = results.get('dedup_stats')
+            if dedup_stats:
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Unique Stories", f"{dedup_stats['clusters']} of {dedup_stats['sources']}")
+                with col2:
+                    st.metric("Dedup Ratio", f"{dedup_stats['dedup_ratio']:.0%}")
+                with col3:
+                    st.metric("Prompt Tokens Saved", f"~{dedup_stats['tokens_saved']:,}")
+            store_stats = results.get('store_stats')
+            if store_stats and 'sources' in store_stats:
+                st.caption(
+                    f"Evidence store: {store_stats.get('pulled', 0)} source(s) pulled in {store_stats.get('query_ms', 0):.1f} ms; "
+                    f"{store_stats['ingest']['added']} added, {store_stats['ingest']['updated']} updated; "
+                    f"{store_stats['sources']:,} sources / {store_stats['passages']:,} passages indexed"
+                )
+            retrieval_stats = results.get('retrieval_stats')
+            if retrieval_stats:
+                st.caption(
+                    f"Passage index: {retrieval_stats['passages']:,} passages from {retrieval_stats['sources']} sources, "
+                    f"built in {retrieval_stats['build_ms']:.1f} ms; {retrieval_stats['queries']} queries averaging "
+                    f"{retrieval_stats['mean_query_ms']:.2f} ms"
+                )
+            
             for i, source in enumerate(results['scraped_content']):
                 # Create a more descriptive title for the expander
                 source_title = source.get('title', 'No Title Available')
@@ -1461,6 +6149,10 @@ def main():
                     source_title = source_title[:80] + "..."
                 
                 status_emoji = "✅" if source['status'] == 'success' else "❌"
+                if source.get('evidence_store'):
+                    status_emoji = "🗄️"
+                if source.get('duplicate_of'):
+                    status_emoji = "🔁"
                 expander_title = f"{status_emoji} Source {i+1}: {source_title}"
                 
                 with st.expander(expander_title):
@@ -1468,6 +6160,12 @@ def main():
                     st.write(f"**Title:** {source.get('title', 'No title available')}")
                     st.write(f"**Status:** {source['status']}")
                     st.write(f"**Scraped at:** {source.get('scraped_at', 'Unknown time')}")
+                    if source.get('evidence_store'):
+                        st.info("Pulled from the evidence store, not scraped for this claim.")
+                    if source.get('duplicate_of'):
+                        st.info(f"Near-duplicate of {source['duplicate_of']}; the agents only saw that copy.")
+                    if source.get('corroborating_urls'):
+                        st.write(f"**Also published at:** {', '.join(source['corroborating_urls'])}")
                     
                     if source['status'] == 'success':
                         # Show content statistics
@@ -1515,13 +6213,20 @@ def main():
                                 "Content Length": len(source.get('content', '')),
                                 "Full Text Length": len(source.get('full_text', '')),
                                 "Scraped At": source.get('scraped_at', ''),
-                                "Status": source.get('status', '')
+                                "Status": source.get('status', ''),
+                                "Cache": source.get('cache_status', 'disabled'),
+                                "Extraction Backend": source.get('extraction_backend', 'cached'),
+                                "Content Type": source.get('content_type', 'cached'),
+                                "Bytes Downloaded": source.get('bytes_downloaded', 0),
+                                "Bytes Discarded": source.get('bytes_discarded', 0),
+                                "Download Truncated": source.get('download_truncated', False),
+                                "SimHash": source.get('simhash', 'not fingerprinted')
                             })
                     else:
                         st.error(f"**Error:** {source.get('error', 'Unknown error occurred during scraping')}")
                         st.info("This source could not be scraped and was not used in the analysis.")
         else:
-            st.warning("Please enter a claim and at least one URL to verify.")
+            st.warning("Please enter a claim and at least one URL, or enable the evidence store.")
 
 if __name__ == "__main__":
     main()
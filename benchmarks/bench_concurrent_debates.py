@@ -0,0 +1,106 @@
+"""Benchmark many debates sharing one event loop against sequential blocking runs.
+
+Serves the fixture corpus and a mock OpenAI-compatible LLM locally, then runs
+--debates full verifications twice on fresh caches: one after another through
+run_verification (the blocking graph), and all at once through
+arun_verification on a single event loop (the async graph and the async
+client's connection pool). Mock generation time dominates, as it does against
+a real LM Studio server, so the speedup shows how much idle I/O the blocking
+path leaves unused.
+
+    python benchmarks/bench_concurrent_debates.py --debates 8 --rounds 2 --ttft 0.2 --tokens-per-second 60
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Ai  # noqa: E402
+from corpus import build_corpus  # noqa: E402
+from fixture_server import serve_corpus  # noqa: E402
+from mock_llm_server import serve_mock_llm  # noqa: E402
+
+CLAIMS = [
+    "Inflation rates increased according to the federal survey",
+    "The climate report confirmed a decrease in emissions",
+    "Researchers published evidence that the vaccine study was flawed",
+    "The court ruling changed national trade tariffs",
+    "Unemployment data showed growth in the local economy",
+    "The minister announced an investigation into energy prices",
+]
+
+
+@contextmanager
+def fresh_system(llm_url):
+    """A verification system whose scrape cache and evidence store start empty"""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            system = Ai.LangGraphClaimVerificationSystem()
+            system.client = Ai.LMStudioClient(llm_url)
+            system.scraper.engine.host_rate = 0  # Every fixture page lives on one host
+            yield system
+        finally:
+            os.chdir(previous)
+
+
+def summarize(label, elapsed, results, calls):
+    succeeded = sum(1 for result in results if result.get('success'))
+    ttft = sorted(call['ttft_s'] for call in calls if call.get('ttft_s') is not None)
+    p50_ttft = ttft[len(ttft) // 2] if ttft else float('nan')
+    print(f"{label:>12} {len(results):>8} {succeeded:>8} {elapsed:>10.2f} {len(results) / elapsed * 60:>12.1f} "
+          f"{len(calls):>7} {p50_ttft:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--debates', type=int, default=8)
+    parser.add_argument('--rounds', type=int, default=2)
+    parser.add_argument('--urls', type=int, default=4, help="Fixture pages scraped per debate")
+    parser.add_argument('--ttft', type=float, default=0.2, help="Mock seconds before the first token")
+    parser.add_argument('--tokens-per-second', type=float, default=60.0, help="Mock generation rate per request")
+    parser.add_argument('--completion-tokens', type=int, default=120)
+    parser.add_argument('--skip-sequential', action='store_true')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # Streamlit warns about running without a script context
+    pages = build_corpus(args.debates * args.urls)
+    with serve_corpus(pages) as corpus_url, \
+            serve_mock_llm(0, args.ttft, args.tokens_per_second, args.completion_tokens) as llm_url:
+        debates = [
+            (CLAIMS[i % len(CLAIMS)],
+             [f"{corpus_url}/{name}" for name, _ in pages[i * args.urls:(i + 1) * args.urls]])
+            for i in range(args.debates)
+        ]
+
+        print(f"{'mode':>12} {'debates':>8} {'success':>8} {'seconds':>10} {'debates/min':>12} "
+              f"{'calls':>7} {'p50 ttft':>10}")
+        if not args.skip_sequential:
+            with fresh_system(llm_url) as system:
+                start = time.perf_counter()
+                results = [system.run_verification(claim, urls, args.rounds, use_evidence_store=False)
+                           for claim, urls in debates]
+                summarize('sequential', time.perf_counter() - start, results, system.client.call_log)
+
+        with fresh_system(llm_url) as system:
+            async def run_all():
+                return await asyncio.gather(*(
+                    system.arun_verification(claim, urls, args.rounds, use_evidence_store=False)
+                    for claim, urls in debates
+                ))
+
+            start = time.perf_counter()
+            results = asyncio.run(run_all())
+            summarize('concurrent', time.perf_counter() - start, results, system.client.call_log)
+
+
+if __name__ == '__main__':
+    main()
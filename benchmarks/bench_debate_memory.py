@@ -0,0 +1,103 @@
+"""Benchmark prompt size over long debates with and without the DebateMemory digest.
+
+Plays a --rounds debate over one EvidencePack against the mock LLM server,
+once with each debater seeing only the opponent's last two arguments (the
+memory off) and once with the running digest plus the opponent's latest
+argument. Prompt tokens per round (both turns) come from the server's usage
+numbers. The Judge's prompt is built after every round but not sent; without
+the digest it stops growing once the context budget starts trimming every
+argument, so the tokens left per argument ('judge tok/arg') shrink with each
+round; with it the Judge reads the last DEBATE_MEMORY_JUDGE_ROUNDS rounds in
+full and the digest covers the rest.
+
+    python benchmarks/bench_debate_memory.py --rounds 12 --sources 6 --completion-tokens 600
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Ai  # noqa: E402
+from corpus import build_corpus  # noqa: E402
+from mock_llm_server import serve_mock_llm  # noqa: E402
+
+CLAIM = "Federal survey data show inflation rates increased while unemployment decreased"
+
+
+def extract_sources(count):
+    backend = Ai.get_extraction_backend('beautifulsoup')
+    return [{'url': f"http://fixture.local/{name}", 'status': 'success', **backend.extract(body)}
+            for name, body in build_corpus(count)]
+
+
+def play_debate(system, sources, rounds, memory):
+    """Alternate the debaters for the given rounds; returns prompt tokens per round, and the Judge's
+    prompt tokens and tokens per argument read in full after each"""
+    pack = system.build_evidence_pack(CLAIM, sources)
+    passage_index = system.passage_index(sources)
+    verifier = Ai.VerifierAgent(Ai.AgentRole.VERIFIER, Ai.QWEN_MODEL, system.client, passage_index)
+    counter = Ai.CounterExplainerAgent(Ai.AgentRole.COUNTER_EXPLAINER, Ai.QWEN_MODEL, system.client, passage_index)
+    judge = Ai.JudgeAgent(Ai.AgentRole.JUDGE, Ai.PHI_MODEL, system.client, passage_index)
+    arguments = {'verifier': [], 'counter_explainer': []}
+    digests = {'verifier': None, 'counter_explainer': None}
+    prompt_tokens, judge_tokens = [], []
+    for round_num in range(1, rounds + 1):
+        calls_before = len(system.client.call_log)
+        for agent, side, opponent in ((verifier, 'verifier', 'counter_explainer'),
+                                      (counter, 'counter_explainer', 'verifier')):
+            argument = agent.generate_argument(CLAIM, pack, arguments[opponent], round_num,
+                                               on_token=lambda text: None,
+                                               debate_memory=dict(digests) if memory else None)
+            arguments[side].append(argument)
+            digests[side] = system.debate_memory.update(digests[side], argument, round_num)
+        prompt_tokens.append(sum(call['prompt_tokens'] for call in system.client.call_log[calls_before:]))
+
+        judge._build_judgment_messages(CLAIM, pack, arguments['verifier'], arguments['counter_explainer'],
+                                       dict(digests) if memory else None)
+        digest_tokens, full_arguments = 0, 0
+        for side in digests:
+            earlier, shown, _ = judge._earlier_rounds(arguments[side], digests[side] if memory else None, side)
+            digest_tokens += judge._measure(earlier) if earlier else 0
+            full_arguments += len(shown)
+        judge_tokens.append((sum(judge.prompt_sections.values()),
+                             (judge.prompt_sections['debate_history'] - digest_tokens) // full_arguments))
+    return prompt_tokens, judge_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=12)
+    parser.add_argument('--sources', type=int, default=6)
+    parser.add_argument('--tokens-per-second', type=float, default=2000.0)
+    parser.add_argument('--completion-tokens', type=int, default=600)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # Streamlit warns about running without a script context
+    sources = extract_sources(args.sources)
+    previous = os.getcwd()
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for memory in (False, True):
+                with serve_mock_llm(0, 0.0, args.tokens_per_second, args.completion_tokens) as llm_url:
+                    system = Ai.LangGraphClaimVerificationSystem()
+                    system.client = Ai.LMStudioClient(llm_url)
+                    results[memory] = play_debate(system, sources, args.rounds, memory)
+        finally:
+            os.chdir(previous)
+
+    print(f"{'round':>6} {'debate tok (off)':>17} {'debate tok (on)':>16} {'judge tok (off)':>16} {'judge tok (on)':>15} "
+          f"{'judge tok/arg (off)':>20} {'judge tok/arg (on)':>19}")
+    for index in range(args.rounds):
+        (judge_off, per_argument_off), (judge_on, per_argument_on) = results[False][1][index], results[True][1][index]
+        print(f"{index + 1:>6} {results[False][0][index]:>17,} {results[True][0][index]:>16,} "
+              f"{judge_off:>16,} {judge_on:>15,} {per_argument_off:>20,} {per_argument_on:>19,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark cancelling degenerate answers mid-stream against validating them afterwards.
+
+Runs --calls streamed LMStudioClient.generate_response calls against the mock
+LLM server with --degenerate-share of its answers falling into a repetition
+loop, once with DEGENERACY_ABORT_ENABLED off (every loop is generated out to
+max_tokens, fails _validate_response and is regenerated) and once on (the
+DegeneracyMonitor cancels the stream and the retry starts right away).
+'server tokens' is what the mock actually generated, so it counts the work a
+real LM Studio server would have spent; 'wasted' is the part of it thrown away.
+
+    python benchmarks/bench_degeneracy.py --calls 40 --degenerate-share 0.3 --completion-tokens 600
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Ai  # noqa: E402
+from mock_llm_server import serve_mock_llm  # noqa: E402
+
+
+def server_stats(llm_url):
+    with urllib.request.urlopen(llm_url.rsplit('/v1', 1)[0] + '/stats') as response:
+        return json.load(response)
+
+
+def run(args, abort_enabled):
+    Ai.DEGENERACY_ABORT_ENABLED = abort_enabled
+    with serve_mock_llm(0, args.ttft, args.tokens_per_second, args.completion_tokens,
+                        degenerate_share=args.degenerate_share) as llm_url:
+        client = Ai.LMStudioClient(llm_url)
+        start = time.perf_counter()
+        answers = [
+            client.generate_response(Ai.QWEN_MODEL, [{'role': 'user', 'content': f"Argue round {i} of the debate."}],
+                                     max_tokens=args.completion_tokens, on_token=lambda text: None, role='verifier')
+            for i in range(args.calls)
+        ]
+        elapsed = time.perf_counter() - start
+        stats = server_stats(llm_url)
+
+    useful = sum(len(answer.split()) for answer in answers)
+    aborts = client.abort_summary().get(Ai.QWEN_MODEL, {})
+    label = 'early abort' if abort_enabled else 'post-hoc'
+    print(f"{label:>12} {args.calls:>6} {stats['degenerate']:>11} {aborts.get('aborts', 0):>7} "
+          f"{len(client.call_log) - args.calls:>8} {stats['generated_tokens']:>14,} "
+          f"{stats['generated_tokens'] - useful:>8,} {elapsed:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=40)
+    parser.add_argument('--degenerate-share', type=float, default=0.3)
+    parser.add_argument('--completion-tokens', type=int, default=600)
+    parser.add_argument('--ttft', type=float, default=0.0)
+    parser.add_argument('--tokens-per-second', type=float, default=2000.0)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # Streamlit warns about running without a script context
+    previous = os.getcwd()
+    print(f"{'mode':>12} {'calls':>6} {'degenerate':>11} {'aborts':>7} {'retries':>8} {'server tokens':>14} "
+          f"{'wasted':>8} {'seconds':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            run(args, abort_enabled=False)
+            run(args, abort_enabled=True)
+        finally:
+            os.chdir(previous)
+
+
+if __name__ == '__main__':
+    main()
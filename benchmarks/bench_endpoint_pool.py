@@ -0,0 +1,87 @@
+"""Benchmark spreading LLM calls over an EndpointPool of several servers.
+
+Starts mock LLM servers on separate ports, each generating one request at a
+time like a single LM Studio instance (--max-concurrent 1), and sends --calls
+concurrent completions through one LMStudioClient per pool size. A last run
+adds an endpoint nobody listens on: the health probe or its first failed
+request ejects it, and the calls it received fail over to the live servers.
+
+    python benchmarks/bench_endpoint_pool.py --calls 16 --endpoints 1 2 4 --tokens-per-second 400
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Ai  # noqa: E402
+from mock_llm_server import serve_mock_llm  # noqa: E402
+
+MODELS = (Ai.QWEN_MODEL, Ai.PHI_MODEL)
+
+
+def unused_url():
+    """Base URL of a local port with nothing listening on it"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}/v1"
+
+
+def run(args, endpoints, label):
+    client = Ai.LMStudioClient(endpoints=endpoints)
+
+    async def run_all():
+        return await asyncio.gather(*(
+            client.agenerate_response(MODELS[i % len(MODELS)], [{'role': 'user', 'content': f"Argue point {i}."}],
+                                      max_tokens=args.completion_tokens, on_token=lambda text: None)
+            for i in range(args.calls)
+        ))
+
+    try:
+        start = time.perf_counter()
+        answers = asyncio.run(run_all())
+        elapsed = time.perf_counter() - start
+    finally:
+        client.close()
+    failed = sum(answer.startswith('Error:') for answer in answers)
+    spread = ' '.join(f"{endpoint['requests']}{'' if endpoint['healthy'] else '(ejected)'}"
+                      for endpoint in client.pool.summary())
+    print(f"{label:>14} {args.calls:>6} {failed:>7} {elapsed:>9.2f} {args.calls / elapsed:>8.2f}   {spread}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=16)
+    parser.add_argument('--endpoints', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--completion-tokens', type=int, default=200)
+    parser.add_argument('--tokens-per-second', type=float, default=400.0)
+    parser.add_argument('--ttft', type=float, default=0.05)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # Streamlit warns about running without a script context
+    previous = os.getcwd()
+    print(f"{'pool':>14} {'calls':>6} {'failed':>7} {'seconds':>9} {'calls/s':>8}   requests per endpoint")
+    with tempfile.TemporaryDirectory() as directory, ExitStack() as servers:
+        os.chdir(directory)
+        try:
+            urls = [servers.enter_context(serve_mock_llm(0, args.ttft, args.tokens_per_second, args.completion_tokens,
+                                                         max_concurrent=1, models=MODELS))
+                    for _ in range(max(args.endpoints))]
+            for count in args.endpoints:
+                run(args, [{'base_url': url, 'models': None} for url in urls[:count]], f"{count} endpoint(s)")
+            count = max(args.endpoints)
+            run(args, [{'base_url': url, 'models': None} for url in [unused_url()] + urls[:count]],
+                f"{count} + 1 down")
+        finally:
+            os.chdir(previous)
+
+
+if __name__ == '__main__':
+    main()
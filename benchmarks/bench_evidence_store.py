@@ -0,0 +1,108 @@
+"""Benchmark ingest and query throughput of the persistent EvidenceStore.
+
+Generates sources from a Zipf-distributed synthetic vocabulary (so the FTS
+index sees a realistic spread of rare and common terms), ingests them in
+debate-sized batches into a fresh store, then times EvidenceStore.search for
+random claims before and after a full segment optimize.
+
+    python benchmarks/bench_evidence_store.py --sources 2000 --batch 10 --queries 500
+"""
+
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Ai  # noqa: E402
+
+
+def build_vocabulary(rng, size):
+    """Random words with cumulative Zipf weights for random.choices"""
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(letters) for _ in range(rng.randint(3, 10))))
+    words = sorted(words)
+    rng.shuffle(words)
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, size + 1)))
+    return words, weights
+
+
+def build_sources(rng, words, weights, count):
+    sources = []
+    for i in range(count):
+        sentences = []
+        for _ in range(rng.randint(15, 70)):
+            sentence = rng.choices(words, cum_weights=weights, k=rng.randint(8, 22))
+            sentences.append(' '.join(sentence).capitalize() + '.')
+        sources.append({
+            'url': f"http://fixture.local/story/{i}",
+            'title': ' '.join(rng.choices(words, cum_weights=weights, k=6)).title(),
+            'content': ' '.join(sentences)[:Ai.MAX_CONTENT_LENGTH],
+            'status': 'success',
+            'scraped_at': '2024-01-01T00:00:00'
+        })
+    return sources
+
+
+def time_queries(store, claims, k):
+    timings = []
+    for claim in claims:
+        start = time.perf_counter()
+        store.search(claim, k)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(0.95 * (len(timings) - 1))], len(claims) / (sum(timings) / 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sources', type=int, default=2000)
+    parser.add_argument('--batch', type=int, default=10, help="Sources per ingest call, like one debate's URLs")
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--vocabulary', type=int, default=20000)
+    parser.add_argument('-k', type=int, default=Ai.EVIDENCE_STORE_TOP_K)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    words, weights = build_vocabulary(rng, args.vocabulary)
+    sources = build_sources(rng, words, weights, args.sources)
+    claims = [' '.join(rng.choices(words, cum_weights=weights, k=rng.randint(6, 14))) for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'evidence_store.sqlite3')
+        store = Ai.EvidenceStore(path)
+
+        passages = 0
+        start = time.perf_counter()
+        for offset in range(0, len(sources), args.batch):
+            passages += store.ingest(sources[offset:offset + args.batch])['passages']
+        elapsed = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"ingest: {len(sources)} sources / {passages} passages in {elapsed:.2f}s "
+              f"({len(sources) / elapsed:.0f} sources/s, {passages / elapsed:.0f} passages/s), "
+              f"{size / 2**20:.1f} MB on disk")
+
+        start = time.perf_counter()
+        unchanged = store.ingest(sources)['unchanged']
+        print(f"re-ingest of unchanged sources: {unchanged} skipped in {time.perf_counter() - start:.2f}s")
+
+        print(f"\n{'segments':>12} {'p50 ms':>8} {'p95 ms':>8} {'queries/s':>10}")
+        p50, p95, rate = time_queries(store, claims, args.k)
+        print(f"{'incremental':>12} {p50:>8.2f} {p95:>8.2f} {rate:>10.0f}")
+
+        start = time.perf_counter()
+        store.optimize()
+        optimize_seconds = time.perf_counter() - start
+        p50, p95, rate = time_queries(store, claims, args.k)
+        print(f"{'optimized':>12} {p50:>8.2f} {p95:>8.2f} {rate:>10.0f}   (optimize took {optimize_seconds:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
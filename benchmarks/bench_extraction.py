@@ -0,0 +1,169 @@
+"""Benchmark the HTML extraction backends over a fixture corpus.
+
+Reports pages/second and peak memory for every installed backend, and checks
+that the BeautifulSoup backend still produces byte-identical title, content
+and full_text to the original scrape_url implementation. Each backend's
+whole-document extract (what ParsePool workers run) is also compared with
+its streaming path (what in-process scrapes run), which must agree exactly.
+
+    python benchmarks/bench_extraction.py --pages 60 --repeat 3
+    python benchmarks/bench_extraction.py --corpus path/to/recorded/html
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+import Ai  # noqa: E402
+from corpus import build_corpus, load_corpus  # noqa: E402
+
+
+def reference_extract(body):
+    """The pre-backend scrape_url extraction, kept verbatim as the parity oracle"""
+    soup = BeautifulSoup(body, 'html.parser')
+    for script in soup(["script", "style"]):
+        script.decompose()
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = ' '.join(chunk for chunk in chunks if chunk)
+    title = soup.find('title')
+    title_text = title.get_text() if title else "No title found"
+    main_content = ""
+    for selector in ['article', 'main', '.content', '#content', '.post-content']:
+        content_elem = soup.select_one(selector)
+        if content_elem:
+            main_content = content_elem.get_text(strip=True)
+            break
+    if not main_content:
+        main_content = text
+    return {
+        'title': title_text,
+        'content': main_content[:Ai.MAX_CONTENT_LENGTH],
+        'full_text': text[:Ai.MAX_FULL_TEXT_LENGTH],
+    }
+
+
+def _current_rss_kb():
+    """Resident set size right now; falls back to the lifetime peak off Linux"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * resource.getpagesize() // 1024
+    except OSError:
+        # ru_maxrss is KiB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _run_backend(name, pages, repeat, queue):
+    """Child process: parse the corpus `repeat` times and report throughput and memory"""
+    backend = Ai.get_extraction_backend(name)
+    baseline_kb = _current_rss_kb()
+    peak_kb = baseline_kb
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, body in pages:
+            backend.extract(body)
+            peak_kb = max(peak_kb, _current_rss_kb())
+    elapsed = time.perf_counter() - start
+
+    # Separate pass: tracemalloc slows parsing down too much to time it alongside
+    tracemalloc.start()
+    for _, body in pages:
+        backend.extract(body)
+    _, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    queue.put({
+        'backend': name,
+        'pages_per_sec': len(pages) * repeat / elapsed,
+        'rss_growth_mb': (peak_kb - baseline_kb) / 1024,
+        'py_heap_peak_mb': heap_peak / (1024 * 1024),
+    })
+
+
+def _extract_streaming(backend, body, chunk_size=Ai.DOWNLOAD_CHUNK_SIZE):
+    """Run a page through the backend's incremental path the way the scraper feeds it"""
+    stream = backend.open_stream()
+    for start in range(0, len(body), chunk_size):
+        stream.feed(body[start:start + chunk_size])
+    return stream.close()
+
+
+def check_parity(pages):
+    """Compare every backend against the reference; BeautifulSoup must match exactly"""
+    expected = [reference_extract(body) for _, body in pages]
+    report = {}
+    for name in Ai.available_extraction_backends():
+        backend = Ai.get_extraction_backend(name)
+        for mode, extract in (('document', backend.extract),
+                              ('streaming', lambda body: _extract_streaming(backend, body))):
+            report[(name, mode)] = [
+                page_name for (page_name, body), reference in zip(pages, expected)
+                if extract(body) != reference
+            ]
+    return report
+
+
+def check_modes(pages):
+    """Pages where a backend's extract and its streaming path disagree"""
+    report = {}
+    for name in Ai.available_extraction_backends():
+        backend = Ai.get_extraction_backend(name)
+        report[name] = [page_name for page_name, body in pages
+                        if backend.extract(body) != _extract_streaming(backend, body)]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=60, help="Number of generated fixture pages")
+    parser.add_argument('--corpus', help="Directory of recorded .html pages to use instead")
+    parser.add_argument('--repeat', type=int, default=3, help="Passes over the corpus per backend")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus) if args.corpus else build_corpus(args.pages)
+    total_mb = sum(len(body) for _, body in pages) / (1024 * 1024)
+    print(f"Corpus: {len(pages)} pages, {total_mb:.1f} MB")
+
+    parity = check_parity(pages)
+    print("\nParity with the original scrape_url extraction:")
+    for (name, mode), mismatches in parity.items():
+        status = "identical" if not mismatches else f"{len(mismatches)} page(s) differ, e.g. {mismatches[:3]}"
+        print(f"  {name:<14} {mode:<10} {status}")
+
+    modes = check_modes(pages)
+    print("\nDocument vs streaming extraction:")
+    for name, mismatches in modes.items():
+        status = "identical" if not mismatches else f"{len(mismatches)} page(s) differ, e.g. {mismatches[:3]}"
+        print(f"  {name:<14} {status}")
+
+    print(f"\n{'backend':<14} {'pages/s':>10} {'RSS growth MB':>14} {'py heap peak MB':>16}")
+    ctx = multiprocessing.get_context('spawn')
+    for name in Ai.available_extraction_backends():
+        # A fresh process per backend keeps peak RSS attributable to that parser
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_run_backend, args=(name, pages, args.repeat, queue))
+        proc.start()
+        result = queue.get()
+        proc.join()
+        print(f"{result['backend']:<14} {result['pages_per_sec']:>10.1f} "
+              f"{result['rss_growth_mb']:>14.1f} {result['py_heap_peak_mb']:>16.1f}")
+
+    if parity.get(('beautifulsoup', 'document')):
+        sys.exit("beautifulsoup backend no longer matches the reference extraction")
+    if any(modes.values()):
+        sys.exit("a backend's extract and streaming paths disagree")
+
+
+if __name__ == '__main__':
+    main()
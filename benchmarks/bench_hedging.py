@@ -0,0 +1,97 @@
+"""Benchmark hedged LLM calls against occasional server stalls.
+
+--endpoints mock LLM servers form the endpoint pool, each generating one
+request at a time like a default LM Studio instance; --stall-share of
+requests on any of them stall for --stall-seconds before the first token. --calls streamed
+generate_response calls run one after another (as the debate graph makes
+them) with hedging off and on. The first --warmup calls of each run only
+teach the LatencyTracker the usual time to first token, and are left out of
+the percentiles. Time to first token is measured at the on_token callback, as
+the UI sees it. Stalls much more common than 1 - HEDGE_PERCENTILE of requests
+become part of the p95 themselves, and hedging stops catching them. With
+--endpoints 1 there is nowhere to send a duplicate, so nothing is hedged.
+
+    python benchmarks/bench_hedging.py --calls 200 --stall-share 0.03 --stall-seconds 2
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Ai  # noqa: E402
+from mock_llm_server import serve_mock_llm  # noqa: E402
+
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+
+def run(args, urls, hedge):
+    Ai.HEDGE_ENABLED = hedge
+    client = Ai.LMStudioClient(endpoints=[{'base_url': url, 'models': None} for url in urls])
+    ttfts = []
+    start = time.perf_counter()
+    try:
+        for i in range(args.warmup + args.calls):
+            call_started = time.perf_counter()
+            first = []
+
+            def on_token(text):
+                if text and not first:
+                    first.append(time.perf_counter() - call_started)
+
+            client.generate_response(Ai.QWEN_MODEL, [{'role': 'user', 'content': f"Argue point {i}."}],
+                                     max_tokens=args.completion_tokens, on_token=on_token, role='verifier')
+            if i >= args.warmup and first:
+                ttfts.append(first[0])
+    finally:
+        client.close()
+    elapsed = time.perf_counter() - start
+    hedges = client.latency.summary()
+    hedge_rate = hedges[0]['hedge_rate'] if hedges else 0.0
+    label = 'hedged' if hedge else 'unhedged'
+    print(f"{len(urls):>9} {label:>9} {len(ttfts):>6} {statistics.median(ttfts):>8.3f} {percentile(ttfts, 0.95):>8.3f} "
+          f"{percentile(ttfts, 0.99):>8.3f} {max(ttfts):>8.3f} {hedge_rate:>7.1%} {elapsed:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=Ai.HEDGE_MIN_SAMPLES)
+    parser.add_argument('--endpoints', type=int, nargs='+', default=[2], help="Mock servers in the pool")
+    parser.add_argument('--stall-share', type=float, default=0.03)
+    parser.add_argument('--stall-seconds', type=float, default=2.0)
+    parser.add_argument('--ttft', type=float, default=0.1)
+    parser.add_argument('--completion-tokens', type=int, default=60)
+    parser.add_argument('--tokens-per-second', type=float, default=2000.0)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # Streamlit warns about running without a script context
+    previous = os.getcwd()
+    print(f"{'endpoints':>9} {'mode':>9} {'calls':>6} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'max s':>8} {'hedged':>7} {'seconds':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for endpoints in args.endpoints:
+                with ExitStack() as servers:
+                    urls = [servers.enter_context(serve_mock_llm(0, args.ttft, args.tokens_per_second,
+                                                                 args.completion_tokens, max_concurrent=1,
+                                                                 stall_share=args.stall_share,
+                                                                 stall_seconds=args.stall_seconds))
+                            for _ in range(endpoints)]
+                    run(args, urls, hedge=False)
+                    run(args, urls, hedge=True)
+        finally:
+            os.chdir(previous)
+
+
+if __name__ == '__main__':
+    main()
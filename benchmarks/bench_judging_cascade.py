@@ -0,0 +1,112 @@
+"""Benchmark the judging cascade against always running the full Judge over a batch of claims.
+
+Serves the fixture corpus and the mock LLM, then verifies --claims debates one
+after another, once with every verdict from the Judge and scoring pass and once
+with the QuickScorer first. The mock draws each JSON verdict's confidence from
+--verdict-confidence, so --threshold decides how many claims escalate; set
+--prefill-tokens-per-second to make the Judge's long prompt cost what it does
+on a real server.
+
+Reported per mode: the escalation rate, verdicts and judging-time percentiles
+per path (judging time runs from the end of the debate to the verdict), the
+prompt tokens the judging calls sent, and wall time for the batch.
+
+    python benchmarks/bench_judging_cascade.py --claims 20 --threshold 0.85 --verdict-confidence 0.6 0.98
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Ai  # noqa: E402
+from corpus import build_corpus  # noqa: E402
+from fixture_server import serve_corpus  # noqa: E402
+from mock_llm_server import serve_mock_llm  # noqa: E402
+
+CLAIMS = [
+    "Inflation rates increased according to the federal survey",
+    "The climate report confirmed a decrease in emissions",
+    "Researchers published evidence that the vaccine study was flawed",
+    "The court ruling changed national trade tariffs",
+    "Unemployment data showed growth in the local economy",
+    "The minister announced an investigation into energy prices",
+]
+JUDGING_ROLES = ('judge', 'scoring', 'quick_scoring')
+
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(share * len(values)))] if values else float('nan')
+
+
+def run_batch(llm_url, debates, rounds, cascade, threshold):
+    """Verify every debate in a clean working directory; returns the judging records, calls and seconds"""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            system = Ai.LangGraphClaimVerificationSystem()
+            system.client = Ai.LMStudioClient(llm_url)
+            system.client.cache = None  # Every claim must reach the judging calls
+            system.scraper.engine.host_rate = 0  # Every fixture page lives on one host
+            system.cascade_threshold = threshold
+            start = time.perf_counter()
+            judging = [system.run_verification(claim, urls, rounds, use_evidence_store=False,
+                                               judging_cascade=cascade).get('judging_stats')
+                       for claim, urls in debates]
+            elapsed = time.perf_counter() - start
+        finally:
+            os.chdir(previous)
+    return judging, list(system.client.call_log), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--claims', type=int, default=20)
+    parser.add_argument('--rounds', type=int, default=1)
+    parser.add_argument('--urls', type=int, default=3, help="Fixture pages scraped per debate")
+    parser.add_argument('--threshold', type=float, default=0.85, help="Quick verdict confidence that skips the Judge")
+    parser.add_argument('--verdict-confidence', type=float, nargs=2, default=[0.6, 0.98], metavar=('LOW', 'HIGH'))
+    parser.add_argument('--ttft', type=float, default=0.1, help="Mock seconds before the first token")
+    parser.add_argument('--tokens-per-second', type=float, default=200.0, help="Mock generation rate per request")
+    parser.add_argument('--completion-tokens', type=int, default=120)
+    parser.add_argument('--prefill-tokens-per-second', type=float, default=2000.0)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # Streamlit warns about running without a script context
+    pages = build_corpus(args.claims * args.urls)
+    with serve_corpus(pages) as corpus_url, \
+            serve_mock_llm(0, args.ttft, args.tokens_per_second, args.completion_tokens,
+                           args.prefill_tokens_per_second, verdict_confidence=args.verdict_confidence) as llm_url:
+        debates = [(CLAIMS[i % len(CLAIMS)],
+                    [f"{corpus_url}/{name}" for name, _ in pages[i * args.urls:(i + 1) * args.urls]])
+                   for i in range(args.claims)]
+
+        print(f"{'mode':>8} {'claims':>7} {'escalated':>10} {'path':>10} {'verdicts':>9} {'p50 s':>7} {'p95 s':>7} "
+              f"{'judging prompt tok':>19} {'batch s':>8}")
+        for cascade in (False, True):
+            judging, calls, elapsed = run_batch(llm_url, debates, args.rounds, cascade, args.threshold)
+            seconds = defaultdict(list)
+            for record in judging:
+                if record:
+                    seconds[record['path']].append(record['seconds'])
+            quick, escalated = len(seconds.get('quick', [])), len(seconds.get('escalated', []))
+            escalated = f"{escalated / (quick + escalated):.0%}" if quick + escalated else '-'
+            prompt_tokens = sum(call['prompt_tokens'] or 0 for call in calls if call['role'] in JUDGING_ROLES)
+            mode = 'cascade' if cascade else 'full'
+            for index, (path, values) in enumerate(sorted(seconds.items())):
+                lead = (f"{mode:>8} {len(judging):>7} {escalated:>10}" if index == 0 else ' ' * 27)
+                tail = f" {prompt_tokens:>19,} {elapsed:>8.2f}" if index == 0 else ''
+                print(f"{lead} {path:>10} {len(values):>9} {statistics.median(values):>7.2f} "
+                      f"{percentile(values, 0.95):>7.2f}{tail}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark in-process parsing against the ParsePool over a local fixture corpus.
+
+Scrapes every page of the corpus through WebScraper.scrape_urls (concurrent
+fetch, politeness limits off, cache off) with parsing on the event loop and
+then with 2..N worker processes, and reports wall time and speed-up.
+
+    python benchmarks/bench_parse_pool.py --pages 60 --backend beautifulsoup
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Ai  # noqa: E402
+from corpus import build_corpus  # noqa: E402
+from fixture_server import serve_corpus  # noqa: E402
+
+
+def scrape_all(urls, backend, workers, repeat):
+    scraper = Ai.WebScraper(backend, parse_workers=workers)
+    # Politeness limits would dominate a single-host local benchmark
+    scraper.engine.host_rate = 0
+    scraper.engine.host_burst = scraper.engine.max_concurrency
+
+    results = None
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = Ai.run_coroutine_sync(scraper.scrape_urls_async(urls))
+        timings.append(time.perf_counter() - start)
+    return results, min(timings), bool(scraper.parse_pool)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=60)
+    parser.add_argument('--backend', default='beautifulsoup', choices=sorted(Ai.EXTRACTION_BACKENDS))
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per configuration; the best is reported")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    Ai.SCRAPE_CACHE_ENABLED = False
+    pages = build_corpus(args.pages)
+    print(f"{len(pages)} pages, {sum(len(b) for _, b in pages) / 2**20:.1f} MB, "
+          f"backend={args.backend}, {os.cpu_count()} CPU(s)")
+
+    worker_counts = [1] + [n for n in (2, 4, 8, 16) if n < args.max_workers] + [args.max_workers]
+    worker_counts = sorted(set(n for n in worker_counts if n >= 1))
+
+    with serve_corpus(pages) as base_url:
+        urls = [f"{base_url}/{name}" for name, _ in pages]
+        baseline = None
+        reference = None
+        print(f"\n{'workers':>8} {'mode':>10} {'seconds':>9} {'pages/s':>9} {'speed-up':>9}")
+        for workers in worker_counts:
+            results, elapsed, pooled = scrape_all(urls, args.backend, workers, args.repeat)
+            extracted = [(r['url'], r['title'], r['content'], r['full_text']) for r in results]
+            if reference is None:
+                reference = extracted
+            elif extracted != reference:
+                sys.exit(f"{workers} workers returned different results or order than in-process parsing")
+            baseline = baseline or elapsed
+            mode = 'pool' if pooled else 'in-loop'
+            print(f"{workers:>8} {mode:>10} {elapsed:>9.2f} {len(urls) / elapsed:>9.1f} {baseline / elapsed:>8.2f}x")
+
+    failed = [r['url'] for r in results if r['status'] != 'success']
+    if failed:
+        print(f"\nWarning: {len(failed)} page(s) failed, e.g. {failed[:3]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark full verifications end to end over a grid of debate rounds and source counts.
+
+Serves the fixture corpus and the mock OpenAI-compatible LLM locally, then
+runs run_verification (or arun_verification with --async) headlessly for
+every --rounds x --sources cell. Outside `streamlit run` the st.* calls in
+the graph nodes are no-ops, so nothing needs a browser. Each cell runs in a
+fresh child process, so its peak RSS is its own and no scrape cache, LLM
+cache or connection pool carries over from the cell before.
+
+Reported per cell: wall time, the graph's node_timings summed per node,
+LLM calls made, and the child's peak resident set size. Use the mock's
+latency, rate and failure knobs to model a particular LM Studio setup.
+--openings parallel runs the round-1 statements as concurrent branches;
+their node time is counted with the debater they belong to, so the saving
+shows as wall time below the sum of the node columns. --judging fused
+writes the analysis and verdict in one schema-constrained call, one call
+fewer per debate; add --no-structured-output to time its fallback.
+
+    python benchmarks/bench_pipeline.py --rounds 1 2 3 4 5 --sources 2 5 10 --ttft 0.2 --tokens-per-second 60
+    python benchmarks/bench_pipeline.py --rounds 1 3 --sources 5 --openings sequential parallel
+    python benchmarks/bench_pipeline.py --rounds 2 --sources 5 --judging two_pass fused
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Ai  # noqa: E402
+from corpus import build_corpus  # noqa: E402
+from fixture_server import serve_corpus  # noqa: E402
+from mock_llm_server import serve_mock_llm  # noqa: E402
+
+CLAIM = "Federal survey data show inflation rates increased while unemployment decreased"
+NODES = (('scrape_evidence', 'scrape'), ('verifier_turn', 'verifier'),
+         ('counter_explainer_turn', 'counter'), ('judge_decision', 'judge'))
+OPENING_NODES = {'opening_verifier': 'verifier_turn', 'opening_counter_explainer': 'counter_explainer_turn'}
+
+
+def run_cell(llm_url, urls, rounds, asynchronous, parallel_openings, fused_judgment):
+    """One verification in a clean working directory; runs in its own process"""
+    logging.disable(logging.WARNING)  # Streamlit warns about running without a script context
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        system = Ai.LangGraphClaimVerificationSystem()
+        system.client = Ai.LMStudioClient(llm_url)
+        system.scraper.engine.host_rate = 0  # Every fixture page lives on one host
+        start = time.perf_counter()
+        if asynchronous:
+            results = asyncio.run(system.arun_verification(CLAIM, urls, rounds, use_evidence_store=False,
+                                                           parallel_openings=parallel_openings,
+                                                           fused_judgment=fused_judgment))
+        else:
+            results = system.run_verification(CLAIM, urls, rounds, use_evidence_store=False,
+                                              parallel_openings=parallel_openings, fused_judgment=fused_judgment)
+        elapsed = time.perf_counter() - start
+    node_seconds = defaultdict(float)
+    for timing in results.get('node_timings', []):
+        node_seconds[OPENING_NODES.get(timing['node'], timing['node'])] += timing['seconds']
+    return {
+        'seconds': elapsed,
+        'success': results.get('success', False) and not results.get('error'),
+        'calls': len(results.get('llm_calls', [])),
+        'nodes': dict(node_seconds),
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux reports KiB
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, nargs='+', default=[1, 2, 3, 4, 5])
+    parser.add_argument('--sources', type=int, nargs='+', default=[2, 5, 10], help="Fixture pages scraped per debate")
+    parser.add_argument('--async', dest='asynchronous', action='store_true', help="Use arun_verification")
+    parser.add_argument('--openings', nargs='+', choices=['sequential', 'parallel'], default=['sequential'],
+                        help="How round 1 runs; several values add a grid axis")
+    parser.add_argument('--judging', nargs='+', choices=['two_pass', 'fused'], default=['two_pass'],
+                        help="Judge then score, or both in one structured call; several values add a grid axis")
+    parser.add_argument('--no-structured-output', dest='structured_output', action='store_false',
+                        help="Have the mock reject json_schema response formats")
+    parser.add_argument('--ttft', type=float, default=0.2, help="Mock seconds before the first token")
+    parser.add_argument('--tokens-per-second', type=float, default=60.0, help="Mock generation rate per request")
+    parser.add_argument('--completion-tokens', type=int, default=120)
+    parser.add_argument('--prefill-tokens-per-second', type=float, default=0.0)
+    parser.add_argument('--error-share', type=float, default=0.0, help="Share of LLM requests answered with a 500")
+    parser.add_argument('--page-latency', type=float, default=0.0, help="Seconds the fixture server waits per page")
+    parser.add_argument('--page-error-share', type=float, default=0.0, help="Share of page requests answered with a 503")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # Ai configures INFO logging, which would print every mock request
+    pages = build_corpus(max(args.sources))
+    # Spawned children start from a clean interpreter, so peak RSS is per cell
+    context = multiprocessing.get_context('spawn')
+    with serve_corpus(pages, latency=args.page_latency, error_share=args.page_error_share) as corpus_url, \
+            serve_mock_llm(0, args.ttft, args.tokens_per_second, args.completion_tokens,
+                           args.prefill_tokens_per_second, error_share=args.error_share,
+                           structured_output=args.structured_output) as llm_url:
+        print(f"{'openings':>10} {'judging':>8} {'rounds':>6} {'sources':>8} {'ok':>3} {'seconds':>8} {'calls':>6} "
+              + ' '.join(f"{label + ' s':>10}" for _, label in NODES) + f" {'peak RSS MB':>12}")
+        for sources in args.sources:
+            urls = [f"{corpus_url}/{name}" for name, _ in pages[:sources]]
+            for rounds in args.rounds:
+                for openings in args.openings:
+                    for judging in args.judging:
+                        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                            cell = executor.submit(run_cell, llm_url, urls, rounds, args.asynchronous,
+                                                   openings == 'parallel', judging == 'fused').result()
+                        print(f"{openings:>10} {judging:>8} {rounds:>6} {sources:>8} "
+                              f"{'yes' if cell['success'] else 'no':>3} {cell['seconds']:>8.2f} {cell['calls']:>6} "
+                              + ' '.join(f"{cell['nodes'].get(node, 0.0):>10.2f}" for node, _ in NODES)
+                              + f" {cell['peak_rss_mb']:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark how much prompt evaluation each PROMPT_LAYOUT lets the server skip.
+
+Builds an EvidencePack from the fixture corpus, then plays a --rounds debate
+(Verifier then Counter-Explainer each round) against the mock LLM server's
+llama.cpp-style prompt cache, once per layout and slot count. Prefill time
+and reused tokens come from the 'timings' the server returns with every
+call, exactly as they would from a llama.cpp-based LM Studio runtime.
+
+With one slot the two debaters take turns evicting each other's prompt, so
+only a shared prefix survives; with a slot per debater (LM Studio's
+parallel setting >= 2) the stable layout reuses each role's whole prefix.
+The 'task kept' column counts calls whose round instructions survived
+LMStudioClient's per-message truncation: a cheap prompt that lost them is
+not a saving.
+
+    python benchmarks/bench_prompt_layout.py --rounds 5 --sources 8 --slots 1 2 --prefill-tokens-per-second 2000
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Ai  # noqa: E402
+from corpus import build_corpus  # noqa: E402
+from mock_llm_server import serve_mock_llm  # noqa: E402
+
+CLAIM = "Federal survey data show inflation rates increased while unemployment decreased"
+
+
+def extract_sources(count):
+    backend = Ai.get_extraction_backend('beautifulsoup')
+    return [{'url': f"http://fixture.local/{name}", 'status': 'success', **backend.extract(body)}
+            for name, body in build_corpus(count)]
+
+
+def play_debate(system, sources, rounds):
+    """Alternate the two debaters over one EvidencePack for the given rounds; returns the calls they made"""
+    pack = system.build_evidence_pack(CLAIM, sources)
+    passage_index = system.passage_index(sources)
+    verifier = Ai.VerifierAgent(Ai.AgentRole.VERIFIER, Ai.QWEN_MODEL, system.client, passage_index)
+    counter = Ai.CounterExplainerAgent(Ai.AgentRole.COUNTER_EXPLAINER, Ai.QWEN_MODEL, system.client, passage_index)
+    verifier_arguments, counter_arguments = [], []
+    calls_before = len(system.client.call_log)
+    tasks_kept = 0
+    for round_num in range(1, rounds + 1):
+        for agent, own, opponent in ((verifier, verifier_arguments, counter_arguments),
+                                     (counter, counter_arguments, verifier_arguments)):
+            sent = system.client._prepare_messages(agent._build_messages(CLAIM, pack, opponent, round_num),
+                                                   agent.model, agent.max_tokens)
+            tasks_kept += any(f"TASK FOR ROUND {round_num}" in message['content'] for message in sent)
+            own.append(agent.generate_argument(CLAIM, pack, opponent, round_num, on_token=lambda text: None))
+    return system.client.call_log[calls_before:], tasks_kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--sources', type=int, default=8)
+    parser.add_argument('--slots', type=int, nargs='+', default=[1, 2], help="Prompt cache slots per model")
+    parser.add_argument('--prefill-tokens-per-second', type=float, default=2000.0)
+    parser.add_argument('--tokens-per-second', type=float, default=500.0)
+    parser.add_argument('--completion-tokens', type=int, default=200)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # Streamlit warns about running without a script context
+    sources = extract_sources(args.sources)
+    previous = os.getcwd()
+    print(f"{'layout':>14} {'slots':>6} {'calls':>6} {'task kept':>10} {'prompt tok':>11} {'reused':>8} "
+          f"{'prefill s':>10} {'mean ttft s':>12}   prefill ms per call")
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for slots in args.slots:
+                for layout in ('interleaved', 'stable_prefix'):
+                    Ai.PROMPT_LAYOUT = layout
+                    with serve_mock_llm(0, 0.0, args.tokens_per_second, args.completion_tokens,
+                                        args.prefill_tokens_per_second, slots) as llm_url:
+                        system = Ai.LangGraphClaimVerificationSystem()
+                        system.client = Ai.LMStudioClient(llm_url)
+                        calls, tasks_kept = play_debate(system, sources, args.rounds)
+
+                    prompt_tokens = sum(call['prompt_tokens'] for call in calls)
+                    reused = sum(call['cached_prompt_tokens'] for call in calls)
+                    prefill_ms = [call['prompt_ms'] for call in calls]
+                    print(f"{layout:>14} {slots:>6} {len(calls):>6} {tasks_kept:>10} {prompt_tokens:>11,} "
+                          f"{reused / prompt_tokens:>8.0%} "
+                          f"{sum(prefill_ms) / 1000:>10.2f} {statistics.mean(call['ttft_s'] for call in calls):>12.3f}   "
+                          + ' '.join(f"{ms:.0f}" for ms in prefill_ms))
+        finally:
+            os.chdir(previous)
+
+
+if __name__ == '__main__':
+    main()
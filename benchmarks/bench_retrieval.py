@@ -0,0 +1,83 @@
+"""Benchmark the BM25 passage index that fills the agents' evidence budgets.
+
+Extracts the fixture corpus once, then for each source count builds a
+PassageIndex (best of --repeat) and times --queries claim queries plus the
+per-role select() calls an agent makes, with and without an opponent argument.
+
+    python benchmarks/bench_retrieval.py --sources 20 40 80 --queries 200
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Ai  # noqa: E402
+from corpus import WORDS, build_corpus  # noqa: E402
+
+
+def extract_sources(count):
+    backend = Ai.get_extraction_backend('beautifulsoup')
+    sources = []
+    for name, body in build_corpus(count):
+        sources.append({'url': f"http://fixture.local/{name}", 'status': 'success', **backend.extract(body)})
+    return sources
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sources', type=int, nargs='+', default=[20, 40, 80])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5, help="Index builds per size; the best is reported")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    claims = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))) for _ in range(args.queries)]
+    arguments = [' '.join(rng.choice(WORDS) for _ in range(400)) for _ in range(args.queries)]
+    budgets = {
+        'verifier': Ai.VERIFIER_EVIDENCE_WINDOW,
+        'counter': Ai.COUNTER_EXPLAINER_EVIDENCE_WINDOW,
+        'judge': Ai.JUDGE_EVIDENCE_WINDOW,
+    }
+    all_sources = extract_sources(max(args.sources))
+
+    print(f"{'sources':>8} {'passages':>9} {'terms':>6} {'build ms':>9} {'query p50':>10} {'query p95':>10} "
+          + ' '.join(f"{role + ' ms':>12}" for role in budgets))
+    for count in args.sources:
+        sources = all_sources[:count]
+        builds = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            index = Ai.PassageIndex(sources)
+            builds.append((time.perf_counter() - start) * 1000)
+
+        for claim in claims:
+            index.score(index.build_query(claim))
+        query_ms = list(index.query_ms)
+
+        select_ms = {}
+        for role, (max_sources, max_chars) in budgets.items():
+            timings = []
+            for claim, argument in zip(claims, arguments):
+                opponent = argument if role != 'judge' else None
+                start = time.perf_counter()
+                index.select(claim, max_sources * max_chars, opponent)
+                timings.append((time.perf_counter() - start) * 1000)
+            select_ms[role] = statistics.median(timings)
+
+        print(f"{count:>8} {len(index.passages):>9} {len(index.vocabulary):>6} {min(builds):>9.2f} "
+              f"{percentile(query_ms, 0.5):>10.3f} {percentile(query_ms, 0.95):>10.3f} "
+              + ' '.join(f"{select_ms[role]:>12.3f}" for role in budgets))
+
+
+if __name__ == '__main__':
+    main()
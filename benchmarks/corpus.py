@@ -0,0 +1,112 @@
+"""Deterministic fixture corpus of news-style HTML pages for the scraper benchmarks.
+
+Pages mimic what the scraper sees in practice: navigation chrome, inline
+scripts and styles, comments (between elements and in the middle of a run of
+text, both directly inside the main-content container and inside a
+paragraph), an article body of varying length and the different
+main-content containers that WebScraper looks for.
+"""
+
+import os
+import random
+from typing import List, Tuple
+
+WORDS = (
+    "government report study evidence climate vaccine economy market growth policy "
+    "scientists researchers data analysis percent increase decrease official statement "
+    "according sources confirmed announced election court ruling investigation health "
+    "energy emissions inflation unemployment survey results published journal university "
+    "minister agency federal local national international trade tariffs prices rates"
+).split()
+
+CONTAINERS = [
+    ('<article class="story">', '</article>'),
+    ('<main>', '</main>'),
+    ('<div class="post content">', '</div>'),
+    ('<div id="content">', '</div>'),
+    ('<section class="post-content">', '</section>'),
+    ('<div class="body">', '</div>'),  # No recognised container: full text is used
+]
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 22))]
+    words[0] = words[0].capitalize()
+    return ' '.join(words) + '.'
+
+
+def _paragraph(rng: random.Random, comment: bool = False) -> str:
+    sentences = [_sentence(rng) for _ in range(rng.randint(3, 8))]
+    if comment:
+        # CMS edit markers land mid-sentence; the text on both sides belongs to the same run
+        words = sentences[0].split(' ')
+        middle = len(words) // 2
+        sentences[0] = ' '.join(words[:middle]) + ' <!-- edited -->' + ' '.join(words[middle:])
+    return ' '.join(sentences)
+
+
+def build_page(index: int, paragraphs: int) -> str:
+    """Build one HTML page; the same index always produces the same bytes"""
+    rng = random.Random(index)
+    opener, closer = CONTAINERS[index % len(CONTAINERS)]
+    title = ' '.join(rng.choice(WORDS) for _ in range(6)).title()
+
+    nav = ''.join(f'<li><a href="/section/{i}">{rng.choice(WORDS).title()}</a></li>' for i in range(12))
+    body = '\n'.join(
+        f'  <p>{_paragraph(rng, comment=i % 3 == 1)}</p>' + ('\n  <!-- ad slot -->\n  <script>window.ads.push({});</script>' if i % 5 == 4 else '')
+        for i in range(paragraphs)
+    )
+    related = ''.join(f'<li>{_sentence(rng)}</li>' for _ in range(8))
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>{title}</title>
+  <style>body {{ font-family: sans-serif; }} .nav li {{ display: inline; }}</style>
+  <script>var analytics = {{"page": {index}, "tags": ["news", "world"]}};</script>
+</head>
+<body>
+  <header><nav class="nav"><ul>{nav}</ul></nav></header>
+  {opener}
+  <h1>{title}</h1>
+  Updated<!-- timestamp --> {rng.randint(1, 28)} March, {rng.randint(1, 12)}<!-- tz -->am
+  <p class="byline">By   Staff   Reporter</p>
+{body}
+  {closer}
+  <aside><h2>Related</h2><ul>{related}</ul></aside>
+  <footer>Copyright {2000 + index % 25}. All rights reserved.</footer>
+  <script src="/static/app.js"></script>
+</body>
+</html>
+"""
+
+
+def build_corpus(count: int = 60) -> List[Tuple[str, bytes]]:
+    """Return (name, html bytes) pairs ranging from short briefs to long features"""
+    sizes = [4, 12, 30, 80, 200]
+    return [
+        (f"page_{i:03d}.html", build_page(i, sizes[i % len(sizes)]).encode('utf-8'))
+        for i in range(count)
+    ]
+
+
+def load_corpus(directory: str) -> List[Tuple[str, bytes]]:
+    """Load a recorded corpus of .html files from disk"""
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(('.html', '.htm')):
+            with open(os.path.join(directory, name), 'rb') as f:
+                pages.append((name, f.read()))
+    return pages
+
+
+def write_corpus(directory: str, count: int = 60) -> List[str]:
+    """Write the generated corpus to disk so it can be served or inspected"""
+    os.makedirs(directory, exist_ok=True)
+    names = []
+    for name, body in build_corpus(count):
+        with open(os.path.join(directory, name), 'wb') as f:
+            f.write(body)
+        names.append(name)
+    return names
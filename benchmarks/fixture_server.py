@@ -0,0 +1,81 @@
+"""Local HTTP server that serves a fixture HTML corpus to the scraper.
+
+--latency delays every response the way a remote site does, and
+--error-share of requests get a 503 so the scraper's retries are exercised.
+
+    python benchmarks/fixture_server.py --port 8765 --pages 60 --latency 0.1
+"""
+
+import argparse
+import http.server
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+from corpus import build_corpus, load_corpus
+
+
+def make_handler(pages: Dict[str, bytes], latency: float = 0.0, error_share: float = 0.0):
+    class FixtureHandler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # Keep-alive, like real news sites
+
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+            if random.random() < error_share:
+                self.send_error(503)
+                return
+            body = pages.get(self.path.lstrip('/'))
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # The scraper stops reading once its byte budget is spent
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    return FixtureHandler
+
+
+@contextmanager
+def serve_corpus(pages: List[Tuple[str, bytes]], port: int = 0, latency: float = 0.0,
+                 error_share: float = 0.0) -> Iterator[str]:
+    """Serve pages on localhost for the duration of the block; yields the base URL"""
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', port), make_handler(dict(pages), latency, error_share))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--pages', type=int, default=60, help="Number of generated fixture pages")
+    parser.add_argument('--corpus', help="Directory of recorded .html pages to serve instead")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds before every response")
+    parser.add_argument('--error-share', type=float, default=0.0, help="Share of requests answered with a 503")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus) if args.corpus else build_corpus(args.pages)
+    with serve_corpus(pages, args.port, args.latency, args.error_share) as base_url:
+        print(f"Serving {len(pages)} pages at {base_url}/<name>, e.g. {base_url}/{pages[0][0]}")
+        threading.Event().wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,309 @@
+"""Local OpenAI-compatible chat server that stands in for LM Studio in benchmarks.
+
+Answers /v1/chat/completions with filler text seeded by the prompt, streamed as
+server-sent events or returned whole, after a configurable time to first
+token and at a configurable generation rate. Requests whose prompt asks for
+JSON get a fixed verdict so the scoring step parses, and requests with a
+json_schema response_format get an object that fits the schema, filler in
+its strings, the way LM Studio's grammar-constrained sampling answers
+(--no-structured-output rejects them like a runtime without that support
+instead). With --verdict-confidence LOW HIGH the JSON verdicts pick TRUE or
+FALSE with a confidence in that range, seeded by the prompt, so a judging
+cascade sees both clear-cut and uncertain debates. Every request is served
+concurrently, so the numbers reflect the client's concurrency rather than the
+server's.
+
+Prompt caching is simulated the way llama.cpp (and so LM Studio) does it:
+each of --slots slots per model remembers its last prompt plus answer, a
+request takes the slot sharing the longest prefix with it, and only the
+tokens after that prefix are evaluated at --prefill-tokens-per-second.
+Responses carry llama.cpp-style 'timings' (prompt_n, cache_n, prompt_ms).
+
+With --degenerate-share that fraction of answers falls into a repetition loop
+after a fifth of their tokens, the way small models do. Which answers loop is
+seeded by the prompt and the sampling parameters, so a retry with different
+sampling gets a fresh draw. Requests whose client disconnects mid-stream stop
+generating, as LM Studio does.
+
+--max-concurrent caps the requests generated at once, queueing the rest the
+way one LM Studio instance does, and --models sets what /v1/models lists,
+so several mocks on different ports can stand in for an endpoint pool.
+--stall-share of requests (drawn per request, like a server hiccup) wait an
+extra --stall-seconds before their first token, and --error-share of them
+fail with an HTTP 500 the way an overloaded or crashed runtime answers.
+
+    python benchmarks/mock_llm_server.py --port 1234 --ttft 0.2 --tokens-per-second 60 --prefill-tokens-per-second 2000
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from aiohttp import web
+
+CHARS_PER_TOKEN = 4  # Same estimate the app uses
+SLOT_PROMPT_SIMILARITY = 0.5  # llama.cpp's default: below this shared share of the prompt, the least recently used slot is taken
+
+LOOP = "the claim is supported by the evidence and ".split()  # What a degenerate answer repeats until max_tokens
+SAMPLING_PARAMS = ('temperature', 'top_p', 'frequency_penalty', 'presence_penalty')
+
+WORDS = ("the evidence suggests that the claim is supported by several independent sources while "
+         "other reports describe a more limited effect and note uncertainty in the underlying data").split()
+
+VERDICT = {
+    "verdict": "PARTIALLY_TRUE",
+    "confidence": 0.7,
+    "reasoning": "The judge found support for part of the claim.",
+    "key_evidence": ["Several sources support the claim"],
+    "verifier_score": 7,
+    "opposer_score": 6,
+    "evidence_quality": "MODERATE",
+    "winning_side": "verifier"
+}
+
+
+def structured_schema(body: Dict) -> Optional[Dict]:
+    """The JSON schema a request's response_format asks for, if any"""
+    response_format = body.get('response_format') or {}
+    if response_format.get('type') != 'json_schema':
+        return None
+    return response_format.get('json_schema', {}).get('schema', {})
+
+
+def fill_schema(schema: Dict, rng: random.Random, count: int):
+    """A value matching the schema; its strings share about count words of filler"""
+    kind = schema.get('type')
+    if 'enum' in schema:
+        return next((value for value in VERDICT.values() if value in schema['enum']), schema['enum'][0])
+    if kind == 'object':
+        properties = schema.get('properties', {})
+        strings = sum(1 for child in properties.values() if child.get('type') == 'string' and 'enum' not in child)
+        share = max(8, count // max(1, strings))
+        return {name: fill_schema(child, rng, share) for name, child in properties.items()}
+    if kind == 'array':
+        return [fill_schema(schema.get('items', {}), rng, 8) for _ in range(max(1, schema.get('minItems', 1)))]
+    if kind in ('number', 'integer'):
+        return schema.get('maximum', 1) * VERDICT['confidence']
+    if kind == 'boolean':
+        return True
+    return ' '.join(rng.choices(WORDS, k=count))
+
+
+def render_prompt(messages: List[Dict[str, str]]) -> str:
+    """Flatten chat messages the way a chat template would, so prefixes compare like token sequences"""
+    return ''.join(f"<|{message['role']}|>\n{message.get('content', '')}<|end|>\n" for message in messages)
+
+
+class PromptCache:
+    """Per-model slots holding the text last evaluated in them, as llama.cpp's server keeps its KV cache"""
+
+    def __init__(self, slots: int):
+        self.slots = max(1, slots)
+        self.models: Dict[str, List[List]] = {}  # model -> [[text, last_used], ...]
+
+    def acquire(self, model: str, prompt: str):
+        """Pick the slot sharing the longest prefix with the prompt (else the least recently used) and
+        return it with the number of prompt characters that need no evaluation"""
+        slots = self.models.setdefault(model, [['', 0.0] for _ in range(self.slots)])
+        best = max(slots, key=lambda slot: (len(os.path.commonprefix([slot[0], prompt])), -slot[1]))
+        if len(os.path.commonprefix([best[0], prompt])) < SLOT_PROMPT_SIMILARITY * len(prompt):
+            best = min(slots, key=lambda slot: slot[1])
+        return best, len(os.path.commonprefix([best[0], prompt]))
+
+    @staticmethod
+    def release(slot: List, text: str):
+        slot[0], slot[1] = text, time.monotonic()
+
+
+def make_app(ttft: float, tokens_per_second: float, completion_tokens: int,
+             prefill_tokens_per_second: float = 0.0, slots: int = 1, degenerate_share: float = 0.0,
+             max_concurrent: int = 0, models: Sequence[str] = ('mock',), stall_share: float = 0.0,
+             stall_seconds: float = 0.0, error_share: float = 0.0, structured_output: bool = True,
+             verdict_confidence: Optional[Sequence[float]] = None) -> web.Application:
+    stats = {'requests': 0, 'in_flight': 0, 'peak_in_flight': 0, 'prompt_tokens': 0, 'cached_prompt_tokens': 0,
+             'degenerate': 0, 'generated_tokens': 0, 'disconnects': 0, 'stalls': 0, 'errors': 0}
+    prompt_cache = PromptCache(slots)
+    gate = asyncio.Semaphore(max_concurrent) if max_concurrent > 0 else None
+
+    def answer_tokens(body):
+        prompt = body['messages'][-1]['content'] if body.get('messages') else ''
+        schema = structured_schema(body)
+        # Different prompts get different answers, so later rounds quote text the server has not seen
+        seed = render_prompt(body.get('messages', [])) + json.dumps([body.get(name) for name in SAMPLING_PARAMS])
+        rng = random.Random(hashlib.sha256(seed.encode('utf-8')).digest())
+        if 'JSON' in prompt and schema is None:
+            if verdict_confidence is None:
+                return [json.dumps(VERDICT)]
+            return [json.dumps({**VERDICT, 'verdict': rng.choice(('TRUE', 'FALSE')),
+                                'confidence': round(rng.uniform(*verdict_confidence), 2)})]
+        count = min(completion_tokens, body.get('max_tokens') or completion_tokens)
+        if schema is not None:
+            # The grammar keeps every answer valid, so structured answers never degenerate here
+            return re.findall(r'\S+\s*', json.dumps(fill_schema(schema, rng, count)))
+        words = rng.choices(WORDS, k=count)
+        if rng.random() < degenerate_share:
+            stats['degenerate'] += 1
+            healthy = count // 5
+            words = words[:healthy] + [LOOP[i % len(LOOP)] for i in range(count - healthy)]
+        return [word + ' ' for word in words]
+
+    def chunk(body, delta, finish_reason=None):
+        return {
+            'id': 'chatcmpl-mock', 'object': 'chat.completion.chunk', 'created': int(time.time()),
+            'model': body.get('model', 'mock'),
+            'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]
+        }
+
+    async def chat_completions(request):
+        body = await request.json()
+        if gate is not None:
+            await gate.acquire()
+        stats['requests'] += 1
+        stats['in_flight'] += 1
+        stats['peak_in_flight'] = max(stats['peak_in_flight'], stats['in_flight'])
+        try:
+            if random.random() < error_share:
+                stats['errors'] += 1
+                return web.json_response({'error': {'message': 'Mock server error', 'type': 'server_error'}}, status=500)
+            if not structured_output and structured_schema(body) is not None:
+                return web.json_response({'error': {'message': "'response_format.type' must be 'json_object' or 'text'",
+                                                    'type': 'invalid_request_error'}}, status=400)
+            tokens = answer_tokens(body)
+            interval = 1 / tokens_per_second if tokens_per_second > 0 else 0
+
+            prompt = render_prompt(body.get('messages', []))
+            slot, reused_chars = prompt_cache.acquire(body.get('model', 'mock'), prompt)
+            prompt_tokens = max(1, len(prompt) // CHARS_PER_TOKEN)
+            cached_tokens = min(prompt_tokens - 1, reused_chars // CHARS_PER_TOKEN)  # The last token is always evaluated
+            evaluated = prompt_tokens - cached_tokens
+            prompt_ms = evaluated / prefill_tokens_per_second * 1000 if prefill_tokens_per_second > 0 else 0.0
+            stats['prompt_tokens'] += prompt_tokens
+            stats['cached_prompt_tokens'] += cached_tokens
+            stall = stall_seconds if random.random() < stall_share else 0.0
+            stats['stalls'] += stall > 0
+            await asyncio.sleep(ttft + prompt_ms / 1000 + stall)
+            prompt_cache.release(slot, prompt + ''.join(tokens))
+
+            timings = {'prompt_n': evaluated, 'cache_n': cached_tokens, 'prompt_ms': prompt_ms,
+                       'predicted_n': len(tokens), 'predicted_ms': interval * 1000 * len(tokens)}
+            usage = {'prompt_tokens': prompt_tokens, 'completion_tokens': len(tokens),
+                     'total_tokens': prompt_tokens + len(tokens),
+                     'prompt_tokens_details': {'cached_tokens': cached_tokens}}
+
+            if not body.get('stream'):
+                await asyncio.sleep(interval * (len(tokens) - 1))
+                stats['generated_tokens'] += len(tokens)
+                return web.json_response({
+                    'id': 'chatcmpl-mock', 'object': 'chat.completion', 'created': int(time.time()),
+                    'model': body.get('model', 'mock'),
+                    'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': ''.join(tokens)},
+                                 'finish_reason': 'stop'}],
+                    'usage': usage,
+                    'timings': timings
+                })
+
+            response = web.StreamResponse(headers={'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache'})
+            try:
+                await response.prepare(request)
+            except ConnectionError:
+                stats['disconnects'] += 1  # A hedged duplicate that lost the race before its first token
+                return response
+            for position, token in enumerate(tokens):
+                if position:
+                    await asyncio.sleep(interval)
+                try:
+                    await response.write(f"data: {json.dumps(chunk(body, {'content': token}))}\n\n".encode())
+                except ConnectionError:
+                    stats['disconnects'] += 1
+                    return response
+                stats['generated_tokens'] += 1
+            final = {**chunk(body, {}, 'stop'), 'usage': usage, 'timings': timings}
+            await response.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode())
+            await response.write_eof()
+            return response
+        finally:
+            stats['in_flight'] -= 1
+            if gate is not None:
+                gate.release()
+
+    async def list_models(request):
+        return web.json_response({'object': 'list', 'data': [{'id': model, 'object': 'model'} for model in models]})
+
+    async def stats_view(request):
+        return web.json_response(stats)
+
+    app = web.Application()
+    app['stats'] = stats
+    app.router.add_post('/v1/chat/completions', chat_completions)
+    app.router.add_get('/v1/models', list_models)
+    app.router.add_get('/stats', stats_view)
+    return app
+
+
+@contextmanager
+def serve_mock_llm(port: int = 0, ttft: float = 0.2, tokens_per_second: float = 60.0,
+                   completion_tokens: int = 120, prefill_tokens_per_second: float = 0.0,
+                   slots: int = 1, degenerate_share: float = 0.0, max_concurrent: int = 0,
+                   models: Sequence[str] = ('mock',), stall_share: float = 0.0,
+                   stall_seconds: float = 0.0, error_share: float = 0.0,
+                   structured_output: bool = True, verdict_confidence: Optional[Sequence[float]] = None) -> Iterator[str]:
+    """Run the mock on a background event loop for the duration of the block; yields the /v1 base URL"""
+    app = make_app(ttft, tokens_per_second, completion_tokens, prefill_tokens_per_second, slots, degenerate_share,
+                   max_concurrent, models, stall_share, stall_seconds, error_share, structured_output,
+                   verdict_confidence)
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, '127.0.0.1', port)
+    loop.run_until_complete(site.start())
+    bound_port = site._server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{bound_port}/v1"
+    finally:
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=1234)
+    parser.add_argument('--ttft', type=float, default=0.2, help="Seconds before the first token")
+    parser.add_argument('--tokens-per-second', type=float, default=60.0)
+    parser.add_argument('--completion-tokens', type=int, default=120, help="Tokens per answer, capped by max_tokens")
+    parser.add_argument('--prefill-tokens-per-second', type=float, default=0.0,
+                        help="Prompt evaluation rate for tokens not in the prompt cache; 0 makes prefill free")
+    parser.add_argument('--slots', type=int, default=1, help="Prompt cache slots per model, like LM Studio's parallel setting")
+    parser.add_argument('--degenerate-share', type=float, default=0.0, help="Share of answers that fall into a repetition loop")
+    parser.add_argument('--max-concurrent', type=int, default=0, help="Requests generated at once; 0 serves all concurrently")
+    parser.add_argument('--models', nargs='+', default=['mock'], help="Model ids listed by /v1/models")
+    parser.add_argument('--stall-share', type=float, default=0.0, help="Share of requests that stall before the first token")
+    parser.add_argument('--stall-seconds', type=float, default=5.0)
+    parser.add_argument('--error-share', type=float, default=0.0, help="Share of requests answered with an HTTP 500")
+    parser.add_argument('--no-structured-output', dest='structured_output', action='store_false',
+                        help="Reject json_schema response formats with a 400")
+    parser.add_argument('--verdict-confidence', type=float, nargs=2, metavar=('LOW', 'HIGH'),
+                        help="Draw JSON verdicts' confidence from this range instead of the fixed verdict's")
+    args = parser.parse_args()
+
+    with serve_mock_llm(args.port, args.ttft, args.tokens_per_second, args.completion_tokens,
+                        args.prefill_tokens_per_second, args.slots, args.degenerate_share,
+                        args.max_concurrent, args.models, args.stall_share, args.stall_seconds,
+                        args.error_share, args.structured_output, args.verdict_confidence) as base_url:
+        print(f"Mock LLM serving at {base_url}/chat/completions")
+        threading.Event().wait()
+
+
+if __name__ == '__main__':
+    main()